@@ -0,0 +1,67 @@
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+logging.basicConfig(handlers=[logging.NullHandler()])
+
+from src.sources import CsvSource
+
+HEADER = 'device_id,timestamp,temperature,humidity,battery,firmware\n'
+
+
+def generate_sensor_csv(file_path: str, size_mb: int):
+    target_bytes = size_mb * 1024 * 1024
+    random_generator = random.Random(42)
+    written = 0
+    index = 0
+    with open(file_path, 'w') as data_stream:
+        data_stream.write(HEADER)
+        while written < target_bytes:
+            lines = []
+            for _ in range(10000):
+                lines.append(f'device-{index % 500},2024-01-{index % 28 + 1:02d} {index % 24:02d}:{index % 60:02d}:00,'
+                             f'{random_generator.uniform(-10, 45):.2f},{random_generator.uniform(10, 90):.2f},'
+                             f'{index % 100},v1.{index % 4}.3\n')
+                index = index + 1
+            chunk = ''.join(lines)
+            data_stream.write(chunk)
+            written = written + len(chunk)
+
+
+def run_case(case_name: str, file_size: int, **config):
+    start_time = time.perf_counter()
+    databag = CsvSource().load(**config)
+    elapsed = time.perf_counter() - start_time
+    row_count = databag.metadata['row_count']
+    print(f'{case_name:<32}{row_count:>12}{elapsed:>12.2f}{file_size / elapsed / (1024 * 1024):>12.1f}')
+
+
+def run_benchmark(file_path: str, size_mb: int, max_workers: int, include_rows: bool):
+    if not os.path.exists(file_path):
+        print(f'generating {size_mb} MB sensor csv - {file_path}')
+        generate_sensor_csv(file_path, size_mb)
+
+    file_size = os.path.getsize(file_path)
+    print(f'file - {file_path}, bytes - {file_size}, max_workers - {max_workers}')
+    print(f"{'case':<32}{'rows':>12}{'seconds':>12}{'MB/s':>12}")
+    if include_rows:
+        run_case('rows (DictReader)', file_size, file_path=file_path, quotechar='"')
+    run_case('columnar, 1 process', file_size, file_path=file_path, quotechar='"', columnar=True,
+             infer_schema=True, max_workers=1)
+    run_case(f'columnar, {max_workers} processes', file_size, file_path=file_path, quotechar='"', columnar=True,
+             infer_schema=True, max_workers=max_workers)
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    if len(arguments) % 2 != 0:
+        raise Exception('invalid arguments')
+
+    benchmark_arguments = {arguments[i]: arguments[i + 1] for i in range(0, len(arguments), 2)}
+    run_benchmark(file_path=benchmark_arguments.get('file_path', '/tmp/sensor_readings.csv'),
+                  size_mb=int(benchmark_arguments.get('size_mb', 1024)),
+                  max_workers=int(benchmark_arguments.get('max_workers', os.cpu_count() or 1)),
+                  include_rows=benchmark_arguments.get('include_rows', 'true') == 'true')
@@ -0,0 +1,56 @@
+import logging
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+logging.basicConfig(handlers=[logging.NullHandler()])
+
+from src.models import DatabagLookup
+from src.transformations import FieldSelectorTransformation, FieldRejectTransformation, \
+    AddConstantFieldTransformation, RenameFieldTransformation, ConcatFieldTransformation
+
+BENCHMARK_CASES = [
+    (FieldSelectorTransformation, {'fields': ['device_id', 'temperature', 'humidity']}),
+    (FieldRejectTransformation, {'fields': ['battery', 'firmware']}),
+    (AddConstantFieldTransformation, {'fields': {'site': 'plant-1', 'unit': 'celsius'}}),
+    (RenameFieldTransformation, {'fields': {'temperature': 'temp', 'humidity': 'hum'}}),
+    (ConcatFieldTransformation, {'fields': ['device_id', 'firmware'], 'output_field': 'device_key'}),
+]
+
+
+def generate_records(record_count: int) -> list:
+    return [{'device_id': f'device-{index % 500}',
+             'timestamp': '2024-01-01 00:00:00',
+             'temperature': 20.0 + index % 15,
+             'humidity': 40.0 + index % 30,
+             'battery': index % 100,
+             'firmware': 'v1.0.3'} for index in range(record_count)]
+
+
+def run_benchmark(record_count: int, repeat: int):
+    records = generate_records(record_count)
+    databag_lookup = DatabagLookup({}, {})
+    print(f'records - {record_count}, repeat - {repeat}')
+    print(f"{'transformation':<34}{'apply ns/record':>18}{'compiled ns/record':>22}{'speedup':>10}")
+    for transformation_class, config in BENCHMARK_CASES:
+        transformation = transformation_class(databag_lookup)
+        record_function = transformation.compile(**config)
+        apply_seconds = min(timeit.repeat(lambda: [transformation.apply(dict(item), **config) for item in records],
+                                          number=1, repeat=repeat))
+        compiled_seconds = min(timeit.repeat(lambda: [record_function(dict(item)) for item in records],
+                                             number=1, repeat=repeat))
+        copy_seconds = min(timeit.repeat(lambda: [dict(item) for item in records], number=1, repeat=repeat))
+        apply_ns = (apply_seconds - copy_seconds) * 1e9 / record_count
+        compiled_ns = (compiled_seconds - copy_seconds) * 1e9 / record_count
+        print(f'{transformation.name():<34}{apply_ns:>18.1f}{compiled_ns:>22.1f}{apply_ns / compiled_ns:>9.2f}x')
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    if len(arguments) % 2 != 0:
+        raise Exception('invalid arguments')
+
+    benchmark_arguments = {arguments[i]: arguments[i + 1] for i in range(0, len(arguments), 2)}
+    run_benchmark(record_count=int(benchmark_arguments.get('records', 200000)),
+                  repeat=int(benchmark_arguments.get('repeat', 5)))
@@ -1,11 +1,22 @@
 import csv
+import gzip
+import io
+import itertools
 import json
 import os
+import shutil
+import textwrap
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from abc import abstractmethod
 from datetime import datetime
 
-from src.models import DataBag, ActionTemplate, DatabagLookup
-from src.utils import get_logger
+from src.columnar import get_numpy, to_arrow_table, to_numpy_column
+from src.models import DataBag, ColumnarDataBag, ActionTemplate, DatabagLookup, split_batches
+from src.utils import get_logger, Constants
 
 
 class LogDataAction(ActionTemplate):
@@ -50,6 +61,9 @@ class LogDataAction(ActionTemplate):
 
 
 class DataSinkBaseAction(ActionTemplate):
+    __DEFAULT_PARALLEL_WRITERS = 4
+    __DEFAULT_MAX_BUFFERED_ROWS = 100000
+    __NULL_PARTITION = '__null__'
 
     def __init__(self, databag_lookup : DatabagLookup):
         self.logger = get_logger()
@@ -63,10 +77,149 @@ class DataSinkBaseAction(ActionTemplate):
     def sink(self, parameters: dict, databag: DataBag, file_path: str):
         pass
 
-    def __get_file_path(self, parameters: dict) -> str:
+    def resolve_file_extension(self, parameters: dict) -> str:
+        return self.get_file_extension()
+
+    def estimate_record_bytes(self, parameters: dict, record: dict) -> int:
+        return len(json.dumps(record, separators=(',', ':'), default=str)) + 1
+
+    def __get_file_name(self, parameters: dict, file_index: int = None) -> str:
         file_name = parameters['file_name']
-        return os.path.join(parameters['file_dir'],
-                            f'{file_name}_{int(datetime.now().timestamp() * 1000000)}.{self.get_file_extension()}')
+        file_suffix = '' if file_index is None else f'_{file_index:05d}'
+        return f'{file_name}_{int(datetime.now().timestamp() * 1000000)}{file_suffix}.' \
+               f'{self.resolve_file_extension(parameters)}'
+
+    def __write_file(self, parameters: dict, databag: DataBag, file_path: str) -> dict:
+        temp_path = os.path.join(os.path.dirname(file_path), f'.{os.path.basename(file_path)}.tmp')
+        try:
+            rows_written = self.sink(parameters=parameters, databag=databag, file_path=temp_path)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        if rows_written is None and not databag.is_streaming():
+            rows_written = databag.row_count() if databag.is_columnar() else len(databag.data)
+        return {'file_path': file_path, 'rows_written': rows_written, 'bytes_written': os.path.getsize(file_path)}
+
+    @staticmethod
+    def __partition_columns(parameters: dict) -> list:
+        partition_by = parameters.get('partition_by', [])
+        partition_by = [partition_by] if isinstance(partition_by, (str, dict)) else partition_by
+        partition_columns = []
+        for partition in partition_by:
+            if isinstance(partition, str):
+                partition = {'column': partition}
+            partition_columns.append({'column': partition['column'],
+                                      'name': partition.get('name', partition['column']),
+                                      'format': partition.get('format'),
+                                      'input_format': partition.get('input_format', Constants.DATE_FORMAT)})
+        return partition_columns
+
+    @staticmethod
+    def __partition_value(partition_column: dict, value) -> str:
+        if value is None:
+            return DataSinkBaseAction.__NULL_PARTITION
+        if partition_column['format']:
+            if isinstance(value, str):
+                value = datetime.strptime(value, partition_column['input_format'])
+            value = value.strftime(partition_column['format'])
+        return str(value).replace(os.sep, '_')
+
+    def __write_partitions(self, parameters: dict, databag: DataBag, target_dir: str) -> list:
+        partition_columns = DataSinkBaseAction.__partition_columns(parameters)
+        max_rows = int(parameters.get('max_rows_per_file', 0))
+        max_bytes = int(parameters.get('max_bytes_per_file', 0))
+        max_parallel_writers = int(parameters.get('max_parallel_writers', DataSinkBaseAction.__DEFAULT_PARALLEL_WRITERS))
+        max_buffered_rows = int(parameters.get('max_buffered_rows', DataSinkBaseAction.__DEFAULT_MAX_BUFFERED_ROWS))
+        buffers = {}
+        file_indexes = {}
+        written = {'rows': 0, 'bytes': 0}
+        written_lock = threading.Lock()
+
+        def rows_per_file() -> int:
+            limits = [max_rows] if max_rows else []
+            if max_bytes:
+                with written_lock:
+                    if written['rows']:
+                        limits.append(max(1, int(max_bytes * written['rows'] / written['bytes'])))
+            return min(limits) if limits else None
+
+        def estimating_bytes() -> bool:
+            with written_lock:
+                return bool(max_bytes) and not written['rows']
+
+        def write_partition(partition_dir: str, file_name: str, rows: list) -> dict:
+            os.makedirs(partition_dir, exist_ok=True)
+            file_metrics = self.__write_file(parameters, DataBag(name=databag.name, data=rows,
+                                                                 provider=databag.provider,
+                                                                 metadata={'row_count': len(rows)}),
+                                             os.path.join(partition_dir, file_name))
+            with written_lock:
+                written['rows'] = written['rows'] + len(rows)
+                written['bytes'] = written['bytes'] + file_metrics['bytes_written']
+            return file_metrics
+
+        def flush(executor, futures: list, partition: tuple) -> int:
+            rows = buffers.pop(partition)
+            partition_dir = os.path.join(target_dir, *map(lambda item: f'{item[0]}={item[1]}', partition))
+            file_index = file_indexes.get(partition, 0)
+            file_indexes[partition] = file_index + 1
+            running = list(filter(lambda future: not future.done(), futures))
+            if len(running) >= max_parallel_writers * 2:
+                running[0].result()
+            futures.append(executor.submit(write_partition, partition_dir,
+                                           self.__get_file_name(parameters, file_index), rows))
+            return len(rows)
+
+        with ThreadPoolExecutor(max_workers=max_parallel_writers, thread_name_prefix='sink') as executor:
+            futures = []
+            row_limit = rows_per_file()
+            estimating = estimating_bytes()
+            buffered_bytes = {}
+            buffered_rows = 0
+            for record in databag.iter_rows():
+                partition = tuple(map(lambda partition_column: (
+                    partition_column['name'],
+                    DataSinkBaseAction.__partition_value(partition_column, record.get(partition_column['column']))),
+                                      partition_columns))
+                if estimating:
+                    record_bytes = self.estimate_record_bytes(parameters, record)
+                    if partition in buffers and buffered_bytes.get(partition, 0) + record_bytes > max_bytes:
+                        buffered_rows = buffered_rows - flush(executor, futures, partition)
+                        buffered_bytes.pop(partition, None)
+                        row_limit = rows_per_file()
+                        estimating = estimating_bytes()
+                    if estimating:
+                        buffered_bytes[partition] = buffered_bytes.get(partition, 0) + record_bytes
+                rows = buffers.get(partition)
+                if rows is None:
+                    rows = []
+                    buffers[partition] = rows
+                rows.append(record)
+                buffered_rows = buffered_rows + 1
+                if not (row_limit and len(rows) >= row_limit):
+                    if buffered_rows < max_buffered_rows:
+                        continue
+                    # without a file size limit the largest partition is written out to bound memory
+                    partition = max(buffers.keys(), key=lambda buffered_partition: len(buffers[buffered_partition]))
+                buffered_rows = buffered_rows - flush(executor, futures, partition)
+                buffered_bytes.pop(partition, None)
+                row_limit = rows_per_file()
+                estimating = estimating_bytes()
+            for partition in list(buffers.keys()):
+                flush(executor, futures, partition)
+            return list(map(lambda future: future.result(), futures))
+
+    @staticmethod
+    def __swap_directory(staging_dir: str, file_dir: str):
+        if os.path.exists(file_dir):
+            previous_dir = f'{file_dir}.previous-{uuid.uuid4().hex[:8]}'
+            os.rename(file_dir, previous_dir)
+            os.rename(staging_dir, file_dir)
+            shutil.rmtree(previous_dir, ignore_errors=True)
+        else:
+            os.rename(staging_dir, file_dir)
 
     def call(self, **kwargs):
         self.logger.debug('executing : DataSinkBaseAction.call()')
@@ -81,28 +234,51 @@ class DataSinkBaseAction(ActionTemplate):
             raise Exception(f'invalid source_type - {source_type}')
         write_mode = kwargs.get('save_mode', 'overwrite')
         self.logger.info(f'write mode is ser to - {write_mode}')
-        file_dir = kwargs['file_dir']
-        file_path = self.__get_file_path(kwargs)
-        self.logger.info(f'file path - {file_path}')
+        if write_mode not in ['overwrite', 'append']:
+            raise Exception(f'save mode not supported - {write_mode}')
+
+        file_dir = os.path.normpath(kwargs['file_dir'])
+        target_dir = file_dir
         if write_mode == 'overwrite':
-            if os.path.exists(file_dir):
-                import shutil
-                shutil.rmtree(file_dir)
-                os.mkdir(file_dir)
+            target_dir = f'{file_dir}.staging-{uuid.uuid4().hex[:8]}'
+        os.makedirs(target_dir, exist_ok=True)
+
+        start_time = time.perf_counter()
+        try:
+            if kwargs.get('partition_by') or kwargs.get('max_rows_per_file') or kwargs.get('max_bytes_per_file'):
+                files = self.__write_partitions(kwargs, databag, target_dir)
             else:
-                os.mkdir(file_dir)
-            self.sink(parameters=kwargs, databag=databag, file_path=file_path)
-        elif write_mode == 'append':
-            if not os.path.exists(file_dir):
-                os.mkdir(file_dir)
-            self.sink(parameters=kwargs, databag=databag, file_path=file_path)
-        else:
-            raise Exception(f'save mode not supported - {write_mode}')
+                file_path = os.path.join(target_dir, self.__get_file_name(kwargs))
+                self.logger.info(f'file path - {file_path}')
+                files = [self.__write_file(kwargs, databag, file_path)]
+        except BaseException:
+            if write_mode == 'overwrite':
+                shutil.rmtree(target_dir, ignore_errors=True)
+            raise
 
-        self.logger.debug('executing : DataSinkBaseAction.call()')
+        if write_mode == 'overwrite':
+            DataSinkBaseAction.__swap_directory(target_dir, file_dir)
+            for file_metrics in files:
+                file_metrics['file_path'] = os.path.join(file_dir, os.path.relpath(file_metrics['file_path'],
+                                                                                   target_dir))
+
+        elapsed_seconds = time.perf_counter() - start_time
+        bytes_written = sum(map(lambda file_metrics: file_metrics['bytes_written'], files))
+        row_counts = list(map(lambda file_metrics: file_metrics['rows_written'], files))
+        self.logger.debug('exiting : DataSinkBaseAction.call()')
+        return {'file_path': files[0]['file_path'] if len(files) == 1 else file_dir,
+                'file_count': len(files),
+                'rows_written': None if None in row_counts else sum(row_counts),
+                'bytes_written': bytes_written,
+                'elapsed_seconds': round(elapsed_seconds, 6),
+                'bytes_per_second': round(bytes_written / elapsed_seconds, 2) if elapsed_seconds > 0 else None}
 
 
 class JsonSinkAction(DataSinkBaseAction):
+    __OUTPUT_FORMATS = {'json': 'json', 'json_array': 'json', 'jsonl': 'jsonl'}
+    __COMPRESSION_EXTENSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+    __BUFFER_SIZE = 1 << 20
+    __WRITE_CHUNK_SIZE = 1000
 
     def __init__(self, databag_lookup : DatabagLookup):
         self.logger = get_logger()
@@ -111,13 +287,98 @@ class JsonSinkAction(DataSinkBaseAction):
     def get_file_extension(self) -> str:
         return 'json'
 
+    def resolve_file_extension(self, parameters: dict) -> str:
+        return f'{JsonSinkAction.__OUTPUT_FORMATS[JsonSinkAction.__output_format(parameters)]}' \
+               f'{JsonSinkAction.__COMPRESSION_EXTENSIONS[JsonSinkAction.__compression(parameters)]}'
+
+    def estimate_record_bytes(self, parameters: dict, record: dict) -> int:
+        if JsonSinkAction.__output_format(parameters) == 'json':
+            return len(textwrap.indent(json.dumps(record, indent=4, default=str), '    ')) + 2
+        return super().estimate_record_bytes(parameters, record)
+
+    @staticmethod
+    def __output_format(parameters: dict) -> str:
+        output_format = parameters.get('output_format', 'json')
+        if output_format not in JsonSinkAction.__OUTPUT_FORMATS:
+            raise Exception(f'output format not supported - {output_format}')
+        return output_format
+
+    @staticmethod
+    def __compression(parameters: dict) -> str:
+        compression = parameters.get('compression', 'none')
+        if compression not in JsonSinkAction.__COMPRESSION_EXTENSIONS:
+            raise Exception(f'compression not supported - {compression}')
+        return compression
+
+    @staticmethod
+    def __open_output(file_path: str, parameters: dict):
+        compression = JsonSinkAction.__compression(parameters)
+        if compression == 'gzip':
+            return gzip.open(file_path, mode='wt', compresslevel=int(parameters.get('compression_level', 6)),
+                             encoding='utf-8')
+        elif compression == 'zstd':
+            compression_level = int(parameters.get('compression_level', 3))
+            try:
+                import zstandard
+            except ImportError:
+                try:
+                    from compression import zstd
+                    return zstd.open(file_path, mode='wt', level=compression_level, encoding='utf-8')
+                except ImportError:
+                    raise Exception('zstd compression requires the zstandard package')
+            writer = zstandard.ZstdCompressor(level=compression_level).stream_writer(open(file_path, 'wb'))
+            return io.TextIOWrapper(writer, encoding='utf-8')
+        return open(file=file_path, mode='w', buffering=JsonSinkAction.__BUFFER_SIZE, encoding='utf-8')
+
     def sink(self, parameters: dict, databag: DataBag, file_path: str):
         self.logger.debug('executing : JsonSinkAction.sink()')
-        json_object = json.dumps(databag.data, indent=4)
+        output_format = JsonSinkAction.__output_format(parameters)
+        with JsonSinkAction.__open_output(file_path, parameters) as outfile:
+            if output_format == 'jsonl':
+                rows_written = JsonSinkAction.__write_lines(outfile, databag.iter_rows())
+            elif output_format == 'json_array':
+                rows_written = JsonSinkAction.__write_array(outfile, databag.iter_rows())
+            else:
+                rows_written = JsonSinkAction.__write_records(outfile, databag.iter_rows())
+        self.logger.debug('exiting : JsonSinkAction.sink()')
+        return rows_written
 
-        with open(file=file_path, mode='w') as outfile:
-            outfile.write(json_object)
-        self.logger.debug('executing : JsonSinkAction.sink()')
+    @staticmethod
+    def __write_records(outfile, records) -> int:
+        row_count = 0
+        for record in records:
+            outfile.write('[\n' if row_count == 0 else ',\n')
+            outfile.write(textwrap.indent(json.dumps(record, indent=4, default=str), '    '))
+            row_count = row_count + 1
+        outfile.write('[]' if row_count == 0 else '\n]')
+        return row_count
+
+    @staticmethod
+    def __write_lines(outfile, records) -> int:
+        encoder = json.JSONEncoder(separators=(',', ':'), default=str)
+        row_count = 0
+        while True:
+            chunk = list(itertools.islice(records, JsonSinkAction.__WRITE_CHUNK_SIZE))
+            if not chunk:
+                return row_count
+            outfile.write(''.join([f'{encoder.encode(record)}\n' for record in chunk]))
+            row_count = row_count + len(chunk)
+
+    @staticmethod
+    def __write_array(outfile, records) -> int:
+        encoder = json.JSONEncoder(separators=(',', ':'), default=str)
+        row_count = 0
+        outfile.write('[')
+        while True:
+            chunk = list(itertools.islice(records, JsonSinkAction.__WRITE_CHUNK_SIZE))
+            if not chunk:
+                break
+            if row_count > 0:
+                outfile.write(',')
+            outfile.write(','.join([encoder.encode(record) for record in chunk]))
+            row_count = row_count + len(chunk)
+        outfile.write(']')
+        return row_count
 
 
 class CSVSinkAction(DataSinkBaseAction):
@@ -131,6 +392,12 @@ class CSVSinkAction(DataSinkBaseAction):
 
     def sink(self, parameters: dict, databag: DataBag, file_path: str):
         self.logger.debug('executing : CSVSinkAction.sink()')
+        if databag.is_columnar() or databag.is_streaming():
+            with open(file=file_path, mode='w') as csv_file:
+                CSVSinkAction.__write_batches(csv_file, databag.batches(), parameters.get('delimiter', ','))
+            self.logger.debug('executing : CSVSinkAction.sink()')
+            return
+
         csv_headers = databag.data[0].keys()
         with open(file=file_path, mode='w') as csv_file:
             writer = csv.DictWriter(csv_file, fieldnames=csv_headers, delimiter=parameters.get('delimiter', ','))
@@ -138,3 +405,237 @@ class CSVSinkAction(DataSinkBaseAction):
             writer.writerows(databag.data)
 
         self.logger.debug('executing : CSVSinkAction.sink()')
+
+    @staticmethod
+    def __write_batches(csv_file, batches, delimiter: str):
+        writer = csv.writer(csv_file, delimiter=delimiter)
+        header = None
+        record_writer = None
+        for batch in batches:
+            column_names = batch.column_names() if batch.is_columnar() else \
+                (list(batch.data[0].keys()) if len(batch.data) > 0 else None)
+            if not column_names:
+                continue
+            if header is None:
+                header = column_names
+                writer.writerow(header)
+                record_writer = csv.DictWriter(csv_file, fieldnames=header, restval='', delimiter=delimiter)
+            unknown_columns = [name for name in column_names if name not in header]
+            if unknown_columns:
+                raise Exception(f'batch has columns missing from the csv header - {unknown_columns}')
+            if not batch.is_columnar():
+                record_writer.writerows(batch.data)
+            elif column_names == header:
+                writer.writerows(batch.iter_row_tuples())
+            else:
+                positions = [column_names.index(name) if name in column_names else None for name in header]
+                writer.writerows(map(lambda row: ['' if position is None else row[position] for position in positions],
+                                     batch.iter_row_tuples()))
+
+
+class ColumnarSinkBaseAction(DataSinkBaseAction):
+    __DEFAULT_ROW_GROUP_SIZE = 65536
+
+    def __init__(self, databag_lookup: DatabagLookup):
+        self.logger = get_logger()
+        self.databag_lookup = databag_lookup
+
+    @staticmethod
+    def has_pyarrow() -> bool:
+        try:
+            import pyarrow
+            return True
+        except ImportError:
+            return False
+
+    @staticmethod
+    def row_groups(databag: DataBag, row_group_size: int):
+        for batch in split_batches(databag, row_group_size):
+            if not batch.is_columnar():
+                batch = ColumnarDataBag.from_records(name=batch.name, provider=batch.provider, records=batch.data)
+            if batch.row_count() > 0:
+                yield batch
+
+    @staticmethod
+    def require_pyarrow(file_format: str):
+        if not ColumnarSinkBaseAction.has_pyarrow():
+            raise Exception(f'pyarrow is required to write {file_format} files - install pyarrow or use the npz sink')
+
+    @staticmethod
+    def __unify_schemas(schemas: list):
+        import pyarrow
+
+        field_types = {}
+        for schema in schemas:
+            for field in schema:
+                column_types = field_types.setdefault(field.name, [])
+                if not pyarrow.types.is_null(field.type) and field.type not in column_types:
+                    column_types.append(field.type)
+
+        fields = []
+        for name, column_types in field_types.items():
+            if not column_types:
+                field_type = pyarrow.null()
+            elif len(column_types) == 1:
+                field_type = column_types[0]
+            else:
+                try:
+                    field_type = pyarrow.unify_schemas(
+                        [pyarrow.schema([(name, column_type)]) for column_type in column_types],
+                        promote_options='permissive').field(name).type
+                except (TypeError, ValueError):
+                    field_type = pyarrow.string()
+            fields.append(pyarrow.field(name, field_type))
+        return pyarrow.schema(fields)
+
+    @staticmethod
+    def __conform(table, schema):
+        import pyarrow
+
+        unknown_columns = [name for name in table.column_names if name not in schema.names]
+        if unknown_columns:
+            raise Exception(f'row group has columns missing from the file schema - {unknown_columns}')
+        columns = []
+        for field in schema:
+            if field.name in table.column_names:
+                try:
+                    columns.append(table.column(field.name).cast(field.type))
+                except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError) as ex:
+                    raise Exception(f'row group column does not fit the file schema - {field.name}, cause - {ex}')
+            else:
+                columns.append(pyarrow.nulls(table.num_rows, type=field.type))
+        return pyarrow.Table.from_arrays(columns, schema=schema)
+
+    @staticmethod
+    def __open_writer(file_path: str, schema, file_format: str, compression: str):
+        import pyarrow
+
+        if file_format == 'parquet':
+            import pyarrow.parquet
+            return pyarrow.parquet.ParquetWriter(file_path, schema, compression=compression)
+        options = pyarrow.ipc.IpcWriteOptions(compression=compression)
+        return pyarrow.ipc.new_file(file_path, schema, options=options)
+
+    @staticmethod
+    def __write_table(writer, table, schema, file_format: str, row_group_size: int) -> int:
+        if table.schema != schema:
+            table = ColumnarSinkBaseAction.__conform(table, schema)
+        if file_format == 'parquet':
+            writer.write_table(table, row_group_size)
+        else:
+            writer.write_table(table)
+        return table.num_rows
+
+    def write_arrow(self, parameters: dict, databag: DataBag, file_path: str, file_format: str) -> int:
+        import pyarrow
+
+        row_group_size = int(parameters.get('row_group_size', ColumnarSinkBaseAction.__DEFAULT_ROW_GROUP_SIZE))
+        compression = parameters.get('compression', 'zstd')
+        writer = None
+        schema = None
+        pending_tables = []
+        rows_written = 0
+        try:
+            # in memory databags are unified over every row group, streaming ones only until each column has a
+            # type, later row groups are cast to the schema the file was opened with
+            for batch in ColumnarSinkBaseAction.row_groups(databag, row_group_size):
+                table = to_arrow_table(batch.columns, batch.null_masks, batch.row_count())
+                pending_tables.append(table)
+                if writer is None:
+                    schema = ColumnarSinkBaseAction.__unify_schemas(
+                        [table.schema] if schema is None else [schema, table.schema])
+                    if not databag.is_streaming() or \
+                            any(map(lambda field: pyarrow.types.is_null(field.type), schema)):
+                        continue
+                    writer = ColumnarSinkBaseAction.__open_writer(file_path, schema, file_format, compression)
+                for pending_table in pending_tables:
+                    rows_written = rows_written + ColumnarSinkBaseAction.__write_table(
+                        writer, pending_table, schema, file_format, row_group_size)
+                pending_tables = []
+            if pending_tables and writer is None:
+                writer = ColumnarSinkBaseAction.__open_writer(file_path, schema, file_format, compression)
+            for pending_table in pending_tables:
+                rows_written = rows_written + ColumnarSinkBaseAction.__write_table(
+                    writer, pending_table, schema, file_format, row_group_size)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            empty_schema = pyarrow.schema([])
+            if file_format == 'parquet':
+                import pyarrow.parquet
+                pyarrow.parquet.write_table(pyarrow.Table.from_arrays([], schema=empty_schema), file_path)
+            else:
+                pyarrow.ipc.new_file(file_path, empty_schema).close()
+        return rows_written
+
+    def write_npz(self, parameters: dict, databag: DataBag, file_path: str) -> int:
+        if get_numpy() is None:
+            raise Exception('numpy is required to write npz files')
+        import numpy.lib.format
+
+        row_group_size = int(parameters.get('row_group_size', ColumnarSinkBaseAction.__DEFAULT_ROW_GROUP_SIZE))
+        compression = zipfile.ZIP_STORED if parameters.get('compression') == 'none' else zipfile.ZIP_DEFLATED
+        row_groups = []
+        with zipfile.ZipFile(file_path, mode='w', compression=compression, allowZip64=True) as npz_file:
+            for index, batch in enumerate(ColumnarSinkBaseAction.row_groups(databag, row_group_size)):
+                for name, column in batch.columns.items():
+                    values, mask = to_numpy_column(column, batch.null_mask(name), batch.row_count())
+                    with npz_file.open(f'{index:06d}/{name}.npy', mode='w', force_zip64=True) as entry:
+                        numpy.lib.format.write_array(entry, values, allow_pickle=False)
+                    if mask is not None:
+                        with npz_file.open(f'{index:06d}/{name}.null.npy', mode='w', force_zip64=True) as entry:
+                            numpy.lib.format.write_array(entry, mask, allow_pickle=False)
+                row_groups.append({'columns': batch.column_names(), 'row_count': batch.row_count()})
+            npz_file.writestr('_metadata.json', json.dumps({'row_groups': row_groups}))
+        return sum(map(lambda row_group: row_group['row_count'], row_groups))
+
+
+class ArrowIpcSinkAction(ColumnarSinkBaseAction):
+
+    def __init__(self, databag_lookup: DatabagLookup):
+        self.logger = get_logger()
+        self.databag_lookup = databag_lookup
+
+    def get_file_extension(self) -> str:
+        return 'arrow'
+
+    def sink(self, parameters: dict, databag: DataBag, file_path: str):
+        self.logger.debug('executing : ArrowIpcSinkAction.sink()')
+        ColumnarSinkBaseAction.require_pyarrow('arrow ipc')
+        rows_written = self.write_arrow(parameters, databag, file_path, 'arrow')
+        self.logger.debug('exiting : ArrowIpcSinkAction.sink()')
+        return rows_written
+
+
+class ParquetSinkAction(ColumnarSinkBaseAction):
+
+    def __init__(self, databag_lookup: DatabagLookup):
+        self.logger = get_logger()
+        self.databag_lookup = databag_lookup
+
+    def get_file_extension(self) -> str:
+        return 'parquet'
+
+    def sink(self, parameters: dict, databag: DataBag, file_path: str):
+        self.logger.debug('executing : ParquetSinkAction.sink()')
+        ColumnarSinkBaseAction.require_pyarrow('parquet')
+        rows_written = self.write_arrow(parameters, databag, file_path, 'parquet')
+        self.logger.debug('exiting : ParquetSinkAction.sink()')
+        return rows_written
+
+
+class NpzSinkAction(ColumnarSinkBaseAction):
+
+    def __init__(self, databag_lookup: DatabagLookup):
+        self.logger = get_logger()
+        self.databag_lookup = databag_lookup
+
+    def get_file_extension(self) -> str:
+        return 'npz'
+
+    def sink(self, parameters: dict, databag: DataBag, file_path: str):
+        self.logger.debug('executing : NpzSinkAction.sink()')
+        rows_written = self.write_npz(parameters, databag, file_path)
+        self.logger.debug('exiting : NpzSinkAction.sink()')
+        return rows_written
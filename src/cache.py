@@ -0,0 +1,257 @@
+import array
+import base64
+import datetime
+import decimal
+import hashlib
+import hmac
+import json
+import os
+import stat
+import threading
+import time
+import zlib
+
+from src.columnar import get_numpy
+from src.models import DataBag, ColumnarDataBag
+from src.utils import get_logger
+
+
+class SourceCache:
+    __CACHE_FILE_SUFFIX = '.bin'
+    __KEY_FILE_NAME = 'cache.key'
+    __TYPE_MARKER = '$cache_type'
+    __DIGEST_SIZE = hashlib.sha256().digest_size
+    __DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache',
+                                       'source_cache')
+    __DEFAULT_TTL_SECONDS = 300
+    __DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, config: dict = None):
+        config = config if config else {}
+        self.logger = get_logger()
+        self.cache_dir = config.get('cache_dir', SourceCache.__DEFAULT_CACHE_DIR)
+        self.ttl_seconds = float(config.get('ttl_seconds', SourceCache.__DEFAULT_TTL_SECONDS))
+        self.max_bytes = int(config.get('max_bytes', SourceCache.__DEFAULT_MAX_BYTES))
+        self.compression_level = int(config.get('compression_level', 1))
+        self.lock = threading.Lock()
+        SourceCache.__create_private_dir(self.cache_dir)
+        self.signing_key = SourceCache.__signing_key(self.cache_dir)
+
+    @staticmethod
+    def __create_private_dir(cache_dir: str):
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        dir_stat = os.lstat(cache_dir)
+        if not stat.S_ISDIR(dir_stat.st_mode):
+            raise Exception(f'source cache dir is not a directory - {cache_dir}')
+        if hasattr(os, 'getuid') and dir_stat.st_uid != os.getuid():
+            raise Exception(f'source cache dir is owned by another user - {cache_dir}')
+        if dir_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise Exception(f'source cache dir is group or world writable - {cache_dir}')
+
+    @staticmethod
+    def __signing_key(cache_dir: str) -> bytes:
+        key_file = os.path.join(cache_dir, SourceCache.__KEY_FILE_NAME)
+        if not os.path.exists(key_file):
+            temp_file = f'{key_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+            SourceCache.__write_private_file(temp_file, os.urandom(32))
+            try:
+                os.link(temp_file, key_file)
+            except FileExistsError:
+                pass
+            finally:
+                SourceCache.__remove(temp_file)
+
+        with open(key_file, 'rb') as stream:
+            signing_key = stream.read()
+        if len(signing_key) != 32:
+            raise Exception(f'invalid source cache key file - {key_file}')
+        return signing_key
+
+    @staticmethod
+    def __write_private_file(file_path: str, payload: bytes):
+        SourceCache.__remove(file_path)
+        file_descriptor = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(file_descriptor, 'wb') as stream:
+            stream.write(payload)
+
+    @staticmethod
+    def create_key(key_parts: list) -> str:
+        key_str = json.dumps(key_parts, sort_keys=True, default=str)
+        return hashlib.sha256(key_str.encode()).hexdigest()
+
+    def __cache_file(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}{SourceCache.__CACHE_FILE_SUFFIX}')
+
+    def __digest(self, payload: bytes) -> bytes:
+        return hmac.new(self.signing_key, payload, hashlib.sha256).digest()
+
+    @staticmethod
+    def __encode_bytes(payload) -> str:
+        return base64.b64encode(payload).decode('ascii')
+
+    @staticmethod
+    def __encode_value(value):
+        marker = SourceCache.__TYPE_MARKER
+        if value is None or isinstance(value, (str, bool, int, float)):
+            return value
+        elif isinstance(value, dict):
+            if marker not in value and all(map(lambda key: isinstance(key, str), value.keys())):
+                return {key: SourceCache.__encode_value(item) for key, item in value.items()}
+            return {marker: 'dict', 'items': [[SourceCache.__encode_value(key), SourceCache.__encode_value(item)]
+                                              for key, item in value.items()]}
+        elif isinstance(value, list):
+            return [SourceCache.__encode_value(item) for item in value]
+        elif isinstance(value, tuple):
+            return {marker: 'tuple', 'items': [SourceCache.__encode_value(item) for item in value]}
+        elif isinstance(value, datetime.datetime):
+            return {marker: 'datetime', 'value': value.isoformat()}
+        elif isinstance(value, datetime.date):
+            return {marker: 'date', 'value': value.isoformat()}
+        elif isinstance(value, decimal.Decimal):
+            return {marker: 'decimal', 'value': str(value)}
+        elif isinstance(value, (bytes, bytearray)):
+            return {marker: 'bytes', 'value': SourceCache.__encode_bytes(value)}
+        numpy = get_numpy()
+        if numpy is not None and isinstance(value, numpy.generic):
+            return SourceCache.__encode_value(value.item())
+        raise TypeError(f'value type not supported by source cache - {type(value).__name__}')
+
+    @staticmethod
+    def __decode_value(value):
+        if isinstance(value, list):
+            return [SourceCache.__decode_value(item) for item in value]
+        elif not isinstance(value, dict):
+            return value
+
+        value_type = value.get(SourceCache.__TYPE_MARKER)
+        if value_type is None:
+            return {key: SourceCache.__decode_value(item) for key, item in value.items()}
+        elif value_type == 'dict':
+            return {SourceCache.__decode_value(key): SourceCache.__decode_value(item) for key, item in value['items']}
+        elif value_type == 'tuple':
+            return tuple(SourceCache.__decode_value(item) for item in value['items'])
+        elif value_type == 'datetime':
+            return datetime.datetime.fromisoformat(value['value'])
+        elif value_type == 'date':
+            return datetime.date.fromisoformat(value['value'])
+        elif value_type == 'decimal':
+            return decimal.Decimal(value['value'])
+        elif value_type == 'bytes':
+            return base64.b64decode(value['value'])
+        raise Exception(f'invalid cache value type - {value_type}')
+
+    @staticmethod
+    def __encode_column(column) -> dict:
+        if hasattr(column, 'dtype'):
+            if column.dtype.kind not in 'biufM':
+                return {'values': SourceCache.__encode_value(column.tolist())}
+            return {'numpy': column.dtype.str, 'data': SourceCache.__encode_bytes(column.tobytes())}
+        elif isinstance(column, array.array):
+            return {'array': column.typecode, 'data': SourceCache.__encode_bytes(column.tobytes())}
+        return {'values': SourceCache.__encode_value(list(column))}
+
+    @staticmethod
+    def __decode_column(column: dict):
+        if 'numpy' in column:
+            numpy = get_numpy()
+            if numpy is None:
+                raise Exception('numpy is required to read cached numpy columns')
+            return numpy.frombuffer(base64.b64decode(column['data']), dtype=numpy.dtype(column['numpy'])).copy()
+        elif 'array' in column:
+            column_values = array.array(column['array'])
+            column_values.frombytes(base64.b64decode(column['data']))
+            return column_values
+        return SourceCache.__decode_value(column['values'])
+
+    @staticmethod
+    def __encode_entry(databag: DataBag) -> dict:
+        entry = {'created': time.time(), 'name': databag.name, 'provider': databag.provider,
+                 'metadata': SourceCache.__encode_value(databag.metadata)}
+        if databag.is_columnar():
+            entry['columns'] = {name: SourceCache.__encode_column(column) for name, column in databag.columns.items()}
+            entry['null_masks'] = {name: SourceCache.__encode_bytes(bytes(null_mask))
+                                   for name, null_mask in databag.null_masks.items() if null_mask}
+        else:
+            entry['data'] = SourceCache.__encode_value(databag.data)
+        return entry
+
+    @staticmethod
+    def __decode_databag(entry: dict) -> DataBag:
+        metadata = SourceCache.__decode_value(entry['metadata'])
+        if 'columns' in entry:
+            columns = {name: SourceCache.__decode_column(column) for name, column in entry['columns'].items()}
+            null_masks = {name: bytearray(base64.b64decode(null_mask))
+                          for name, null_mask in entry['null_masks'].items()}
+            return ColumnarDataBag(name=entry['name'], columns=columns, null_masks=null_masks,
+                                   provider=entry['provider'], metadata=metadata)
+        return DataBag(name=entry['name'], data=SourceCache.__decode_value(entry['data']), provider=entry['provider'],
+                       metadata=metadata)
+
+    def get(self, key: str, ttl_seconds: float = None) -> DataBag:
+        cache_file = self.__cache_file(key)
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        try:
+            with open(cache_file, 'rb') as stream:
+                content = stream.read()
+            digest, payload = content[:SourceCache.__DIGEST_SIZE], content[SourceCache.__DIGEST_SIZE:]
+            if not hmac.compare_digest(digest, self.__digest(payload)):
+                raise Exception('integrity check failed')
+            entry = json.loads(zlib.decompress(payload).decode('utf-8'))
+            if time.time() - entry['created'] > ttl_seconds:
+                self.__remove(cache_file)
+                return None
+            databag = SourceCache.__decode_databag(entry)
+        except FileNotFoundError:
+            return None
+        except Exception as ex:
+            self.logger.warning(f'discarding unreadable cache entry - {cache_file}, cause - {ex}')
+            self.__remove(cache_file)
+            return None
+
+        try:
+            os.utime(cache_file)
+        except FileNotFoundError:
+            pass
+        return databag
+
+    def put(self, key: str, databag: DataBag):
+        cache_file = self.__cache_file(key)
+        try:
+            entry = SourceCache.__encode_entry(databag)
+        except TypeError as ex:
+            self.logger.debug(f'skipping cache entry that cannot be serialized, cause - {ex}')
+            return
+        payload = zlib.compress(json.dumps(entry, separators=(',', ':')).encode('utf-8'), self.compression_level)
+        if len(payload) > self.max_bytes:
+            self.logger.debug(f'skipping cache entry larger than max_bytes - {len(payload)}')
+            return
+        temp_file = f'{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        SourceCache.__write_private_file(temp_file, self.__digest(payload) + payload)
+        os.replace(temp_file, cache_file)
+        self.__evict()
+
+    @staticmethod
+    def __remove(cache_file: str):
+        try:
+            os.remove(cache_file)
+        except FileNotFoundError:
+            pass
+
+    def __evict(self):
+        with self.lock:
+            entries = []
+            for file_name in os.listdir(self.cache_dir):
+                if file_name.endswith(SourceCache.__CACHE_FILE_SUFFIX):
+                    try:
+                        file_stat = os.stat(os.path.join(self.cache_dir, file_name))
+                    except FileNotFoundError:
+                        continue
+                    entries.append((file_stat.st_mtime, file_stat.st_size, file_name))
+
+            total_bytes = sum(map(lambda entry: entry[1], entries))
+            for _, size, file_name in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                self.logger.debug(f'evicting source cache entry - {file_name}')
+                SourceCache.__remove(os.path.join(self.cache_dir, file_name))
+                total_bytes = total_bytes - size
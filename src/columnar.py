@@ -0,0 +1,291 @@
+import array
+import datetime
+
+ROW_CHUNK_SIZE = 4096
+
+TYPE_CODES = {'int': 'q', 'float': 'd'}
+NUMPY_TYPES = {'int': 'int64', 'float': 'float64', 'bool': 'bool', 'timestamp': 'datetime64[us]'}
+FILL_VALUES = {'int': 0, 'float': 0.0, 'bool': False, 'timestamp': datetime.datetime(1970, 1, 1)}
+
+
+def get_numpy():
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+def infer_column_type(values: list) -> str:
+    column_type = None
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value_type = 'bool'
+        elif isinstance(value, int):
+            value_type = 'int'
+        elif isinstance(value, float):
+            value_type = 'float'
+        elif isinstance(value, datetime.datetime):
+            value_type = 'timestamp'
+        else:
+            return 'object'
+
+        if column_type is None:
+            column_type = value_type
+        elif column_type != value_type:
+            if {column_type, value_type} == {'int', 'float'}:
+                column_type = 'float'
+            else:
+                return 'object'
+    return column_type if column_type else 'object'
+
+
+def build_null_mask(size: int, null_positions: list):
+    if not null_positions:
+        return None
+    null_mask = bytearray(size)
+    for position in null_positions:
+        null_mask[position] = 1
+    return null_mask
+
+
+def build_column(values: list, column_type: str = None):
+    if hasattr(values, 'dtype'):
+        if values.dtype.kind != 'O':
+            return values, None
+        values = values.tolist()
+    if column_type is None:
+        column_type = infer_column_type(values)
+    null_positions = [index for index, value in enumerate(values) if value is None]
+    null_mask = build_null_mask(len(values), null_positions)
+
+    numpy = get_numpy()
+    if numpy is not None and column_type in NUMPY_TYPES:
+        fill_value = FILL_VALUES[column_type]
+        filled = [fill_value if value is None else value for value in values] if null_mask else values
+        try:
+            return numpy.array(filled, dtype=NUMPY_TYPES[column_type]), null_mask
+        except (OverflowError, TypeError, ValueError):
+            return list(values), null_mask
+    elif column_type in TYPE_CODES:
+        fill_value = FILL_VALUES[column_type]
+        filled = [fill_value if value is None else value for value in values] if null_mask else values
+        try:
+            return array.array(TYPE_CODES[column_type], filled), null_mask
+        except (OverflowError, TypeError):
+            return list(values), null_mask
+    else:
+        return list(values), null_mask
+
+
+def build_columns(names: list, value_lists: list, column_types: dict = None):
+    columns = {}
+    null_masks = {}
+    column_types = column_types if column_types else {}
+    for name, values in zip(names, value_lists):
+        values = values if hasattr(values, 'dtype') else list(values)
+        columns[name], null_mask = build_column(values, column_types.get(name))
+        if null_mask:
+            null_masks[name] = null_mask
+    return columns, null_masks
+
+
+def from_arrow_column(column):
+    import pyarrow
+
+    null_mask = None
+    if column.null_count:
+        null_mask = bytearray(column.is_null().to_pylist())
+
+    numpy = get_numpy()
+    column_type = column.type
+    if numpy is not None and (pyarrow.types.is_integer(column_type) or pyarrow.types.is_floating(column_type)
+                              or pyarrow.types.is_boolean(column_type)):
+        if column.null_count:
+            column = column.fill_null(False if pyarrow.types.is_boolean(column_type) else 0)
+        return numpy.asarray(column), null_mask
+    return column.to_pylist(), null_mask
+
+
+def from_arrow_table(table):
+    columns = {}
+    null_masks = {}
+    for name in table.schema.names:
+        columns[name], null_mask = from_arrow_column(table.column(name))
+        if null_mask:
+            null_masks[name] = null_mask
+    return columns, null_masks
+
+
+def null_column(size: int):
+    return [None] * size, bytearray(b'\x01') * size
+
+
+def constant_column(value, size: int):
+    if value is None:
+        return null_column(size)
+
+    column_type = infer_column_type([value])
+    numpy = get_numpy()
+    try:
+        if numpy is not None and column_type in NUMPY_TYPES:
+            return numpy.full(size, value, dtype=NUMPY_TYPES[column_type]), None
+        elif column_type in TYPE_CODES:
+            return array.array(TYPE_CODES[column_type], [value]) * size, None
+    except (OverflowError, TypeError, ValueError):
+        pass
+    return [value] * size, None
+
+
+def combine_null_masks(null_masks: list, size: int):
+    null_masks = [null_mask for null_mask in null_masks if null_mask]
+    if not null_masks:
+        return None
+    if len(null_masks) == 1:
+        return bytearray(null_masks[0])
+
+    numpy = get_numpy()
+    if numpy is not None:
+        combined = numpy.zeros(size, dtype=bool)
+        for null_mask in null_masks:
+            combined |= numpy.frombuffer(bytes(null_mask), dtype=bool)
+        return bytearray(combined.tobytes())
+    return bytearray(map(any, zip(*null_masks)))
+
+
+def concat_columns(columns: list, null_masks: list, size: int, seperator: str):
+    combined_mask = combine_null_masks(null_masks, size)
+    all_strings = all(map(lambda column: all(map(lambda value: value is None or isinstance(value, str), column)),
+                          columns))
+    numpy = get_numpy()
+    if numpy is not None and columns and all_strings:
+        joined = numpy.array(columns[0], dtype=str)
+        for column in columns[1:]:
+            joined = numpy.char.add(numpy.char.add(joined, seperator), numpy.array(column, dtype=str))
+        values = joined.tolist()
+    else:
+        values = [seperator.join(row) if None not in row else None for row in zip(*columns)]
+
+    if combined_mask:
+        values = [None if is_null else value for value, is_null in zip(values, combined_mask)]
+    return values, combined_mask
+
+
+def merge_columns(parts: list):
+    row_count = sum(map(lambda part: part[2], parts))
+    columns = {}
+    null_masks = {}
+    names = list(parts[0][0].keys()) if parts else []
+    numpy = get_numpy()
+    for name in names:
+        pieces = [part[0][name] for part in parts]
+        if numpy is not None and all(map(lambda piece: isinstance(piece, numpy.ndarray), pieces)) \
+                and len(set(map(lambda piece: piece.dtype, pieces))) == 1:
+            columns[name] = numpy.concatenate(pieces)
+        elif all(map(lambda piece: isinstance(piece, array.array), pieces)) \
+                and len(set(map(lambda piece: piece.typecode, pieces))) == 1:
+            columns[name] = array.array(pieces[0].typecode)
+            for piece in pieces:
+                columns[name].extend(piece)
+        else:
+            columns[name] = []
+            for piece in pieces:
+                columns[name].extend(piece.tolist() if hasattr(piece, 'tolist') else piece)
+
+        if any(map(lambda part: part[1].get(name), parts)):
+            null_mask = bytearray()
+            for part in parts:
+                null_mask.extend(part[1].get(name) or bytearray(part[2]))
+            null_masks[name] = null_mask
+    return columns, null_masks, row_count
+
+
+def to_arrow_table(columns: dict, null_masks: dict, row_count: int):
+    import pyarrow
+
+    numpy = get_numpy()
+    arrays = []
+    for name, column in columns.items():
+        null_mask = null_masks.get(name)
+        if numpy is not None and isinstance(column, numpy.ndarray) and column.dtype.kind != 'O':
+            mask = numpy.frombuffer(bytes(null_mask), dtype=bool) if null_mask else None
+            arrays.append(pyarrow.array(column, mask=mask))
+        else:
+            arrays.append(pyarrow.array(column_values(column, null_mask, 0, row_count)))
+    return pyarrow.Table.from_arrays(arrays, names=list(columns.keys()))
+
+
+def to_numpy_column(column, null_mask, row_count: int):
+    numpy = get_numpy()
+    mask = numpy.frombuffer(bytes(null_mask), dtype=bool) if null_mask else None
+    if isinstance(column, numpy.ndarray) and column.dtype.kind != 'O':
+        return column, mask
+
+    values = column_values(column, null_mask, 0, row_count)
+    column_type = infer_column_type(values)
+    if column_type in NUMPY_TYPES:
+        fill_value = FILL_VALUES[column_type]
+        return numpy.array([fill_value if value is None else value for value in values],
+                           dtype=NUMPY_TYPES[column_type]), mask
+    return numpy.array(['' if value is None else str(value) for value in values], dtype=str), mask
+
+
+def column_values(column, null_mask, start: int, stop: int) -> list:
+    chunk = column[start:stop]
+    values = chunk.tolist() if hasattr(chunk, 'tolist') else list(chunk)
+    if null_mask:
+        mask_chunk = null_mask[start:stop]
+        if any(mask_chunk):
+            values = [None if is_null else value for value, is_null in zip(values, mask_chunk)]
+    return values
+
+
+def iter_rows(columns: dict, null_masks: dict, row_count: int, start: int = 0, stop: int = None,
+              as_tuples: bool = False):
+    stop = row_count if stop is None else min(stop, row_count)
+    column_names = list(columns.keys())
+    for chunk_start in range(start, stop, ROW_CHUNK_SIZE):
+        chunk_stop = min(chunk_start + ROW_CHUNK_SIZE, stop)
+        chunk = [column_values(columns[name], null_masks.get(name), chunk_start, chunk_stop)
+                 for name in column_names]
+        if as_tuples:
+            yield from zip(*chunk)
+        else:
+            for row in zip(*chunk):
+                yield dict(zip(column_names, row))
+
+
+class ColumnBuilder:
+
+    def __init__(self, column_types: dict = None):
+        self.column_types = column_types if column_types else {}
+        self.values = {}
+        self.row_count = 0
+
+    def append(self, record: dict):
+        for key, value in record.items():
+            column = self.values.get(key)
+            if column is None:
+                column = [None] * self.row_count
+                self.values[key] = column
+            column.append(value)
+        self.row_count = self.row_count + 1
+        for column in self.values.values():
+            if len(column) < self.row_count:
+                column.append(None)
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def build(self):
+        columns = {}
+        null_masks = {}
+        for name in list(self.values.keys()):
+            column, null_mask = build_column(self.values.pop(name), self.column_types.get(name))
+            columns[name] = column
+            if null_mask:
+                null_masks[name] = null_mask
+        return columns, null_masks
@@ -0,0 +1,177 @@
+import atexit
+import collections
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from src.utils import get_logger
+
+
+class ConnectionPool:
+
+    def __init__(self, name: str, factory, health_check=None, close=None, max_size: int = 4,
+                 idle_timeout: float = 300, acquire_timeout: float = 30):
+        self.logger = get_logger()
+        self.name = name
+        self.factory = factory
+        self.health_check = health_check
+        self.close_connection = close
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+        self.idle_connections = collections.deque()
+        self.slots = threading.BoundedSemaphore(max_size)
+        self.lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'closed': 0, 'evicted': 0, 'health_check_failures': 0,
+                      'in_use': 0}
+
+    def __increment(self, stat_name: str, value: int = 1):
+        with self.lock:
+            self.stats[stat_name] = self.stats[stat_name] + value
+
+    def __close(self, connection):
+        self.__increment('closed')
+        if self.close_connection:
+            try:
+                self.close_connection(connection)
+            except Exception as ex:
+                self.logger.warning(f'error occurred while closing connection from pool - {self.name}, cause - {ex}')
+
+    def __is_healthy(self, connection) -> bool:
+        if not self.health_check:
+            return True
+        try:
+            return self.health_check(connection) is not False
+        except Exception as ex:
+            self.logger.warning(f'health check failed for connection from pool - {self.name}, cause - {ex}')
+            return False
+
+    def evict_idle(self):
+        expired = []
+        with self.lock:
+            threshold = time.monotonic() - self.idle_timeout
+            while self.idle_connections and self.idle_connections[0][1] < threshold:
+                expired.append(self.idle_connections.popleft()[0])
+            self.stats['evicted'] = self.stats['evicted'] + len(expired)
+        for connection in expired:
+            self.__close(connection)
+
+    def acquire(self):
+        if not self.slots.acquire(timeout=self.acquire_timeout):
+            raise Exception(f'timed out waiting for a connection from pool - {self.name}')
+        try:
+            self.evict_idle()
+            while True:
+                with self.lock:
+                    entry = self.idle_connections.pop() if self.idle_connections else None
+                if entry is None:
+                    break
+                if self.__is_healthy(entry[0]):
+                    self.__increment('reused')
+                    self.__increment('in_use')
+                    return entry[0]
+                self.__increment('health_check_failures')
+                self.__close(entry[0])
+
+            connection = self.factory()
+            self.__increment('created')
+            self.__increment('in_use')
+            return connection
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def release(self, connection, discard: bool = False):
+        self.__increment('in_use', -1)
+        if discard:
+            self.__close(connection)
+        else:
+            with self.lock:
+                self.idle_connections.append((connection, time.monotonic()))
+        self.slots.release()
+
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        except BaseException:
+            self.release(connection, discard=True)
+            raise
+        self.release(connection)
+
+    def close(self):
+        with self.lock:
+            idle_connections = list(map(lambda entry: entry[0], self.idle_connections))
+            self.idle_connections.clear()
+        for connection in idle_connections:
+            self.__close(connection)
+
+    def metrics(self) -> dict:
+        with self.lock:
+            metrics = dict(self.stats)
+            metrics['idle'] = len(self.idle_connections)
+        metrics['max_size'] = self.max_size
+        return metrics
+
+
+class ConnectionPoolRegistry:
+    __POOLS = {}
+    __LOCK = threading.Lock()
+
+    @staticmethod
+    def __pool_key(kind: str, identity: dict) -> str:
+        identity_str = json.dumps(identity, sort_keys=True, default=str)
+        return f'{kind}-{hashlib.sha256(identity_str.encode()).hexdigest()[:12]}'
+
+    @staticmethod
+    def get_pool(kind: str, identity: dict, factory, health_check=None, close=None,
+                 options: dict = None) -> ConnectionPool:
+        options = options if options else {}
+        pool_key = ConnectionPoolRegistry.__pool_key(kind, identity)
+        with ConnectionPoolRegistry.__LOCK:
+            pool = ConnectionPoolRegistry.__POOLS.get(pool_key)
+            if pool is None:
+                pool = ConnectionPool(name=pool_key, factory=factory, health_check=health_check, close=close,
+                                      max_size=int(options.get('max_size', 4)),
+                                      idle_timeout=float(options.get('idle_timeout', 300)),
+                                      acquire_timeout=float(options.get('acquire_timeout', 30)))
+                ConnectionPoolRegistry.__POOLS[pool_key] = pool
+            return pool
+
+    @staticmethod
+    def metrics() -> dict:
+        with ConnectionPoolRegistry.__LOCK:
+            pools = dict(ConnectionPoolRegistry.__POOLS)
+        return {pool_key: pool.metrics() for pool_key, pool in pools.items()}
+
+    @staticmethod
+    def close_all():
+        with ConnectionPoolRegistry.__LOCK:
+            pools = list(ConnectionPoolRegistry.__POOLS.values())
+            ConnectionPoolRegistry.__POOLS.clear()
+        for pool in pools:
+            pool.close()
+
+
+@contextmanager
+def unpooled_connection(factory, close=None):
+    connection = factory()
+    try:
+        yield connection
+    finally:
+        if close:
+            close(connection)
+
+
+def get_connection(kind: str, identity: dict, factory, health_check=None, close=None, options: dict = None):
+    options = options if options else {}
+    if not options.get('enabled', True):
+        return unpooled_connection(factory=factory, close=close)
+    return ConnectionPoolRegistry.get_pool(kind=kind, identity=identity, factory=factory, health_check=health_check,
+                                           close=close, options=options).connection()
+
+
+atexit.register(ConnectionPoolRegistry.close_all)
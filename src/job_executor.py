@@ -1,5 +1,11 @@
 import sys
 import os
+import datetime
+import multiprocessing
+import socket
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 
 if 'PATH_TO_ANALYSIS_APP' in os.environ.keys():
     sys.path.append(os.environ['PATH_TO_ANALYSIS_APP'])
@@ -7,10 +13,11 @@ if 'PATH_TO_ANALYSIS_APP' in os.environ.keys():
 from src.processor import Orchestrator
 from src.models import RuntimeContext
 from src.store import ApplicationStore, ExecutionStoreProvider, JobStore
-from src.utils import get_logger, read_config_file
+from src.utils import get_logger, read_config_file, Constants
 
 
 class JobExecutor:
+    __DEFAULT_LEASE_SECONDS = 300
 
     def __init__(self, config_file: str):
         self.logger = get_logger()
@@ -18,7 +25,17 @@ class JobExecutor:
         yaml_config = read_config_file(self.config_file)
         self.app_config = yaml_config['app']
         self.job_store = JobStore(self.app_config['app_config_file'])
-        self.execution_store = ExecutionStoreProvider.create_execution_store(self.app_config)
+        self.__execution_store = None
+        executor_config = self.app_config.get('executor', {})
+        self.worker_count = int(executor_config.get('worker_count', 1))
+        self.lease_seconds = float(executor_config.get('lease_seconds', JobExecutor.__DEFAULT_LEASE_SECONDS))
+        self.worker_id = f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+    @property
+    def execution_store(self):
+        if self.__execution_store is None:
+            self.__execution_store = ExecutionStoreProvider.create_execution_store(self.app_config)
+        return self.__execution_store
 
     def create_runtime_context(self, parameters) -> RuntimeContext:
         import copy
@@ -27,31 +44,86 @@ class JobExecutor:
             app_config[key] = parameters[key]
         return RuntimeContext(app_config)
 
-    def execute_jobs(self):
+    def execute_jobs(self, worker_count: int = None) -> int:
         self.logger.debug('executing : JobExecutor.execute_job()')
-        jobs_to_run = self.execution_store.get_job_history_by_status(statuses=['scheduled'])
-
-        self.logger.debug(f'no of scheduled jobs - {len(jobs_to_run)}')
-        if len(jobs_to_run) > 0:
-            for scheduled_job in jobs_to_run:
-                import json
-                runtime_context = self.create_runtime_context(scheduled_job.parameters)
-                application_store = ApplicationStore(runtime_context.config_file(), runtime_context.parameters)
-                application = application_store.lookup_application(scheduled_job.app_id)
-                if not application:
-                    self.logger.error(f'application not found by id - {scheduled_job.app_id}')
-                    raise Exception(f'application not found by id - {scheduled_job.app_id}')
-
-                Orchestrator(application_store=application_store,
-                             execution_store=self.execution_store,
-                             job_store=self.job_store).run_scheduled_application(
-                    execution_id=scheduled_job.execution_id,
-                    application=application,
-                    context=runtime_context)
+        worker_count = self.worker_count if worker_count is None else worker_count
+        if worker_count <= 1:
+            executed_jobs = self.run_worker()
         else:
-            self.logger.debug(f'no jobs to run')
+            with ProcessPoolExecutor(max_workers=worker_count,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = [executor.submit(run_worker, self.config_file) for _ in range(worker_count)]
+                executed_jobs = sum(map(lambda future: future.result(), futures))
 
+        self.logger.debug(f'no of executed jobs - {executed_jobs}')
         self.logger.debug('exiting : JobExecutor.execute_job()')
+        return executed_jobs
+
+    def run_worker(self) -> int:
+        self.logger.debug(f'executing : JobExecutor.run_worker(worker_id : {self.worker_id})')
+        executed_jobs = 0
+        while True:
+            claimed_jobs = self.execution_store.claim_scheduled(worker_id=self.worker_id,
+                                                                lease_seconds=self.lease_seconds, limit=1)
+            if len(claimed_jobs) == 0:
+                break
+            self.__execute_job(claimed_jobs[0])
+            executed_jobs = executed_jobs + 1
+
+        self.logger.debug(f'exiting : JobExecutor.run_worker(), executed jobs - {executed_jobs}')
+        return executed_jobs
+
+    def __renew_lease(self, execution_id: str, stop_event: threading.Event):
+        while not stop_event.wait(self.lease_seconds / 3):
+            try:
+                if not self.execution_store.renew_lease(execution_id=execution_id, worker_id=self.worker_id,
+                                                        lease_seconds=self.lease_seconds):
+                    self.logger.warning(f'lease lost for execution id - {execution_id}')
+                    return
+            except Exception as ex:
+                self.logger.warning(f'error occurred while renewing lease for execution id - {execution_id}, '
+                                    f'cause - {ex}')
+
+    def __execute_job(self, scheduled_job):
+        self.logger.info(f'worker - {self.worker_id} claimed execution id - {scheduled_job.execution_id}')
+        stop_event = threading.Event()
+        heartbeat = threading.Thread(target=self.__renew_lease, args=(scheduled_job.execution_id, stop_event),
+                                     name='lease-heartbeat', daemon=True)
+        heartbeat.start()
+        application_started = False
+        try:
+            if not self.execution_store.update_leased_summary(execution_id=scheduled_job.execution_id,
+                                                              worker_id=self.worker_id,
+                                                              **{'status': 'executing', 'message': 'app is running'}):
+                self.logger.warning(f'lease lost before start for execution id - {scheduled_job.execution_id}')
+                return
+            runtime_context = self.create_runtime_context(scheduled_job.parameters)
+            application_store = ApplicationStore(runtime_context.config_file(), runtime_context.parameters)
+            application = application_store.lookup_application(scheduled_job.app_id)
+            if not application:
+                raise Exception(f'application not found by id - {scheduled_job.app_id}')
+
+            application_started = True
+            Orchestrator(application_store=application_store,
+                         execution_store=self.execution_store,
+                         job_store=self.job_store).run_scheduled_application(
+                execution_id=scheduled_job.execution_id,
+                application=application,
+                context=runtime_context,
+                job_id=scheduled_job.job_id,
+                worker_id=self.worker_id)
+        except Exception as ex:
+            self.logger.error(f'execution failed for id - {scheduled_job.execution_id}, cause - {ex}')
+            if not application_started:
+                self.execution_store.update_leased_summary(execution_id=scheduled_job.execution_id,
+                                                           worker_id=self.worker_id,
+                                                           **{'status': 'Failed',
+                                                              'message': f'Execution failed with error - {ex}',
+                                                              'end_time': datetime.datetime.now().strftime(
+                                                                  Constants.DATE_FORMAT)})
+        finally:
+            stop_event.set()
+            heartbeat.join()
 
     @staticmethod
     def __merge_parameters(job_parameters, parameters):
@@ -78,6 +150,10 @@ class JobExecutor:
         self.logger.debug('exiting : JobExecutor.execute_job()')
 
 
+def run_worker(config_file: str) -> int:
+    return JobExecutor(config_file=config_file).run_worker()
+
+
 if __name__ == '__main__':
     arguments = sys.argv
     arguments = arguments[1:]
@@ -89,4 +165,5 @@ if __name__ == '__main__':
         raise Exception('config_file not provided in parameters')
 
     job_executor = JobExecutor(config_file=app_arguments['config_file'])
-    job_executor.execute_jobs()
+    job_executor.execute_jobs(worker_count=int(app_arguments['worker_count']) if 'worker_count' in app_arguments
+                              else None)
@@ -0,0 +1,73 @@
+import sys
+import os
+import json
+
+if 'PATH_TO_ANALYSIS_APP' in os.environ.keys():
+    sys.path.append(os.environ['PATH_TO_ANALYSIS_APP'])
+
+from src.store import SqliteExecutionStore
+from src.utils import get_logger
+
+SUMMARY_FILE_NAME = 'summary.json'
+LOG_FILE_NAME = 'summary.log'
+WATERMARK_FILE_NAME = 'watermarks.json'
+
+
+def read_execution_records(source_dir: str) -> list:
+    log_file = os.path.join(source_dir, LOG_FILE_NAME)
+    summary_file = os.path.join(source_dir, SUMMARY_FILE_NAME)
+    if not os.path.exists(log_file):
+        if not os.path.exists(summary_file):
+            return []
+        with open(summary_file, 'r') as stream:
+            return json.load(stream)
+
+    records = {}
+    with open(log_file, 'rb') as stream:
+        data = stream.read()
+    for line in data[:data.rfind(b'\n') + 1].splitlines():
+        if line.strip():
+            record = json.loads(line)
+            records[record['execution_id']] = record
+    return list(records.values())
+
+
+def migrate_execution_store(source_dir: str, db_file: str):
+    logger = get_logger()
+    logger.debug(f'executing : migrate_execution_store(source_dir : {source_dir}, db_file : {db_file})')
+    if not os.path.isdir(source_dir):
+        raise Exception(f'execution summary dir not found - {source_dir}')
+
+    sqlite_store = SqliteExecutionStore({'db_file': db_file})
+    records = read_execution_records(source_dir)
+    sqlite_store.import_records(records)
+    logger.info(f'migrated {len(records)} execution summaries to - {db_file}')
+
+    watermark_count = 0
+    watermark_file = os.path.join(source_dir, WATERMARK_FILE_NAME)
+    if os.path.exists(watermark_file):
+        with open(watermark_file, 'r') as stream:
+            watermarks = json.load(stream)
+        for job_id, job_watermarks in watermarks.items():
+            for source_name, value in job_watermarks.items():
+                sqlite_store.save_watermark(job_id=job_id, source_name=source_name, value=value)
+                watermark_count = watermark_count + 1
+    logger.info(f'migrated {watermark_count} source watermarks to - {db_file}')
+    logger.debug('exiting : migrate_execution_store()')
+    return len(records), watermark_count
+
+
+if __name__ == '__main__':
+    arguments = sys.argv
+    arguments = arguments[1:]
+    if len(arguments) == 0 or len(arguments) % 2 != 0:
+        raise Exception('invalid arguments')
+
+    app_arguments = {arguments[i]: arguments[i + 1] for i in range(0, len(arguments), 2)}
+    for argument_name in ['source_dir', 'db_file']:
+        if argument_name not in app_arguments.keys():
+            raise Exception(f'{argument_name} not provided in parameters')
+
+    record_count, watermark_count = migrate_execution_store(source_dir=app_arguments['source_dir'],
+                                                            db_file=app_arguments['db_file'])
+    print(f'migrated execution summaries - {record_count}, source watermarks - {watermark_count}')
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from src.columnar import ColumnBuilder, iter_rows, merge_columns
+
 
 class Entity(ABC):
 
@@ -133,10 +135,187 @@ class DataBag:
         self.provider = provider
         self.metadata = metadata
 
+    def is_columnar(self) -> bool:
+        return False
+
+    def is_streaming(self) -> bool:
+        return False
+
+    def iter_rows(self):
+        return iter(self.data)
+
+    def batches(self):
+        return iter([self])
+
     def __str__(self):
         return f'[name = {self.name}, provider = {self.provider}]'
 
 
+class RowView:
+
+    def __init__(self, databag):
+        self.databag = databag
+
+    def __len__(self):
+        return self.databag.row_count()
+
+    def __iter__(self):
+        return self.databag.iter_rows()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return list(self.databag.iter_rows(start=start, stop=stop))
+            return [self[position] for position in range(start, stop, step)]
+
+        row_count = len(self)
+        if index < 0:
+            index = index + row_count
+        if index < 0 or index >= row_count:
+            raise IndexError(f'row index out of range - {index}')
+        return next(self.databag.iter_rows(start=index, stop=index + 1))
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class ColumnarDataBag(DataBag):
+
+    def __init__(self, name, columns: dict, null_masks: dict = None, provider='unknown', metadata: dict = {}):
+        self.name = name
+        self.columns = columns
+        self.null_masks = null_masks if null_masks is not None else {}
+        self.provider = provider
+        self.metadata = metadata
+
+    @staticmethod
+    def from_records(name, records, provider='unknown', metadata: dict = None, column_types: dict = None):
+        builder = ColumnBuilder(column_types=column_types)
+        builder.extend(records)
+        columns, null_masks = builder.build()
+        metadata = dict(metadata) if metadata else {}
+        metadata['row_count'] = builder.row_count
+        return ColumnarDataBag(name=name, columns=columns, null_masks=null_masks, provider=provider,
+                               metadata=metadata)
+
+    @property
+    def data(self) -> RowView:
+        return RowView(self)
+
+    def is_columnar(self) -> bool:
+        return True
+
+    def column_names(self) -> list:
+        return list(self.columns.keys())
+
+    def column(self, name: str):
+        if name not in self.columns:
+            raise Exception(f'column not found - {name}')
+        return self.columns[name]
+
+    def null_mask(self, name: str):
+        return self.null_masks.get(name)
+
+    def row_count(self) -> int:
+        for column in self.columns.values():
+            return len(column)
+        return self.metadata.get('row_count', 0)
+
+    def iter_rows(self, start: int = 0, stop: int = None):
+        return iter_rows(self.columns, self.null_masks, self.row_count(), start=start, stop=stop)
+
+    def iter_row_tuples(self, start: int = 0, stop: int = None):
+        return iter_rows(self.columns, self.null_masks, self.row_count(), start=start, stop=stop, as_tuples=True)
+
+    def to_records(self) -> list:
+        return list(self.iter_rows())
+
+    def slice(self, start: int, stop: int):
+        columns = {name: column[start:stop] for name, column in self.columns.items()}
+        null_masks = {name: null_mask[start:stop] for name, null_mask in self.null_masks.items()}
+        return ColumnarDataBag(name=self.name, columns=columns, null_masks=null_masks, provider=self.provider,
+                               metadata={'row_count': min(stop, self.row_count()) - start})
+
+    def __str__(self):
+        return f'[name = {self.name}, provider = {self.provider}, columns = {self.column_names()}]'
+
+
+class RowStream:
+
+    def __init__(self, databag):
+        self.databag = databag
+
+    def __iter__(self):
+        return self.databag.iter_rows()
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class StreamingDataBag(DataBag):
+
+    def __init__(self, name, batch_source, provider='unknown', metadata: dict = None):
+        self.name = name
+        self.batch_source = batch_source
+        self.provider = provider
+        self.metadata = metadata if metadata is not None else {}
+
+    @property
+    def data(self) -> RowStream:
+        return RowStream(self)
+
+    def is_streaming(self) -> bool:
+        return True
+
+    def batches(self):
+        row_count = 0
+        batch_count = 0
+        for batch in self.batch_source():
+            batch_count = batch_count + 1
+            row_count = row_count + batch.metadata.get('row_count', 0)
+            yield batch
+        self.metadata['row_count'] = row_count
+        self.metadata['batch_count'] = batch_count
+
+    def iter_rows(self):
+        for batch in self.batches():
+            yield from batch.iter_rows()
+
+    def materialize(self) -> DataBag:
+        batches = list(self.batches())
+        metadata = dict(self.metadata)
+        if batches and all(map(lambda batch: batch.is_columnar(), batches)):
+            column_names = batches[0].column_names()
+            if all(map(lambda batch: batch.column_names() == column_names, batches)):
+                columns, null_masks, row_count = merge_columns(
+                    list(map(lambda batch: (batch.columns, batch.null_masks, batch.row_count()), batches)))
+                metadata['row_count'] = row_count
+                return ColumnarDataBag(name=self.name, columns=columns, null_masks=null_masks,
+                                       provider=self.provider, metadata=metadata)
+
+        data = []
+        for batch in batches:
+            data.extend(batch.iter_rows())
+        metadata['row_count'] = len(data)
+        return DataBag(name=self.name, data=data, provider=self.provider, metadata=metadata)
+
+
+def split_batches(databag: DataBag, batch_size: int):
+    if databag.is_streaming():
+        yield from databag.batches()
+    elif databag.is_columnar():
+        row_count = databag.row_count()
+        for start in range(0, row_count, batch_size):
+            yield databag.slice(start, start + batch_size)
+    else:
+        data = databag.data
+        for start in range(0, len(data), batch_size):
+            rows = data[start:start + batch_size]
+            yield DataBag(name=databag.name, data=rows, provider=databag.provider,
+                          metadata={'row_count': len(rows)})
+
+
 class DatabagLookup:
 
     def __init__(self, src_data_bags: dict, tr_data_bags: dict):
@@ -166,19 +345,38 @@ class DatabagRegistry:
     def __init__(self):
         self.src_data_bags = {}
         self.tr_data_bags = {}
+        self.registered = set()
+        self.databag_metrics = []
 
     def get_lookup(self) -> DatabagLookup:
         return DatabagLookup(self.src_data_bags, self.tr_data_bags)
 
+    def record_metrics(self, databag_type: str, name: str, provider: str, metadata: dict):
+        self.databag_metrics.append({'type': databag_type, 'name': name, 'provider': provider, 'metadata': metadata})
+
     def source_databag(self, name: str, databag: DataBag):
-        if name in self.src_data_bags.keys():
+        if (True, name) in self.registered:
             raise Exception(f'source databag already exists by name - {name}')
+        self.registered.add((True, name))
         self.src_data_bags[name] = databag
+        self.record_metrics('Source', databag.name, databag.provider, databag.metadata)
 
     def transformation_databag(self, name: str, databag: DataBag):
-        if name in self.tr_data_bags.keys():
+        if (False, name) in self.registered:
             raise Exception(f'transformation databag already exists by name - {name}')
+        self.registered.add((False, name))
         self.tr_data_bags[name] = databag
+        self.record_metrics('Transformation', databag.name, databag.provider, databag.metadata)
+
+    def release(self, name: str, is_source: bool):
+        if is_source:
+            self.src_data_bags.pop(name, None)
+        else:
+            self.tr_data_bags.pop(name, None)
+
+    def release_references(self, references: list):
+        for is_source, name in references:
+            self.release(name=name, is_source=is_source)
 
     def __str__(self):
         return f"[total data bags = {len(self.src_data_bags) + len(self.tr_data_bags)}]"
@@ -194,6 +392,12 @@ class SourceTemplate:
     def load(self, **kwargs) -> DataBag:
         pass
 
+    def load_batches(self, batch_size: int, **kwargs):
+        yield from split_batches(self.load(**kwargs), batch_size)
+
+    def cache_key_parts(self, **kwargs) -> list:
+        return [self.name(), {key: value for key, value in kwargs.items() if key != 'runtime_context'}]
+
 
 class TransformationTemplate:
 
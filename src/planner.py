@@ -0,0 +1,181 @@
+import heapq
+
+from src.models import Application
+
+REFERENCE_KEYS = [('source_type', 'source_name'), ('message_source_type', 'message_source_name')]
+RECORD_TRANSFORMATION_TYPES = ['field_selector', 'field_reject', 'add_field', 'rename_field', 'concat_field',
+                               'record_to_json']
+
+
+def databag_references(config: dict) -> list:
+    references = []
+    for type_key, name_key in REFERENCE_KEYS:
+        reference_type = config.get(type_key)
+        reference_name = config.get(name_key)
+        if reference_type is None and reference_name is None:
+            continue
+        if reference_type == 'source':
+            references.append((True, reference_name))
+        elif reference_type == 'transformation':
+            references.append((False, reference_name))
+        else:
+            raise Exception(f'invalid {type_key} - {reference_type}')
+    return references
+
+
+def action_references(action) -> list:
+    references = databag_references(action.config)
+    if action.action_type == 'log_data':
+        sources_to_log = action.config.get('sources_to_log')
+        transformation_to_log = action.config.get('transformation_to_log')
+        if sources_to_log is not None:
+            references = [(True, name) for name in sources_to_log]
+        elif transformation_to_log is not None:
+            references = [(False, name) for name in transformation_to_log]
+        else:
+            return None
+    elif not references and action.action_type == 'custom':
+        return None
+    return references
+
+
+class TransformationGraph:
+
+    def __init__(self, application: Application, validate_sources: bool = True):
+        self.application = application
+        self.validate_sources = validate_sources
+        self.source_names = [source.name for source in application.sources if source.status]
+        self.transformations = [transformation for transformation in application.transformations
+                                if transformation.status]
+        self.order = {}
+        self.dependencies = {}
+        self.references = {}
+        self.__build()
+        self.sorted_names = self.__sort()
+
+    def __build(self):
+        for index, transformation in enumerate(self.transformations):
+            if transformation.name in self.order:
+                raise Exception(f'duplicate transformation name - {transformation.name}')
+            self.order[transformation.name] = index
+
+        for transformation in self.transformations:
+            references = databag_references(transformation.config)
+            self.references[transformation.name] = references
+            dependencies = set()
+            for is_source, name in references:
+                if is_source and self.validate_sources and name not in self.source_names:
+                    raise Exception(f'transformation - {transformation.name} references missing source - {name}')
+                if not is_source and name not in self.order:
+                    raise Exception(
+                        f'transformation - {transformation.name} references missing transformation - {name}')
+                if not is_source:
+                    dependencies.add(name)
+
+            if not references and transformation.transformation_type == 'custom':
+                dependencies = set(filter(lambda name: self.order[name] < self.order[transformation.name],
+                                          self.order.keys()))
+            self.dependencies[transformation.name] = dependencies
+
+    def __sort(self) -> list:
+        remaining = {name: set(dependencies) for name, dependencies in self.dependencies.items()}
+        dependents = {name: [] for name in self.dependencies.keys()}
+        for name, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                dependents[dependency].append(name)
+
+        ready = [(self.order[name], name) for name, dependencies in remaining.items() if not dependencies]
+        heapq.heapify(ready)
+        sorted_names = []
+        while ready:
+            _, name = heapq.heappop(ready)
+            sorted_names.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent].discard(name)
+                if not remaining[dependent]:
+                    heapq.heappush(ready, (self.order[dependent], dependent))
+            del remaining[name]
+
+        if remaining:
+            raise Exception(f"cycle detected between transformations - {', '.join(sorted(remaining.keys()))}")
+        return sorted_names
+
+    def get_transformation(self, name: str):
+        return self.transformations[self.order[name]]
+
+    def ready(self, completed: set, scheduled: set) -> list:
+        return list(filter(lambda name: name not in scheduled and self.dependencies[name].issubset(completed),
+                           self.sorted_names))
+
+
+class DatabagLiveness:
+
+    def __init__(self, application: Application, graph: TransformationGraph):
+        self.consumers = {}
+        self.pinned = False
+        self.pinned_consumers = 0
+        for source_name in graph.source_names:
+            self.consumers[(True, source_name)] = 0
+        for name in graph.sorted_names:
+            self.consumers[(False, name)] = 0
+            references = graph.references[name]
+            if not references and graph.get_transformation(name).transformation_type == 'custom':
+                self.pinned = True
+                self.pinned_consumers = self.pinned_consumers + 1
+            self.__add_consumer(references)
+
+        for action in application.actions:
+            if action.status:
+                references = action_references(action)
+                if references is None:
+                    self.pinned = True
+                    self.pinned_consumers = self.pinned_consumers + 1
+                else:
+                    self.__add_consumer(references)
+
+    def __add_consumer(self, references: list):
+        for reference in references:
+            self.consumers[reference] = self.consumers.get(reference, 0) + 1
+
+    def shared_references(self) -> set:
+        return set(filter(lambda reference: self.consumers[reference] + self.pinned_consumers > 1,
+                          self.consumers.keys()))
+
+    def is_unused(self, reference: tuple) -> bool:
+        return not self.pinned and self.consumers.get(reference, 0) == 0
+
+    def consume(self, references: list) -> list:
+        released = []
+        for reference in references:
+            self.consumers[reference] = self.consumers[reference] - 1
+            if self.is_unused(reference):
+                released.append(reference)
+        return released
+
+
+def fuse_record_chains(application: Application, graph: TransformationGraph) -> list:
+    liveness = DatabagLiveness(application, graph)
+    if liveness.pinned:
+        return []
+
+    successors = {}
+    for name in graph.sorted_names:
+        transformation = graph.get_transformation(name)
+        references = graph.references[name]
+        if transformation.transformation_type not in RECORD_TRANSFORMATION_TYPES or len(references) != 1:
+            continue
+        is_source, input_name = references[0]
+        if is_source or graph.get_transformation(input_name).transformation_type not in RECORD_TRANSFORMATION_TYPES:
+            continue
+        if liveness.consumers[(False, input_name)] == 1:
+            successors[input_name] = name
+
+    chains = []
+    fused_names = set(successors.values())
+    for name in graph.sorted_names:
+        if name in successors and name not in fused_names:
+            chain = [name]
+            while chain[-1] in successors:
+                chain.append(successors[chain[-1]])
+            chains.append(chain)
+    return chains
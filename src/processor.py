@@ -1,12 +1,19 @@
 import copy
 import datetime
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION, FIRST_COMPLETED
 
 from src.models import RuntimeContext, Application, Source, Transformation, Action, SourceTemplate, \
-    TransformationTemplate, ActionTemplate, DatabagRegistry, Job
-from src.store import ApplicationStore, ExecutionStore, JobStore
-from src.utils import get_logger
-from src.utils import load_module, Constants
+    TransformationTemplate, ActionTemplate, DatabagRegistry, Job, StreamingDataBag
+from src.cache import SourceCache
+from src.columnar import column_values
+from src.connections import ConnectionPoolRegistry
+from src.transformations import FusedRecordTransformation
+from src.planner import TransformationGraph, DatabagLiveness, action_references, fuse_record_chains
+from src.store import ApplicationStore, ExecutionStore, JobStore, WatermarkTracker
+from src.utils import get_logger, replace_config_placeholders
+from src.utils import load_module, Constants, MemoryTracker
 
 
 class ProcessResult:
@@ -32,8 +39,19 @@ class Processor(ABC):
 
 class SourceProcessor(Processor):
 
-    def __init__(self, sources: list, runtime_context: RuntimeContext, databag_registry: DatabagRegistry):
+    def __init__(self, sources: list, runtime_context: RuntimeContext, databag_registry: DatabagRegistry,
+                 batch_size: int = None, max_parallelism: int = 1, liveness: DatabagLiveness = None,
+                 watermarks: WatermarkTracker = None, source_cache: SourceCache = None,
+                 shared_databags: set = None):
         self.sources = sources
+        self.shared_databags = shared_databags if shared_databags else set()
+        self.watermarks = watermarks
+        self.source_cache = source_cache
+        self.cache_metrics = {'hits': 0, 'misses': 0, 'writes': 0}
+        self.cache_lock = threading.Lock()
+        self.liveness = liveness
+        self.batch_size = batch_size
+        self.max_parallelism = max_parallelism
         self.source_providers = {'click_house': 'src.sources.ClickHouseSource',
                                  'json': 'src.sources.JsonSource',
                                  'csv': 'src.sources.CsvSource',
@@ -58,19 +76,124 @@ class SourceProcessor(Processor):
         if isinstance(source_provider, SourceTemplate):
             parameters = copy.copy(source.config)
             parameters['runtime_context'] = self.runtime_context
-            return source_provider.load(**parameters)
+            if parameters.get('incremental'):
+                parameters = self.__incremental_parameters(source, parameters)
+                if self.batch_size:
+                    return StreamingDataBag(name=f'{source.name}_stream', provider=source_provider.name(),
+                                            batch_source=lambda: map(
+                                                lambda batch: self.__observe_watermark(source, batch),
+                                                source_provider.load_batches(self.batch_size, **parameters)),
+                                            metadata={'batch_size': self.batch_size})
+                return self.__observe_watermark(source, self.__load(source, source_provider, parameters))
+
+            if self.batch_size:
+                return StreamingDataBag(name=f'{source.name}_stream', provider=source_provider.name(),
+                                        batch_source=lambda: source_provider.load_batches(self.batch_size,
+                                                                                          **parameters),
+                                        metadata={'batch_size': self.batch_size})
+            return self.__load(source, source_provider, parameters)
         else:
             raise Exception(f'invalid provider - {provider}, expected a provider of type SourceTemplate')
 
+    def __count_cache(self, metric_name: str):
+        with self.cache_lock:
+            self.cache_metrics[metric_name] = self.cache_metrics[metric_name] + 1
+
+    def __load(self, source: Source, source_provider: SourceTemplate, parameters: dict):
+        if not self.source_cache or not parameters.get('cache', False):
+            return source_provider.load(**parameters)
+
+        cache_key = SourceCache.create_key([source.source_type,
+                                            source_provider.cache_key_parts(**parameters),
+                                            parameters['runtime_context'].parameters])
+        databag = self.source_cache.get(cache_key, parameters.get('cache_ttl_seconds'))
+        if databag is not None:
+            self.logger.debug(f'source cache hit for source - {source.name}')
+            self.__count_cache('hits')
+            return databag
+
+        self.logger.debug(f'source cache miss for source - {source.name}')
+        self.__count_cache('misses')
+        databag = source_provider.load(**parameters)
+        self.source_cache.put(cache_key, databag)
+        self.__count_cache('writes')
+        return databag
+
+    def __incremental_parameters(self, source: Source, parameters: dict) -> dict:
+        incremental = parameters['incremental']
+        if 'watermark_column' not in incremental:
+            raise Exception(f'watermark_column not provided for incremental source - {source.name}')
+        if self.watermarks:
+            value = self.watermarks.current_value(source_name=source.name, incremental=incremental)
+        else:
+            value = incremental.get('initial_value')
+        if value is None:
+            raise Exception(f'initial_value not provided for incremental source - {source.name}')
+        watermark_parameters = {incremental.get('parameter_name', f'{source.name}_watermark'): value}
+        self.logger.debug(f'loading source - {source.name} incrementally from watermark - {watermark_parameters}')
+
+        runtime_parameters = dict(self.runtime_context.parameters)
+        runtime_parameters.update(watermark_parameters)
+        parameters = replace_config_placeholders(config=parameters, parameters=watermark_parameters)
+        parameters['runtime_context'] = RuntimeContext(runtime_parameters)
+        return parameters
+
+    def __observe_watermark(self, source: Source, databag):
+        if self.watermarks is None:
+            return databag
+        watermark_column = source.config['incremental']['watermark_column']
+        if databag.is_columnar():
+            values = []
+            if watermark_column in databag.columns:
+                values = column_values(databag.columns[watermark_column], databag.null_mask(watermark_column), 0,
+                                       databag.row_count())
+        else:
+            values = map(lambda record: record.get(watermark_column), databag.data)
+        self.watermarks.observe(source_name=source.name, values=values)
+        return databag
+
+    def __register(self, source: Source, databag):
+        if databag.is_streaming() and (True, source.name) in self.shared_databags:
+            self.logger.debug(f'materializing streaming source read by more than one consumer - {source.name}')
+            databag = databag.materialize()
+        self.databag_registry.source_databag(name=source.name, databag=databag)
+        if self.liveness and self.liveness.is_unused((True, source.name)):
+            self.logger.debug(f'releasing unused source databag - {source.name}')
+            self.databag_registry.release(name=source.name, is_source=True)
+
+    def __process_sources_concurrently(self, sources: list) -> list:
+        self.logger.debug(f'loading {len(sources)} sources with max parallelism - {self.max_parallelism}')
+        executor = ThreadPoolExecutor(max_workers=self.max_parallelism, thread_name_prefix='source')
+        futures = list(map(lambda source: executor.submit(self.__process_source, source), sources))
+        done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+        failed = list(filter(lambda future: future.exception() is not None, done))
+        if failed:
+            executor.shutdown(wait=False, cancel_futures=True)
+            source_name = sources[futures.index(failed[0])].name
+            self.logger.error(f'error occurred while loading source - {source_name}, cancelling remaining sources')
+            raise failed[0].exception()
+
+        executor.shutdown(wait=True)
+        return list(map(lambda future: future.result(), futures))
+
     def process(self) -> ProcessResult:
         self.logger.debug('executing : SourceProcessor.process()')
+        active_sources = []
         for source in self.sources:
             if source.status:
-                result = self.__process_source(source)
-                self.databag_registry.source_databag(name=source.name, databag=result)
+                active_sources.append(source)
             else:
                 self.logger.debug(f'skipping source {source} ...')
 
+        if self.max_parallelism > 1 and len(active_sources) > 1 and not self.batch_size:
+            results = self.__process_sources_concurrently(active_sources)
+            for source, result in zip(active_sources, results):
+                self.__register(source, result)
+        else:
+            for source in active_sources:
+                result = self.__process_source(source)
+                self.__register(source, result)
+
         self.logger.debug('executing : SourceProcessor.process()')
         return ProcessResult(True, 'success')
 
@@ -79,8 +202,19 @@ class TransformationProcessor(Processor):
 
     def __init__(self, transformations: list,
                  runtime_context: RuntimeContext,
-                 databag_registry: DatabagRegistry):
+                 databag_registry: DatabagRegistry,
+                 graph: TransformationGraph = None,
+                 max_parallelism: int = 1,
+                 liveness: DatabagLiveness = None,
+                 chains: list = [],
+                 shared_databags: set = None):
         self.transformations = transformations
+        self.shared_databags = shared_databags if shared_databags else set()
+        self.liveness = liveness
+        self.chains = {chain[0]: chain for chain in chains}
+        self.fused_members = set(name for chain in chains for name in chain[1:])
+        self.graph = graph
+        self.max_parallelism = max_parallelism
         self.transformation_providers = {'dummy_transformation': 'src.transformations.DummyTransformation',
                                          'message_format_transformation': 'src.extension.MessageFormatterTransformation',
                                          'field_selector': 'src.transformations.FieldSelectorTransformation',
@@ -93,8 +227,7 @@ class TransformationProcessor(Processor):
         self.runtime_context = runtime_context
         self.databag_registry = databag_registry
 
-    def __process_transformation(self, transformation: Transformation):
-        self.logger.debug(f'processing transformation - {transformation.name}')
+    def __load_provider(self, transformation: Transformation) -> TransformationTemplate:
         provider = self.transformation_providers.get(transformation.transformation_type)
         if not provider and transformation.transformation_type == 'custom':
             provider = transformation.config['provider']
@@ -105,21 +238,93 @@ class TransformationProcessor(Processor):
 
         transformation_provider = load_module(module_name=provider, databag_lookup=self.databag_registry.get_lookup())
         if isinstance(transformation_provider, TransformationTemplate):
-            tr_config = copy.copy(transformation.config)
-            return transformation_provider.execute(**tr_config)
+            return transformation_provider
         else:
             raise Exception(f'invalid provider - {provider}, expected a provider of type SourceTemplate')
 
+    def __process_transformation(self, transformation: Transformation):
+        self.logger.debug(f'processing transformation - {transformation.name}')
+        transformation_provider = self.__load_provider(transformation)
+        tr_config = copy.copy(transformation.config)
+        return transformation_provider.execute(**tr_config)
+
+    def __process_chain(self, chain: list):
+        self.logger.debug(f"processing fused transformations - {' -> '.join(chain)}")
+        transformations = list(map(lambda name: self.graph.get_transformation(name), chain))
+        steps = list(map(lambda transformation: (self.__load_provider(transformation),
+                                                 copy.copy(transformation.config)), transformations))
+        fused_provider = FusedRecordTransformation(databag_lookup=self.databag_registry.get_lookup(), steps=steps)
+        return fused_provider.execute(**steps[0][1]), steps
+
+    def __process_task(self, name: str):
+        if name in self.chains:
+            return self.__process_chain(self.chains[name])
+        return self.__process_transformation(self.graph.get_transformation(name)), None
+
+    def __complete(self, name: str, result) -> list:
+        databag, steps = result
+        names = self.chains.get(name, [name])
+        if steps:
+            for transformation_provider, _ in steps[:-1]:
+                self.databag_registry.record_metrics('Transformation', f'{transformation_provider.name()}_databag',
+                                                     transformation_provider.name(), databag.metadata)
+        if databag.is_streaming() and (False, names[-1]) in self.shared_databags:
+            self.logger.debug(f'materializing streaming transformation read by more than one consumer - {names[-1]}')
+            databag = databag.materialize()
+        self.databag_registry.transformation_databag(name=names[-1], databag=databag)
+
+        if self.liveness:
+            released = []
+            for member_name in names:
+                released.extend(self.liveness.consume(self.graph.references[member_name]))
+            if self.liveness.is_unused((False, names[-1])):
+                released.append((False, names[-1]))
+            if released:
+                self.logger.debug(f'releasing databags no longer referenced - {released}')
+                self.databag_registry.release_references(released)
+        return names
+
+    def __process_graph_concurrently(self):
+        self.logger.debug(f'executing transformation graph with max parallelism - {self.max_parallelism}')
+        completed = set()
+        running = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_parallelism, thread_name_prefix='transformation')
+        try:
+            while len(completed) < len(self.graph.sorted_names):
+                for name in self.graph.ready(completed=completed, scheduled=completed | set(running.values())):
+                    if name in self.fused_members:
+                        continue
+                    future = executor.submit(self.__process_task, name)
+                    running[future] = name
+
+                done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        self.logger.error(f'error occurred while executing transformation - {name}')
+                        raise future.exception()
+                    completed.update(self.__complete(name, future.result()))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def process(self) -> ProcessResult:
         self.logger.debug('executing : TransformationProcessor.process()')
         for transformation in self.transformations:
-            if transformation.status:
-                result = self.__process_transformation(transformation)
-                # data_dict[transformation.name] = result
-                self.databag_registry.transformation_databag(name=transformation.name, databag=result)
-            else:
+            if not transformation.status:
                 self.logger.debug(f'skipping transformation {transformation} ...')
 
+        if self.graph is None:
+            self.graph = TransformationGraph(Application(object_id=None, name=None, status=True, sources=[],
+                                                         transformations=self.transformations, actions=[]),
+                                             validate_sources=False)
+
+        if self.max_parallelism > 1:
+            self.__process_graph_concurrently()
+        else:
+            for name in self.graph.sorted_names:
+                if name not in self.fused_members:
+                    self.__complete(name, self.__process_task(name))
+
         self.logger.debug('exiting : TransformationProcessor.process()')
         return ProcessResult(True, 'success')
 
@@ -127,14 +332,18 @@ class TransformationProcessor(Processor):
 class ActionProcessor(Processor):
 
     def __init__(self, actions: list, data_dict: dict, runtime_context: RuntimeContext,
-                 databag_registry: DatabagRegistry):
+                 databag_registry: DatabagRegistry, liveness: DatabagLiveness = None):
         self.actions = actions
+        self.liveness = liveness
         self.data_dict = data_dict
         self.action_providers = {'log_data': 'src.actions.LogDataAction',
                                  'telegram_message': 'src.extension.TelegramMessageAction',
                                  'email_notification': 'src.extension.EmailNotificationAction',
                                  'json_sink': 'src.actions.JsonSinkAction',
-                                 'csv_sink': 'src.actions.CSVSinkAction'}
+                                 'csv_sink': 'src.actions.CSVSinkAction',
+                                 'arrow_sink': 'src.actions.ArrowIpcSinkAction',
+                                 'parquet_sink': 'src.actions.ParquetSinkAction',
+                                 'npz_sink': 'src.actions.NpzSinkAction'}
         self.logger = get_logger()
         self.runtime_context = runtime_context
         self.databag_registry = databag_registry
@@ -151,17 +360,19 @@ class ActionProcessor(Processor):
         action_provider = load_module(module_name=provider, databag_lookup=self.databag_registry.get_lookup())
         if isinstance(action_provider, ActionTemplate):
             action_config = copy.copy(action.config)
-            action_provider.call(**action_config)
+            return action_provider.call(**action_config)
         else:
             raise Exception(f'invalid provider - {provider}, expected a provider of type SourceTemplate')
 
     def process(self) -> ProcessResult:
         self.logger.debug('executing : ActionProcessor.process()')
-        data_dict = {}
         for action in self.actions:
             if action.status:
                 result = self.__process_action(action)
-                data_dict[action.name] = result
+                self.data_dict[action.name] = result
+                references = action_references(action)
+                if self.liveness and references is not None:
+                    self.databag_registry.release_references(self.liveness.consume(references))
             else:
                 self.logger.debug(f'skipping action {action} ...')
         self.logger.debug('exiting : ActionProcessor.process()')
@@ -169,30 +380,54 @@ class ActionProcessor(Processor):
 
 
 class ApplicationProcessor(Processor):
+    __DEFAULT_BATCH_SIZE = 10000
 
-    def __init__(self, application: Application, runtime_context: RuntimeContext):
+    def __init__(self, application: Application, runtime_context: RuntimeContext,
+                 watermarks: WatermarkTracker = None):
         self.application = application
         self.logger = get_logger()
         self.runtime_context = runtime_context
+        self.watermarks = watermarks
         self.databag_registry = DatabagRegistry()
+        self.memory_metrics = {}
+        self.cache_metrics = {}
+        self.action_results = {}
+
+    def __batch_size(self):
+        execution_mode = self.application.config.get('execution_mode', 'batch')
+        if execution_mode == 'streaming':
+            return int(self.application.config.get('batch_size', ApplicationProcessor.__DEFAULT_BATCH_SIZE))
+        elif execution_mode == 'batch':
+            return None
+        else:
+            raise Exception(f'execution mode not supported - {execution_mode}')
 
-    def __generate_metrics(self):
+    def __max_parallelism(self) -> int:
+        max_parallelism = int(self.application.config.get('max_parallelism', 1))
+        if max_parallelism < 1:
+            raise Exception(f'invalid max_parallelism - {max_parallelism}')
+        return max_parallelism
+
+    def __source_cache(self):
+        if not any(map(lambda source: source.status and source.config.get('cache', False), self.application.sources)):
+            return None
+        return SourceCache(self.application.config.get('source_cache'))
 
-        source_metrics = list(map(lambda databag: {
-            'type': 'Source',
-            'name': databag.name,
-            'provider': databag.provider,
-            'records': databag.metadata.get('row_count')
-        }, self.databag_registry.get_lookup().all_sources_databags().values()))
+    def __generate_metrics(self):
 
-        transformation_metrics = list(map(lambda databag: {
-            'type': 'Transformation',
-            'name': databag.name,
-            'provider': databag.provider,
-            'records': databag.metadata.get('row_count')
-        }, self.databag_registry.get_lookup().all_transformation_databags().values()))
+        databag_metrics = list(map(lambda metrics: {
+            'type': metrics['type'],
+            'name': metrics['name'],
+            'provider': metrics['provider'],
+            'records': metrics['metadata'].get('row_count')
+        }, self.databag_registry.databag_metrics))
 
-        return {'databag_metrics': source_metrics + transformation_metrics}
+        return {'databag_metrics': databag_metrics,
+                'memory_metrics': self.memory_metrics,
+                'connection_pool_metrics': ConnectionPoolRegistry.metrics(),
+                'source_cache_metrics': self.cache_metrics,
+                'action_metrics': {name: result for name, result in self.action_results.items()
+                                   if isinstance(result, dict)}}
 
     def process(self) -> ProcessResult:
         self.logger.debug('executing : ApplicationProcessor.process()')
@@ -201,21 +436,57 @@ class ApplicationProcessor(Processor):
             self.logger.error(f'application id - {self.application.application_id()} is disabled')
             return ProcessResult(False, f'application id - {self.application.application_id()} is disabled')
 
+        self.graph = TransformationGraph(self.application)
+        batch_size = self.__batch_size()
+        max_parallelism = self.__max_parallelism()
+        if self.application.config.get('release_databags', True):
+            liveness = DatabagLiveness(self.application, self.graph)
+        else:
+            liveness = None
+        if self.application.config.get('fuse_transformations', True):
+            chains = fuse_record_chains(self.application, self.graph)
+        else:
+            chains = []
+        if batch_size:
+            shared_databags = DatabagLiveness(self.application, self.graph).shared_references()
+        else:
+            shared_databags = set()
+        memory_tracker = MemoryTracker(trace_allocations=self.application.config.get('track_memory', False))
+        memory_tracker.start()
+
         self.logger.debug('processing sources ...')
-        execution_result = SourceProcessor(sources=self.application.sources,
+        source_processor = SourceProcessor(sources=self.application.sources,
                                            runtime_context=self.runtime_context,
-                                           databag_registry=self.databag_registry).run()
+                                           databag_registry=self.databag_registry,
+                                           batch_size=batch_size,
+                                           max_parallelism=max_parallelism,
+                                           liveness=liveness,
+                                           watermarks=self.watermarks,
+                                           source_cache=self.__source_cache(),
+                                           shared_databags=shared_databags)
+        execution_result = source_processor.run()
+        self.cache_metrics = source_processor.cache_metrics
+        memory_tracker.mark_stage('sources')
         if execution_result.status:
             self.logger.debug('processing transformations ...')
             execution_result = TransformationProcessor(transformations=self.application.transformations,
                                                        runtime_context=self.runtime_context,
-                                                       databag_registry=self.databag_registry).run()
+                                                       databag_registry=self.databag_registry,
+                                                       graph=self.graph,
+                                                       max_parallelism=max_parallelism,
+                                                       liveness=liveness,
+                                                       chains=chains,
+                                                       shared_databags=shared_databags).run()
+            memory_tracker.mark_stage('transformations')
             if execution_result.status:
                 self.logger.debug('processing actions ...')
                 execution_result = ActionProcessor(actions=self.application.actions,
-                                                   data_dict={},
+                                                   data_dict=self.action_results,
                                                    runtime_context=self.runtime_context,
-                                                   databag_registry=self.databag_registry).run()
+                                                   databag_registry=self.databag_registry,
+                                                   liveness=liveness).run()
+                memory_tracker.mark_stage('actions')
+        self.memory_metrics = memory_tracker.stop()
         self.logger.debug('exiting : ApplicationProcessor.process()')
         return ProcessResult(status=execution_result.status, message=execution_result.message,
                              inference=self.__generate_metrics())
@@ -257,12 +528,16 @@ class Orchestrator:
 
     def run_scheduled_application(self, execution_id: str,
                         application: Application,
-                        context: RuntimeContext) -> AppExecutionResult:
+                        context: RuntimeContext,
+                        job_id: str = None,
+                        worker_id: str = None) -> AppExecutionResult:
         self.logger.debug(f'executing : Orchestrator.run_application()')
 
         self.__run_job(execution_id=execution_id,
                        application=application,
-                       runtime_context=context)
+                       runtime_context=context,
+                       job_id=job_id if job_id else context.get_value('job_id', application.object_id),
+                       worker_id=worker_id)
         self.logger.debug(f'exiting : Orchestrator.run_application()')
 
     def run_application(self, context: RuntimeContext) -> AppExecutionResult:
@@ -281,25 +556,40 @@ class Orchestrator:
                                                            run_type=context.get_value('run_type', '-'),
                                                            parameters=context.parameters)
 
-        self.__run_job(execution_id=execution_id, application=application, runtime_context=context)
+        self.__run_job(execution_id=execution_id, application=application, runtime_context=context,
+                       job_id=context.get_value("job_id", context.app_id()))
         exe_result = self.logger.debug('exiting : Orchestrator.orchestrate()')
         return exe_result
 
-    def __run_job(self, execution_id: str, application: Application, runtime_context: RuntimeContext):
-        process_result = ApplicationProcessor(application=application, runtime_context=runtime_context).run()
+    def __finish_job(self, execution_id: str, worker_id: str, attributes: dict) -> bool:
+        if worker_id is None:
+            self.execution_store.update_summary(execution_id=execution_id, **attributes)
+            return True
+        if self.execution_store.update_leased_summary(execution_id=execution_id, worker_id=worker_id, **attributes):
+            return True
+        self.logger.warning(f'lease lost by worker - {worker_id}, discarding result of execution id - {execution_id}')
+        return False
+
+    def __run_job(self, execution_id: str, application: Application, runtime_context: RuntimeContext, job_id: str,
+                  worker_id: str = None):
+        watermarks = WatermarkTracker(execution_store=self.execution_store, job_id=job_id)
+        process_result = ApplicationProcessor(application=application, runtime_context=runtime_context,
+                                              watermarks=watermarks).run()
         if not process_result.status:
-            self.execution_store.update_summary(execution_id=execution_id,
-                                                **{'status': 'Failed',
-                                                   'message': f'Execution failed with error - {process_result.message}',
-                                                   'end_time': datetime.datetime.now().strftime(Constants.DATE_FORMAT)
-                                                   })
+            self.__finish_job(execution_id, worker_id,
+                              {'status': 'Failed',
+                               'message': f'Execution failed with error - {process_result.message}',
+                               'end_time': datetime.datetime.now().strftime(Constants.DATE_FORMAT)
+                               })
             self.logger.error(f'Execution failed with error - {process_result.message}')
             raise Exception(f'Execution failed with error - {process_result.message}')
 
-        self.execution_store.update_summary(execution_id=execution_id, **{'status': 'Completed',
-                                                                          'message': 'App execution completed',
-                                                                          'metrics': process_result.inference,
-                                                                          'end_time': datetime.datetime.now().strftime(
-                                                                              Constants.DATE_FORMAT)
-                                                                          })
+        if not self.__finish_job(execution_id, worker_id, {'status': 'Completed',
+                                                           'message': 'App execution completed',
+                                                           'metrics': process_result.inference,
+                                                           'end_time': datetime.datetime.now().strftime(
+                                                               Constants.DATE_FORMAT)
+                                                           }):
+            raise Exception(f'lease lost for execution id - {execution_id}')
+        watermarks.commit()
         return AppExecutionResult(app_id=application.object_id, execution_id=execution_id)
@@ -0,0 +1,338 @@
+import codecs
+import csv
+import datetime
+import gc
+import gzip
+import io
+import json
+import mmap
+import os
+import re
+from contextlib import contextmanager
+
+from src.columnar import build_column
+
+READ_CHUNK_SIZE = 1 << 16
+MMAP_READ_CHUNK_SIZE = 1 << 20
+COMPRESSION_EXTENSIONS = {'.gz': 'gzip'}
+JSON_LINES_EXTENSIONS = ['.jsonl', '.ndjson']
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+CSV_QUOTING = {'minimal': csv.QUOTE_MINIMAL, 'all': csv.QUOTE_ALL, 'nonnumeric': csv.QUOTE_NONNUMERIC,
+               'none': csv.QUOTE_NONE}
+CSV_INFERRED_TYPES = ['int', 'float', 'timestamp']
+CSV_TYPE_WIDENING = {'int': 'float', 'float': 'string', 'timestamp': 'string'}
+ISO_TIMESTAMP_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']
+CSV_CHUNK_BYTES = 64 << 20
+CSV_SAMPLE_BYTES = 1 << 20
+
+
+@contextmanager
+def gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def detect_compression(file_path: str, compression: str = None) -> str:
+    if compression is not None:
+        if compression not in ['none', 'gzip']:
+            raise Exception(f'compression not supported - {compression}')
+        return None if compression == 'none' else compression
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+
+
+def detect_json_format(file_path: str, json_format: str = None) -> str:
+    if json_format is not None:
+        if json_format not in ['json', 'jsonl']:
+            raise Exception(f'json format not supported - {json_format}')
+        return json_format
+    base_path, extension = os.path.splitext(file_path.lower())
+    if extension in COMPRESSION_EXTENSIONS:
+        extension = os.path.splitext(base_path)[1]
+    return 'jsonl' if extension in JSON_LINES_EXTENSIONS else 'json'
+
+
+def open_text(file_path: str, compression: str = None, encoding: str = None):
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rt', encoding=encoding)
+    return open(file_path, 'r', encoding=encoding)
+
+
+def iter_json_array(read, chunk_size: int = READ_CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = read(chunk_size)
+    eof = not buffer
+    position = 0
+    expect_separator = False
+    expect_value = False
+    started = False
+    read_size = chunk_size
+
+    while True:
+        position = WHITESPACE.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                raise Exception('unexpected end of json array')
+            buffer = read(chunk_size)
+            eof = not buffer
+            position = 0
+            continue
+
+        if not started:
+            if buffer[position] != '[':
+                document = buffer[position:] + ''.join(iter(lambda: read(chunk_size), ''))
+                yield json.loads(document)
+                return
+            started = True
+            position = position + 1
+            continue
+
+        if buffer[position] == ']' and not expect_value:
+            return
+        if expect_separator:
+            if buffer[position] != ',':
+                raise Exception(f'invalid json array, expected , found - {buffer[position]}')
+            expect_separator = False
+            expect_value = True
+            position = position + 1
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+
+        if not complete:
+            more = read(read_size)
+            eof = not more
+            buffer = buffer[position:] + more
+            position = 0
+            read_size = read_size * 2
+            continue
+
+        yield value
+        read_size = chunk_size
+        expect_separator = True
+        expect_value = False
+        if end > chunk_size:
+            buffer = buffer[end:]
+            position = 0
+        else:
+            position = end
+
+
+def iter_json_lines(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_mmap_json(file_path: str, json_format: str, encoding: str = None):
+    with open(file_path, 'rb') as data_stream:
+        with mmap.mmap(data_stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            if json_format == 'jsonl':
+                yield from iter_json_lines(iter(mapped_file.readline, b''))
+            else:
+                decoder = codecs.getincrementaldecoder(encoding if encoding else 'utf-8')()
+
+                def read(size: int) -> str:
+                    data = mapped_file.read(size)
+                    return decoder.decode(data, final=mapped_file.tell() == mapped_file.size())
+
+                yield from iter_json_array(read, MMAP_READ_CHUNK_SIZE)
+
+
+def iter_json_records(file_path: str, json_format: str = None, compression: str = None, encoding: str = None,
+                      use_mmap: bool = False):
+    json_format = detect_json_format(file_path, json_format)
+    compression = detect_compression(file_path, compression)
+    if use_mmap and compression is None and os.path.getsize(file_path) > 0:
+        yield from iter_mmap_json(file_path, json_format, encoding)
+        return
+
+    with open_text(file_path, compression, encoding) as data_stream:
+        if json_format == 'jsonl':
+            yield from iter_json_lines(data_stream)
+        else:
+            yield from iter_json_array(data_stream.read)
+
+
+def csv_dialect(parameters: dict) -> dict:
+    quoting = parameters.get('quoting', 'minimal')
+    if quoting not in CSV_QUOTING:
+        raise Exception(f'csv quoting not supported - {quoting}')
+    dialect = {'delimiter': parameters.get('delimiter', ','),
+               'quotechar': parameters.get('quotechar', '|'),
+               'quoting': CSV_QUOTING[quoting]}
+    if parameters.get('escapechar') is not None:
+        dialect['escapechar'] = parameters['escapechar']
+    return dialect
+
+
+def csv_value_parser(column_type: str, timestamp_format: str):
+    if column_type == 'int':
+        return int
+    elif column_type == 'float':
+        return float
+    elif column_type == 'timestamp':
+        if timestamp_format == 'iso' or timestamp_format in ISO_TIMESTAMP_FORMATS:
+            return datetime.datetime.fromisoformat
+        return lambda value: datetime.datetime.strptime(value, timestamp_format)
+    else:
+        raise Exception(f'csv column type not supported - {column_type}')
+
+
+def widest_csv_type(first_type: str, second_type: str) -> str:
+    if first_type == second_type:
+        return first_type
+    if {first_type, second_type} == {'int', 'float'}:
+        return 'float'
+    return 'string'
+
+
+def convert_csv_values(name: str, values: list, column_type: str, timestamp_format: str, strict: bool):
+    while column_type != 'string':
+        parser = csv_value_parser(column_type, timestamp_format)
+        try:
+            return column_type, [None if value is None or value == '' else parser(value) for value in values]
+        except (ValueError, TypeError) as ex:
+            if strict:
+                raise Exception(f'invalid {column_type} value in column - {name}, cause - {ex}')
+            column_type = CSV_TYPE_WIDENING[column_type]
+    return column_type, values
+
+
+def read_csv_header(file_path: str, dialect: dict, encoding: str):
+    with open(file_path, 'rb') as data_stream:
+        header_line = data_stream.readline()
+        header_end = data_stream.tell()
+    header = next(csv.reader([header_line.decode(encoding)], **dialect), [])
+    return header, header_end
+
+
+def csv_quote_bytes(dialect: dict, encoding: str) -> tuple:
+    quote = dialect['quotechar'].encode(encoding) if dialect['quoting'] != csv.QUOTE_NONE else None
+    escape = dialect['escapechar'].encode(encoding) if dialect.get('escapechar') is not None else None
+    return quote, escape
+
+
+def scan_csv_quotes(mapped_file, start: int, stop: int, quote_bytes: tuple, in_quotes: bool) -> tuple:
+    quote, escape = quote_bytes
+    if escape is None:
+        return in_quotes != (mapped_file[start:stop].count(quote) % 2 == 1), start
+
+    escaped_end = start
+    special_pattern = re.escape(escape) + b'.' + (b'|' + re.escape(quote) if quote is not None else b'')
+    for match in re.finditer(special_pattern, mapped_file[start:stop], re.DOTALL):
+        if match.group() == quote:
+            in_quotes = not in_quotes
+        else:
+            escaped_end = start + match.end()
+    return in_quotes, escaped_end
+
+
+def split_csv_boundaries(file_path: str, start: int, chunk_bytes: int, file_size: int, quote_bytes: tuple) -> list:
+    boundaries = [start]
+    with open(file_path, 'rb') as data_stream:
+        with mmap.mmap(data_stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            in_quotes = False
+            scanned = start
+            position = start + chunk_bytes
+            while position < file_size:
+                line_end = mapped_file.find(b'\n', position)
+                if line_end == -1:
+                    break
+                in_quotes, escaped_end = scan_csv_quotes(mapped_file, scanned, line_end + 1, quote_bytes, in_quotes)
+                scanned = line_end + 1
+                if in_quotes or escaped_end > line_end:
+                    position = scanned
+                    continue
+                if scanned >= file_size:
+                    break
+                boundaries.append(scanned)
+                position = scanned + chunk_bytes
+    return boundaries
+
+
+def split_csv_ranges(file_path: str, start: int, chunk_bytes: int, quote_bytes: tuple = (None, None)) -> list:
+    file_size = os.path.getsize(file_path)
+    if file_size <= start:
+        return []
+    if quote_bytes != (None, None):
+        boundaries = split_csv_boundaries(file_path, start, chunk_bytes, file_size, quote_bytes)
+    else:
+        boundaries = [start]
+        with open(file_path, 'rb') as data_stream:
+            position = start + chunk_bytes
+            while position < file_size:
+                data_stream.seek(position)
+                data_stream.readline()
+                position = data_stream.tell()
+                if position >= file_size:
+                    break
+                boundaries.append(position)
+                position = position + chunk_bytes
+    boundaries.append(file_size)
+    return [(boundaries[index], boundaries[index + 1]) for index in range(len(boundaries) - 1)
+            if boundaries[index] < boundaries[index + 1]]
+
+
+def parse_csv_values(file_path: str, start: int, stop: int, column_count: int, dialect: dict, encoding: str):
+    with open(file_path, 'rb') as data_stream:
+        data_stream.seek(start)
+        text = data_stream.read(stop - start).decode(encoding)
+
+    rows = [line for line in csv.reader(io.StringIO(text, newline=''), **dialect) if line]
+    if all(map(lambda line: len(line) == column_count, rows)):
+        return list(map(list, zip(*rows))) if rows else [[] for _ in range(column_count)]
+
+    values = [[] for _ in range(column_count)]
+    for line in rows:
+        for index, column_values in enumerate(values):
+            column_values.append(line[index] if index < len(line) else None)
+    return values
+
+
+def infer_csv_schema(file_path: str, header: list, header_end: int, dialect: dict, encoding: str,
+                     timestamp_format: str, sample_bytes: int = CSV_SAMPLE_BYTES) -> dict:
+    ranges = split_csv_ranges(file_path, header_end, sample_bytes, csv_quote_bytes(dialect, encoding))
+    if not ranges:
+        return {}
+    start, stop = ranges[0]
+    sample = parse_csv_values(file_path, start, stop, len(header), dialect, encoding)
+    schema = {}
+    for name, values in zip(header, sample):
+        values = [value for value in values if value]
+        schema[name] = 'string'
+        if values:
+            for column_type in CSV_INFERRED_TYPES:
+                if convert_csv_values(name, values, column_type, timestamp_format, strict=False)[0] == column_type:
+                    schema[name] = column_type
+                    break
+    return schema
+
+
+def parse_csv_range(file_path: str, start: int, stop: int, header: list, dialect: dict, encoding: str,
+                    schema: dict, timestamp_format: str, strict_columns: list):
+    column_types = {}
+    columns = {}
+    null_masks = {}
+    with gc_paused():
+        values = parse_csv_values(file_path, start, stop, len(header), dialect, encoding)
+        for name, column_values in zip(header, values):
+            column_types[name], converted = convert_csv_values(name, column_values, schema.get(name, 'string'),
+                                                               timestamp_format, name in strict_columns)
+            columns[name], null_mask = build_column(converted,
+                                                    'object' if column_types[name] == 'string' else column_types[name])
+            if null_mask:
+                null_masks[name] = null_mask
+    return column_types, columns, null_masks, len(values[0]) if values else 0
@@ -1,12 +1,25 @@
+import collections
 import csv
+import glob
+import itertools
 import json
+import multiprocessing
+import os
+import threading
+import time
+from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import clickhouse_connect
 import pymongo
 
-from src.models import DataBag, SourceTemplate
+from src.columnar import build_columns, from_arrow_table, merge_columns, constant_column
+from src.connections import get_connection
+from src.models import DataBag, ColumnarDataBag, SourceTemplate, split_batches
+from src.readers import iter_json_records, csv_dialect, read_csv_header, infer_csv_schema, split_csv_ranges, \
+    csv_quote_bytes, parse_csv_range, widest_csv_type, CSV_CHUNK_BYTES
 from src.models import RuntimeContext
-from src.utils import get_logger, get_credentials, replace_placeholders
+from src.utils import get_logger, get_credentials, replace_placeholders, Constants
 
 
 class ClickHouseSource(SourceTemplate):
@@ -35,25 +48,220 @@ class ClickHouseSource(SourceTemplate):
         else:
             raise Exception(f'query source - {query_source} not supported')
 
+    @staticmethod
+    def __connection(parameters: dict):
+        credentials = get_credentials(parameters['credential_provider'])
+        return get_connection(kind='clickhouse', identity=credentials,
+                              factory=lambda: clickhouse_connect.get_client(
+                                  host=credentials['host'], port=credentials['port'], username=credentials['user'],
+                                  password=credentials['password']),
+                              health_check=lambda client: client.ping(),
+                              close=lambda client: client.close(),
+                              options=parameters.get('connection_pool'))
+
+    @staticmethod
+    def __fetch_mode(parameters: dict) -> str:
+        fetch_mode = parameters.get('fetch_mode', 'columnar' if parameters.get('columnar', False) else 'rows')
+        if fetch_mode not in ['rows', 'columnar', 'numpy', 'arrow']:
+            raise Exception(f'fetch mode not supported - {fetch_mode}')
+        return fetch_mode
+
+    def __columnar_databag(self, columns: dict, null_masks: dict, column_names: list,
+                           row_count: int) -> ColumnarDataBag:
+        return ColumnarDataBag(name='clickhouse_databag', provider=self.name(), columns=columns,
+                               null_masks=null_masks, metadata={'columns': column_names, 'row_count': row_count})
+
+    def cache_key_parts(self, **kwargs) -> list:
+        query = ClickHouseSource.__get_query(query_source=kwargs.get('query_source', 'sql'),
+                                             value=kwargs['query'],
+                                             runtime_context=kwargs['runtime_context'])
+        return super().cache_key_parts(**kwargs) + [query]
+
     def load(self, **kwargs) -> DataBag:
         self.logger.debug('executing : ClickHouseSource.load()')
-        credentials = get_credentials(kwargs['credential_provider'])
-        client = clickhouse_connect.get_client(
-            host=credentials['host'], port=credentials['port'], username=credentials['user'],
-            password=credentials['password'])
-        result = client.query(
-            ClickHouseSource.__get_query(query_source=kwargs.get('query_source', 'sql'),
-                                         value=kwargs['query'],
-                                         runtime_context=kwargs['runtime_context']))
+        query = ClickHouseSource.__get_query(query_source=kwargs.get('query_source', 'sql'),
+                                             value=kwargs['query'],
+                                             runtime_context=kwargs['runtime_context'])
+        fetch_mode = ClickHouseSource.__fetch_mode(kwargs)
+        with ClickHouseSource.__connection(kwargs) as client:
+            if fetch_mode == 'arrow':
+                table = client.query_arrow(query)
+            elif fetch_mode == 'numpy':
+                result = client.query(query, use_numpy=True)
+            else:
+                result = client.query(query)
+
+        if fetch_mode == 'arrow':
+            columns, null_masks = from_arrow_table(table)
+            self.logger.debug('exiting : ClickHouseSource.load()')
+            return self.__columnar_databag(columns, null_masks, table.schema.names, table.num_rows)
+
         column_names = result.column_names
+        if fetch_mode in ['columnar', 'numpy']:
+            columns, null_masks = build_columns(column_names, result.result_columns)
+            self.logger.debug('exiting : ClickHouseSource.load()')
+            return self.__columnar_databag(columns, null_masks, column_names, result.row_count)
+
         data_list = list(
             map(lambda result_row: ClickHouseSource.__map_row(result_row, column_names), result.result_rows))
         self.logger.debug('exiting : ClickHouseSource.load()')
         return DataBag(name='clickhouse_databag', provider=self.name(), data=data_list,
                        metadata={'columns': column_names, 'row_count': result.row_count})
 
+    def load_batches(self, batch_size: int, **kwargs):
+        self.logger.debug('executing : ClickHouseSource.load_batches()')
+        query = ClickHouseSource.__get_query(query_source=kwargs.get('query_source', 'sql'),
+                                             value=kwargs['query'],
+                                             runtime_context=kwargs['runtime_context'])
+        settings = {'max_block_size': batch_size}
+        fetch_mode = ClickHouseSource.__fetch_mode(kwargs)
+        with ClickHouseSource.__connection(kwargs) as client:
+            if fetch_mode == 'arrow':
+                with client.query_arrow_stream(query, settings=settings) as stream:
+                    for record_batch in stream:
+                        columns, null_masks = from_arrow_table(record_batch)
+                        yield self.__columnar_databag(columns, null_masks, record_batch.schema.names,
+                                                      record_batch.num_rows)
+            elif fetch_mode in ['columnar', 'numpy']:
+                with client.query_column_block_stream(query, settings=settings) as stream:
+                    column_names = stream.source.column_names
+                    for block in stream:
+                        columns, null_masks = build_columns(column_names, block)
+                        yield self.__columnar_databag(columns, null_masks, column_names,
+                                                      len(block[0]) if block else 0)
+            else:
+                with client.query_row_block_stream(query, settings=settings) as stream:
+                    column_names = stream.source.column_names
+                    for block in stream:
+                        data_list = list(
+                            map(lambda result_row: ClickHouseSource.__map_row(result_row, column_names), block))
+                        yield DataBag(name='clickhouse_databag', provider=self.name(), data=data_list,
+                                      metadata={'columns': column_names, 'row_count': len(data_list)})
+        self.logger.debug('exiting : ClickHouseSource.load_batches()')
+
+
+class FileSourceBase(SourceTemplate):
+    __GLOB_CHARACTERS = ['*', '?', '[']
+    __DEFAULT_PARALLEL_READS = 8
+
+    @abstractmethod
+    def read_file(self, **kwargs) -> DataBag:
+        pass
+
+    def read_file_batches(self, batch_size: int, **kwargs):
+        yield from split_batches(self.read_file(**kwargs), batch_size)
+
+    @staticmethod
+    def resolve_files(parameters: dict) -> list:
+        file_path = parameters['file_path']
+        if any(map(lambda character: character in file_path, FileSourceBase.__GLOB_CHARACTERS)):
+            files = glob.glob(file_path, recursive=True)
+        elif os.path.isdir(file_path):
+            file_pattern = parameters.get('file_pattern', '*')
+            if parameters.get('recursive', False):
+                files = glob.glob(os.path.join(file_path, '**', file_pattern), recursive=True)
+            else:
+                files = glob.glob(os.path.join(file_path, file_pattern))
+        else:
+            return [file_path]
 
-class JsonSource(SourceTemplate):
+        files = sorted(filter(os.path.isfile, files))
+        if not files:
+            raise Exception(f'no files found for file_path - {file_path}')
+        return files
+
+    @staticmethod
+    def __source_file_column(parameters: dict) -> str:
+        source_file_column = parameters.get('source_file_column')
+        if source_file_column is None and parameters.get('include_source_file', False):
+            source_file_column = '_source_file'
+        return source_file_column
+
+    @staticmethod
+    def __add_source_file(databag: DataBag, file_path: str, source_file_column: str) -> DataBag:
+        if source_file_column is None:
+            return databag
+        if databag.is_columnar():
+            columns = dict(databag.columns)
+            columns[source_file_column], _ = constant_column(file_path, databag.row_count())
+            return ColumnarDataBag(name=databag.name, columns=columns, null_masks=databag.null_masks,
+                                   provider=databag.provider, metadata=databag.metadata)
+        for record in databag.data:
+            record[source_file_column] = file_path
+        return databag
+
+    def __read_one(self, file_path: str, parameters: dict):
+        start_time = time.perf_counter()
+        file_parameters = dict(parameters)
+        file_parameters['file_path'] = file_path
+        databag = self.read_file(**file_parameters)
+        databag = FileSourceBase.__add_source_file(databag, file_path,
+                                                   FileSourceBase.__source_file_column(parameters))
+        file_metrics = {'path': file_path, 'bytes': os.path.getsize(file_path),
+                        'read_seconds': round(time.perf_counter() - start_time, 6),
+                        'row_count': databag.metadata.get('row_count')}
+        return databag, file_metrics
+
+    def __merge(self, databags: list, metadata: dict) -> DataBag:
+        name = databags[0].name
+        if all(map(lambda databag: databag.is_columnar(), databags)):
+            column_names = list(databags[0].columns.keys())
+            if all(map(lambda databag: list(databag.columns.keys()) == column_names, databags)):
+                columns, null_masks, row_count = merge_columns(
+                    list(map(lambda databag: (databag.columns, databag.null_masks, databag.row_count()), databags)))
+                metadata['row_count'] = row_count
+                return ColumnarDataBag(name=name, columns=columns, null_masks=null_masks, provider=self.name(),
+                                       metadata=metadata)
+            return ColumnarDataBag.from_records(name=name, provider=self.name(), metadata=metadata,
+                                                records=itertools.chain.from_iterable(
+                                                    map(lambda databag: databag.iter_rows(), databags)))
+
+        data = []
+        for databag in databags:
+            data.extend(databag.iter_rows())
+        metadata['row_count'] = len(data)
+        return DataBag(name=name, provider=self.name(), data=data, metadata=metadata)
+
+    def cache_key_parts(self, **kwargs) -> list:
+        file_stats = []
+        for file_path in FileSourceBase.resolve_files(kwargs):
+            file_stat = os.stat(file_path)
+            file_stats.append([file_path, file_stat.st_mtime_ns, file_stat.st_size])
+        return super().cache_key_parts(**kwargs) + [file_stats]
+
+    def load(self, **kwargs) -> DataBag:
+        self.logger.debug(f'executing : {self.name()}.load()')
+        files = FileSourceBase.resolve_files(kwargs)
+        max_parallel_reads = int(kwargs.get('max_parallel_reads', FileSourceBase.__DEFAULT_PARALLEL_READS))
+        if max_parallel_reads <= 1 or len(files) <= 1:
+            results = list(map(lambda file_path: self.__read_one(file_path, kwargs), files))
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_parallel_reads, len(files))) as executor:
+                results = list(executor.map(lambda file_path: self.__read_one(file_path, kwargs), files))
+
+        databags = list(map(lambda result: result[0], results))
+        file_metrics = list(map(lambda result: result[1], results))
+        if len(databags) == 1:
+            databag = databags[0]
+            databag.metadata['files'] = file_metrics
+        else:
+            databag = self.__merge(databags, {'file_path': kwargs['file_path'], 'files': file_metrics})
+
+        self.logger.debug(f'exiting : {self.name()}.load()')
+        return databag
+
+    def load_batches(self, batch_size: int, **kwargs):
+        self.logger.debug(f'executing : {self.name()}.load_batches()')
+        source_file_column = FileSourceBase.__source_file_column(kwargs)
+        for file_path in FileSourceBase.resolve_files(kwargs):
+            file_parameters = dict(kwargs)
+            file_parameters['file_path'] = file_path
+            for databag in self.read_file_batches(batch_size, **file_parameters):
+                yield FileSourceBase.__add_source_file(databag, file_path, source_file_column)
+        self.logger.debug(f'exiting : {self.name()}.load_batches()')
+
+
+class JsonSource(FileSourceBase):
 
     def __init__(self):
         self.logger = get_logger()
@@ -61,17 +269,44 @@ class JsonSource(SourceTemplate):
     def name(self) -> str:
         return 'JsonSource'
 
-    def load(self, **kwargs) -> DataBag:
-        self.logger.debug('executing : JsonSource.load()')
+    @staticmethod
+    def __read_records(parameters: dict):
+        return iter_json_records(file_path=parameters['file_path'], json_format=parameters.get('format'),
+                                 compression=parameters.get('compression'), encoding=parameters.get('encoding'),
+                                 use_mmap=parameters.get('use_mmap', False))
+
+    def read_file(self, **kwargs) -> DataBag:
+        self.logger.debug('executing : JsonSource.read_file()')
         file_path = kwargs['file_path']
-        with (open(file_path, 'r')) as data_stream:
-            result = json.loads('\n'.join(data_stream.readlines()))
-            self.logger.debug('exiting : JsonSource.load()')
-            return DataBag(name='json_databag', provider=self.name(), data=result,
-                           metadata={'file_path': file_path, 'row_count': len(result)})
+        records = JsonSource.__read_records(kwargs)
+        if kwargs.get('columnar', False):
+            databag = ColumnarDataBag.from_records(name='json_databag', provider=self.name(), records=records,
+                                                   metadata={'file_path': file_path})
+        else:
+            result = list(records)
+            databag = DataBag(name='json_databag', provider=self.name(), data=result,
+                              metadata={'file_path': file_path, 'row_count': len(result)})
+        self.logger.debug('exiting : JsonSource.read_file()')
+        return databag
+
+    def read_file_batches(self, batch_size: int, **kwargs):
+        self.logger.debug('executing : JsonSource.read_file_batches()')
+        file_path = kwargs['file_path']
+        records = JsonSource.__read_records(kwargs)
+        while True:
+            data_list = list(itertools.islice(records, batch_size))
+            if not data_list:
+                break
+            if kwargs.get('columnar', False):
+                yield ColumnarDataBag.from_records(name='json_databag', provider=self.name(), records=data_list,
+                                                   metadata={'file_path': file_path})
+            else:
+                yield DataBag(name='json_databag', provider=self.name(), data=data_list,
+                              metadata={'file_path': file_path, 'row_count': len(data_list)})
+        self.logger.debug('exiting : JsonSource.read_file_batches()')
 
 
-class CsvSource(SourceTemplate):
+class CsvSource(FileSourceBase):
 
     def __init__(self):
         self.logger = get_logger()
@@ -79,18 +314,119 @@ class CsvSource(SourceTemplate):
     def name(self) -> str:
         return 'CsvSource'
 
-    def load(self, **kwargs) -> DataBag:
-        self.logger.debug('executing : CsvSource.load()')
+    @staticmethod
+    def __csv_options(parameters: dict) -> dict:
+        file_path = parameters['file_path']
+        dialect = csv_dialect(parameters)
+        encoding = parameters.get('encoding', 'utf-8')
+        timestamp_format = parameters.get('timestamp_format', Constants.DATE_FORMAT)
+        header, header_end = read_csv_header(file_path, dialect, encoding)
+        declared_schema = parameters.get('schema', {})
+        schema = {}
+        if parameters.get('infer_schema', False):
+            schema = infer_csv_schema(file_path, header, header_end, dialect, encoding, timestamp_format)
+        schema.update(declared_schema)
+        return {'file_path': file_path, 'header': header, 'dialect': dialect, 'encoding': encoding,
+                'schema': schema, 'timestamp_format': timestamp_format, 'strict_columns': list(declared_schema.keys()),
+                'ranges': split_csv_ranges(file_path, header_end,
+                                           int(parameters.get('chunk_bytes', CSV_CHUNK_BYTES)),
+                                           csv_quote_bytes(dialect, encoding))}
+
+    @staticmethod
+    def __parse_range(options: dict, byte_range: tuple, schema: dict = None, strict_columns: list = None):
+        return parse_csv_range(options['file_path'], byte_range[0], byte_range[1], options['header'],
+                               options['dialect'], options['encoding'],
+                               schema if schema is not None else options['schema'], options['timestamp_format'],
+                               strict_columns if strict_columns is not None else options['strict_columns'])
+
+    def __parse_chunks(self, options: dict, max_workers: int):
+        ranges = options['ranges']
+        if max_workers <= 1 or len(ranges) <= 1:
+            for byte_range in ranges:
+                yield byte_range, CsvSource.__parse_range(options, byte_range)
+            return
+
+        self.logger.debug(f"parsing {len(ranges)} csv chunks with {max_workers} processes")
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            pending = collections.deque()
+            for byte_range in ranges:
+                if len(pending) >= max_workers * 2:
+                    yield pending[0][0], pending.popleft()[1].result()
+                pending.append((byte_range, executor.submit(
+                    parse_csv_range, options['file_path'], byte_range[0], byte_range[1], options['header'],
+                    options['dialect'], options['encoding'], options['schema'], options['timestamp_format'],
+                    options['strict_columns'])))
+            while pending:
+                yield pending[0][0], pending.popleft()[1].result()
+
+    def __columnar_databag(self, file_path: str, column_types: dict, parts: list) -> ColumnarDataBag:
+        columns, null_masks, row_count = merge_columns(parts)
+        return ColumnarDataBag(name='csv_databag', provider=self.name(), columns=columns, null_masks=null_masks,
+                               metadata={'file_path': file_path, 'row_count': row_count, 'schema': column_types})
+
+    def __load_columnar(self, parameters: dict) -> DataBag:
+        options = CsvSource.__csv_options(parameters)
+        max_workers = int(parameters.get('max_workers', os.cpu_count() or 1))
+        chunks = list(self.__parse_chunks(options, max_workers))
+        column_types = {name: 'string' for name in options['header']}
+        if chunks:
+            column_types = dict(chunks[0][1][0])
+            for _, (chunk_types, _, _, _) in chunks[1:]:
+                for name, column_type in chunk_types.items():
+                    column_types[name] = widest_csv_type(column_types[name], column_type)
+
+        parts = []
+        for byte_range, (chunk_types, columns, null_masks, row_count) in chunks:
+            if chunk_types != column_types:
+                chunk_types, columns, null_masks, row_count = CsvSource.__parse_range(
+                    options, byte_range, column_types, list(column_types.keys()))
+            parts.append((columns, null_masks, row_count))
+        if not parts:
+            parts.append(({name: [] for name in options['header']}, {}, 0))
+
+        self.logger.debug('exiting : CsvSource.read_file()')
+        return self.__columnar_databag(options['file_path'], column_types, parts)
+
+    def read_file(self, **kwargs) -> DataBag:
+        self.logger.debug('executing : CsvSource.read_file()')
         file_path = kwargs['file_path']
-        with (open(file_path, 'r')) as data_stream:
-            csv_file = csv.DictReader(data_stream, delimiter=',', quotechar='|')
+        if kwargs.get('columnar', False):
+            return self.__load_columnar(kwargs)
+
+        with (open(file_path, 'r', encoding=kwargs.get('encoding'))) as data_stream:
+            csv_file = csv.DictReader(data_stream, **csv_dialect(kwargs))
             result = list(map(lambda line: line, csv_file))
-            self.logger.debug('exiting : CsvSource.load()')
+            self.logger.debug('exiting : CsvSource.read_file()')
             return DataBag(name='csv_databag', provider=self.name(), data=result,
                            metadata={'file_path': file_path, 'row_count': len(result)})
 
+    def read_file_batches(self, batch_size: int, **kwargs):
+        self.logger.debug('executing : CsvSource.read_file_batches()')
+        file_path = kwargs['file_path']
+        if kwargs.get('columnar', False):
+            options = CsvSource.__csv_options(kwargs)
+            options['schema'] = {name: options['schema'].get(name, 'string') for name in options['header']}
+            options['strict_columns'] = list(options['header'])
+            max_workers = int(kwargs.get('max_workers', os.cpu_count() or 1))
+            for _, (column_types, columns, null_masks, row_count) in self.__parse_chunks(options, max_workers):
+                databag = self.__columnar_databag(file_path, column_types, [(columns, null_masks, row_count)])
+                yield from split_batches(databag, batch_size)
+        else:
+            with (open(file_path, 'r', encoding=kwargs.get('encoding'))) as data_stream:
+                csv_file = csv.DictReader(data_stream, **csv_dialect(kwargs))
+                while True:
+                    data_list = list(itertools.islice(csv_file, batch_size))
+                    if not data_list:
+                        break
+                    yield DataBag(name='csv_databag', provider=self.name(), data=data_list,
+                                  metadata={'file_path': file_path, 'row_count': len(data_list)})
+        self.logger.debug('exiting : CsvSource.read_file_batches()')
+
 
 class MongoDbSource(SourceTemplate):
+    __VALIDATED_COLLECTIONS = set()
+    __VALIDATION_LOCK = threading.Lock()
 
     def __init__(self):
         self.logger = get_logger()
@@ -98,40 +434,95 @@ class MongoDbSource(SourceTemplate):
     def name(self) -> str:
         return 'MongoDbSource'
 
+    @staticmethod
+    def __connection(credentials: dict, parameters: dict):
+        return get_connection(kind='mongodb', identity=credentials,
+                              factory=lambda: pymongo.MongoClient(host=credentials['host'],
+                                                                  port=credentials['port'],
+                                                                  username=credentials['user'],
+                                                                  password=credentials['password']),
+                              health_check=lambda mong_client: mong_client.admin.command('ping'),
+                              close=lambda mong_client: mong_client.close(),
+                              options=parameters.get('connection_pool'))
+
+    def __get_collection(self, mong_client, credentials: dict, database_name: str, collection_name: str):
+        validation_key = (credentials['host'], credentials['port'], database_name, collection_name)
+        with MongoDbSource.__VALIDATION_LOCK:
+            if validation_key not in MongoDbSource.__VALIDATED_COLLECTIONS:
+                if database_name not in mong_client.list_database_names():
+                    self.logger.error(f'database - {database_name} not found')
+                    raise Exception(f'database - {database_name} not found')
+
+                if collection_name not in mong_client.get_database(database_name).list_collection_names():
+                    self.logger.error(f'collection - {collection_name} not found')
+                    raise Exception(f'collection - {collection_name} not found')
+                MongoDbSource.__VALIDATED_COLLECTIONS.add(validation_key)
+
+        return mong_client.get_database(database_name).get_collection(collection_name)
+
+    @staticmethod
+    def __open_cursor(collection, parameters: dict):
+        query_filter = parameters.get('filter', {})
+        projection = parameters.get('projection', None)
+        limit = parameters.get('limit', 0)
+        batch_size = parameters.get('batch_size', 0)
+
+        pipeline = parameters.get('pipeline')
+        if pipeline is not None:
+            stages = []
+            if query_filter:
+                stages.append({'$match': query_filter})
+            stages.extend(pipeline)
+            if projection:
+                stages.append({'$project': projection})
+            if limit:
+                stages.append({'$limit': limit})
+            options = {'allowDiskUse': parameters.get('allow_disk_use', False)}
+            if batch_size:
+                options['batchSize'] = batch_size
+            return collection.aggregate(stages, **options)
+
+        if projection:
+            return collection.find(filter=query_filter, projection=projection, limit=limit, batch_size=batch_size)
+        else:
+            return collection.find(filter=query_filter, limit=limit, batch_size=batch_size)
+
+    def __read_documents(self, parameters: dict):
+        credentials = get_credentials(parameters['credential_provider'])
+        with MongoDbSource.__connection(credentials, parameters) as mong_client:
+            collection = self.__get_collection(mong_client, credentials, parameters['database'],
+                                               parameters['collection'])
+            with MongoDbSource.__open_cursor(collection, parameters) as cursor:
+                yield from cursor
+
     def load(self, **kwargs) -> DataBag:
         self.logger.debug('executing : MongoDbSource.load()')
-        credentials = get_credentials(kwargs['credential_provider'])
-        mong_client = pymongo.MongoClient(host=credentials['host'],
-                                          port=credentials['port'],
-                                          username=credentials['user'],
-                                          password=credentials['password'])
-
-        database_name = kwargs['database']
-        if database_name not in mong_client.list_database_names():
-            self.logger.error(f'database - {database_name} not found')
-            raise Exception(f'database - {database_name} not found')
-
-        database = mong_client.get_database(database_name)
-
-        collection_name = kwargs['collection']
-        if collection_name not in database.list_collection_names():
-            self.logger.error(f'collection - {collection_name} not found')
-            raise Exception(f'collection - {collection_name} not found')
-        collection = database.get_collection(collection_name)
-
-        projection = kwargs.get('projection', None)
-        if projection:
-            data_list = collection.find(filter=kwargs.get('filter', {}),
-                                        projection=projection,
-                                        limit=kwargs.get('limit', 0))
+        documents = self.__read_documents(kwargs)
+        if kwargs.get('columnar', False):
+            databag = ColumnarDataBag.from_records(name='mongodb_databag', provider=self.name(), records=documents)
         else:
-            data_list = collection.find(filter=kwargs.get('filter', {}),
-                                        limit=kwargs.get('limit', 0))
+            data_list = list(documents)
+            databag = DataBag(name='mongodb_databag', provider=self.name(), data=data_list,
+                              metadata={'row_count': len(data_list)})
 
         self.logger.debug('exiting : MongoDbSource.load()')
-        return DataBag(name='mongodb_databag', provider=self.name(),
-                       data=list(map(lambda item: item, data_list)),
-                       metadata={})
+        return databag
+
+    def load_batches(self, batch_size: int, **kwargs):
+        self.logger.debug('executing : MongoDbSource.load_batches()')
+        parameters = dict(kwargs)
+        parameters['batch_size'] = kwargs.get('batch_size', batch_size)
+        documents = self.__read_documents(parameters)
+        while True:
+            data_list = list(itertools.islice(documents, batch_size))
+            if not data_list:
+                break
+            if kwargs.get('columnar', False):
+                yield ColumnarDataBag.from_records(name='mongodb_databag', provider=self.name(), records=data_list)
+            else:
+                yield DataBag(name='mongodb_databag', provider=self.name(), data=data_list,
+                              metadata={'row_count': len(data_list)})
+        self.logger.debug('exiting : MongoDbSource.load_batches()')
 
 
 class DevDataSource(SourceTemplate):
@@ -146,10 +537,13 @@ class DevDataSource(SourceTemplate):
         self.logger.debug('executing : DevDataSource.load()')
         dev_data = kwargs['data']
         self.logger.debug('executing : DevDataSource.load()')
+        if kwargs.get('columnar', False):
+            return ColumnarDataBag.from_records(name='dev_databag', provider=self.name(), records=dev_data)
         return DataBag(name='dev_databag', provider=self.name(), data=dev_data, metadata={'row_count': len(dev_data)})
 
 
 class DbSource(SourceTemplate):
+    __DEFAULT_FETCH_SIZE = 10000
 
     def __init__(self):
         self.logger = get_logger()
@@ -158,41 +552,87 @@ class DbSource(SourceTemplate):
         return 'DbSource'
 
     @staticmethod
-    def __map_to_dict(metadata, record):
-        i = 0
-        data = {}
-        while i < len(metadata):
-            col_metadata = metadata[i]
-            data[col_metadata[0]] = record[i]
-            i = i + 1
-        return data
-
-    def load(self, **kwargs) -> DataBag:
-        self.logger.debug('executing : DbSource.load()')
-        connection_config = kwargs['connection_config']
-        import jaydebeapi
-        conn = jaydebeapi.connect(jclassname=connection_config['driver_class'],
-                                  url=connection_config['jdbc_url'],
-                                  driver_args=connection_config['driver_args'],
-                                  jars=connection_config['jars'])
-
-        read_query = kwargs['read_query']
-        query_parameters = kwargs.get('query_parameters')
-        with conn.cursor() as curs:
+    def __connection(parameters: dict):
+        connection_config = parameters['connection_config']
+
+        def connect():
+            import jaydebeapi
+            return jaydebeapi.connect(jclassname=connection_config['driver_class'],
+                                      url=connection_config['jdbc_url'],
+                                      driver_args=connection_config['driver_args'],
+                                      jars=connection_config['jars'])
+
+        def is_valid(conn) -> bool:
+            validation_query = connection_config.get('validation_query')
+            if validation_query is None:
+                return conn.jconn.isValid(int(connection_config.get('validation_timeout', 5)))
+            with conn.cursor() as curs:
+                curs.execute(validation_query)
+                curs.fetchall()
+            return True
+
+        return get_connection(kind='jdbc', identity=connection_config, factory=connect, health_check=is_valid,
+                              close=lambda conn: conn.close(), options=parameters.get('connection_pool'))
+
+    def __fetch_batches(self, parameters: dict, fetch_size: int):
+        read_query = parameters['read_query']
+        query_parameters = parameters.get('query_parameters')
+        with DbSource.__connection(parameters) as conn, conn.cursor() as curs:
             self.logger.debug(f'executing query - {read_query}, query_parameters - {query_parameters}')
             if query_parameters:
                 curs.execute(read_query, query_parameters)
             else:
                 curs.execute(read_query)
-            records = list(
-                map(lambda record: DbSource.__map_to_dict(curs.description, record), curs.fetchall()))
-
-            curs.close()
-            conn.close()
-
-            self.logger.debug('executing : DbSource.load()')
-            return DataBag(name='db_databag', provider=self.name(), data=records,
-                           metadata={'row_count': len(records)})
-            return records
-
+            column_names = list(map(lambda col_metadata: col_metadata[0], curs.description))
+            fetched = False
+            while True:
+                rows = curs.fetchmany(fetch_size)
+                if not rows:
+                    break
+                fetched = True
+                yield column_names, rows
+            if not fetched:
+                yield column_names, []
+
+    def __columnar_databag(self, column_names: list, values: list, row_count: int) -> ColumnarDataBag:
+        columns, null_masks = build_columns(column_names, values)
+        return ColumnarDataBag(name='db_databag', provider=self.name(), columns=columns, null_masks=null_masks,
+                               metadata={'columns': column_names, 'row_count': row_count})
 
+    def load(self, **kwargs) -> DataBag:
+        self.logger.debug('executing : DbSource.load()')
+        fetch_size = int(kwargs.get('fetch_size', DbSource.__DEFAULT_FETCH_SIZE))
+        columnar = kwargs.get('columnar', False)
+        column_names = []
+        values = []
+        records = []
+        for column_names, rows in self.__fetch_batches(kwargs, fetch_size):
+            if columnar:
+                if not values:
+                    values = [[] for _ in column_names]
+                for column_values, row_values in zip(values, zip(*rows)):
+                    column_values.extend(row_values)
+            else:
+                records.extend(map(lambda row: dict(zip(column_names, row)), rows))
+
+        self.logger.debug('exiting : DbSource.load()')
+        if columnar:
+            row_count = len(values[0]) if values else 0
+            return self.__columnar_databag(column_names, values if values else [[] for _ in column_names],
+                                           row_count)
+        return DataBag(name='db_databag', provider=self.name(), data=records, metadata={'row_count': len(records)})
+
+    def load_batches(self, batch_size: int, **kwargs):
+        self.logger.debug('executing : DbSource.load_batches()')
+        fetch_size = int(kwargs.get('fetch_size', batch_size))
+        columnar = kwargs.get('columnar', False)
+        for column_names, rows in self.__fetch_batches(kwargs, fetch_size):
+            if not rows:
+                continue
+            if columnar:
+                yield self.__columnar_databag(column_names, list(map(list, zip(*rows))), len(rows))
+            else:
+                records = list(map(lambda row: dict(zip(column_names, row)), rows))
+                yield DataBag(name='db_databag', provider=self.name(), data=records,
+                              metadata={'columns': column_names, 'row_count': len(records)})
+        self.logger.debug('exiting : DbSource.load_batches()')
@@ -1,12 +1,26 @@
+from src.connections import get_connection
 from src.models import Application, Source, Transformation, Action, Job
+from src.planner import TransformationGraph
 import json
 from src.utils import get_logger, replace_placeholders, Constants
+import atexit
+import bisect
+import itertools
 import os
 import datetime
+import sqlite3
+import time
+import threading
 import uuid
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 import jaydebeapi
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 
 class ApplicationStore:
 
@@ -16,12 +30,16 @@ class ApplicationStore:
         self.logger = get_logger()
 
         self.applications: dict = None
+        self.invalid_applications: dict = {}
         records = self.__load_all_records()
         self.__load_applications(records=records)
         self.logger.debug(f'number of applications - {len(self.applications)}')
 
     def lookup_application(self, application_id: str) -> Application:
         self.logger.debug(f'executing : ApplicationStore.lookup_application(application_id : {application_id})')
+        if application_id in self.invalid_applications:
+            raise Exception(f'invalid application - {application_id}, '
+                            f'cause - {self.invalid_applications[application_id]}')
         self.logger.debug(f'exiting : ApplicationStore.lookup_application()')
         return self.applications.get(application_id)
 
@@ -42,6 +60,12 @@ class ApplicationStore:
         raw_data_list = list(filter(lambda record: record.get('type', 'application') == 'application', records))
         for raw_data in raw_data_list:
             app = ApplicationStore.__parse_application(raw_data)
+            try:
+                TransformationGraph(app)
+            except Exception as ex:
+                self.logger.error(f'skipping invalid application - {app.object_id}, cause - {ex}')
+                self.invalid_applications[app.object_id] = str(ex)
+                continue
             self.applications[app.object_id] = app
 
     @staticmethod
@@ -164,7 +188,7 @@ class JobStore:
 
 class ExecutionDetail:
     __ATTRIBUTES = ["execution_id", "job_id", "app_id", "status", "run_by", "message", "start_time", "end_time",
-                    "update_time", "run_type", "parameters", "metrics"]
+                    "update_time", "run_type", "parameters", "metrics", "worker_id", "lease_expiry"]
 
     def __init__(self, execution_id: str = None, job_id: str = None, app_id: str = None, status: str = None,
                  message: str = None,
@@ -174,7 +198,9 @@ class ExecutionDetail:
                  parameters: dict = None,
                  run_by: str = None,
                  run_type: str = "adhoc",
-                 metrics: dict = {}):
+                 metrics: dict = {},
+                 worker_id: str = None,
+                 lease_expiry: str = None):
         self.execution_id = execution_id
         self.job_id = job_id
         self.app_id = app_id
@@ -187,6 +213,8 @@ class ExecutionDetail:
         self.run_by = run_by
         self.run_type = run_type
         self.metrics = metrics
+        self.worker_id = worker_id
+        self.lease_expiry = lease_expiry
 
     @staticmethod
     def from_dict(data: dict):
@@ -218,10 +246,17 @@ class ExecutionDetail:
 
 
 class ExecutionStoreBase(ABC):
+    LEASED_STATUSES = ['claimed', 'executing']
 
     def __init__(self, parameters: dict):
         self.parameters = parameters
 
+    @staticmethod
+    def lease_times(lease_seconds: float) -> tuple:
+        now = datetime.datetime.now()
+        return now.strftime(Constants.DATE_FORMAT), \
+            (now + datetime.timedelta(seconds=lease_seconds)).strftime(Constants.DATE_FORMAT)
+
     @abstractmethod
     def create_summary(self, job_id: str, app_id: str, status: str, message: str, run_by: str,
                        run_type: str, parameters: dict = None) -> str:
@@ -236,69 +271,227 @@ class ExecutionStoreBase(ABC):
         pass
 
     @abstractmethod
-    def get_job_history(self, job_id: str) -> list:
+    def get_job_history(self, job_id: str, limit: int = None, cursor: str = None, since: str = None) -> list:
+        pass
+
+    @abstractmethod
+    def get_latest_execution(self, job_id: str) -> ExecutionDetail:
+        pass
+
+    @abstractmethod
+    def claim_scheduled(self, worker_id: str, lease_seconds: float, limit: int = 1) -> list:
+        pass
+
+    @abstractmethod
+    def renew_lease(self, execution_id: str, worker_id: str, lease_seconds: float) -> bool:
+        pass
+
+    @abstractmethod
+    def update_leased_summary(self, execution_id: str, worker_id: str, **kwargs) -> bool:
         pass
 
+    @abstractmethod
+    def get_watermark(self, job_id: str, source_name: str):
+        pass
+
+    @abstractmethod
+    def save_watermark(self, job_id: str, source_name: str, value):
+        pass
+
+
+class WatermarkTracker:
+
+    def __init__(self, execution_store: ExecutionStoreBase, job_id: str):
+        self.logger = get_logger()
+        self.execution_store = execution_store
+        self.job_id = job_id
+        self.observed = {}
+        self.lock = threading.Lock()
+
+    def current_value(self, source_name: str, incremental: dict):
+        value = self.execution_store.get_watermark(job_id=self.job_id, source_name=source_name)
+        return incremental.get('initial_value') if value is None else value
+
+    @staticmethod
+    def __normalize(value):
+        return value if isinstance(value, (int, float)) and not isinstance(value, bool) else str(value)
+
+    def observe(self, source_name: str, values):
+        values = list(map(WatermarkTracker.__normalize, filter(lambda value: value is not None, values)))
+        if not values:
+            return
+        with self.lock:
+            current = self.observed.get(source_name)
+            if current is not None:
+                values.append(current)
+            if len(set(map(lambda value: isinstance(value, str), values))) > 1:
+                raise Exception(f'watermark column for source - {source_name} mixes numeric and non numeric values')
+            self.observed[source_name] = max(values)
+
+    def commit(self):
+        with self.lock:
+            observed = dict(self.observed)
+        for source_name, value in observed.items():
+            self.logger.debug(f'saving watermark for job - {self.job_id}, source - {source_name}, value - {value}')
+            self.execution_store.save_watermark(job_id=self.job_id, source_name=source_name, value=value)
+
 
 class ExecutionStore(ExecutionStoreBase):
     __SUMMARY_FILE_NAME = "summary.json"
+    __LOG_FILE_NAME = "summary.log"
+    __LOCK_FILE_NAME = "summary.lock"
+    __WATERMARK_FILE_NAME = "watermarks.json"
+    __DEFAULT_COMPACTION_MIN_LINES = 1000
 
     def __init__(self, parameters: dict):
+        self.logger = get_logger()
         self.parameters = parameters
         base_dir = parameters['base_dir']
         self.summary_file = os.path.join(base_dir, ExecutionStore.__SUMMARY_FILE_NAME)
+        self.log_file = os.path.join(base_dir, ExecutionStore.__LOG_FILE_NAME)
+        self.lock_file = os.path.join(base_dir, ExecutionStore.__LOCK_FILE_NAME)
+        self.watermark_file = os.path.join(base_dir, ExecutionStore.__WATERMARK_FILE_NAME)
+        self.compaction_min_lines = int(parameters.get('compaction_min_lines',
+                                                       ExecutionStore.__DEFAULT_COMPACTION_MIN_LINES))
+        self.fsync = parameters.get('fsync', True)
+        self.lock = threading.RLock()
+        self.__reset_indexes()
         if not os.path.exists(base_dir):
             os.mkdir(base_dir)
 
-        self.__get_summary_file_name(base_dir)
-        if not os.path.exists(self.summary_file):
-            self.__create_empty_summary_file()
-
-    def __get_summary_file_name(self, base_dir: str):
-        summary_files = list(filter(lambda file_path: file_path.startswith("summary_"), os.listdir(base_dir)))
-
-    def __create_empty_summary_file(self):
-        with open(self.summary_file, 'w') as stream:
-            stream.write('[]')
-
-    def __fetch_all_records(self):
-        with open(self.summary_file, 'r') as stream:
-            data = json.load(stream)
-            records = list(map(lambda record: ExecutionDetail.from_dict(record), data))
-            return records
-
-    def __fetch_summary(self, execution_id: str) -> ExecutionDetail:
-        records = self.__fetch_all_records()
-        matched_records = list(filter(lambda record: record.execution_id == execution_id, records))
-        if len(matched_records) > 0:
-            return matched_records[0]
-        else:
-            return None
-
-    def __save_records(self, execution_details: list):
-        with open(self.summary_file, 'w') as stream:
-            data = list(map(lambda record: record.get_as_dict(), execution_details))
-            stream.write(json.dumps(data, indent=0))
-
-    def __save_summary(self, execution_detail: ExecutionDetail, replace_existing=True):
-        existing_records = self.__fetch_all_records()
-        if replace_existing:
-            filtered_records = list(
-                filter(lambda record: record.execution_id != execution_detail.execution_id, existing_records))
-            filtered_records.append(execution_detail)
-            self.__save_records(filtered_records)
+        with self.__file_lock():
+            if not os.path.exists(self.log_file):
+                self.__migrate_summary_file()
+            self.__refresh()
+
+    def __reset_indexes(self):
+        self.records = {}
+        self.positions = {}
+        self.job_index = {}
+        self.job_positions = {}
+        self.status_index = {}
+        self.log_inode = None
+        self.log_offset = 0
+        self.log_lines = 0
+
+    @contextmanager
+    def __file_lock(self):
+        with self.lock:
+            with open(self.lock_file, 'a') as lock_stream:
+                if fcntl is not None:
+                    fcntl.flock(lock_stream.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_stream.fileno(), fcntl.LOCK_UN)
+
+    def __sync(self, stream):
+        stream.flush()
+        if self.fsync:
+            os.fsync(stream.fileno())
+
+    def __sync_directory(self):
+        if self.fsync and hasattr(os, 'O_DIRECTORY'):
+            directory_fd = os.open(os.path.dirname(self.log_file) or '.', os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+
+    def __migrate_summary_file(self):
+        records = []
+        if os.path.exists(self.summary_file):
+            with open(self.summary_file, 'r') as stream:
+                records = json.load(stream)
+            self.logger.info(f'migrating {len(records)} execution summaries from - {self.summary_file}')
+        self.__write_log(records)
+
+    def __write_log(self, records: list):
+        temp_file = f'{self.log_file}.tmp'
+        with open(temp_file, 'wb') as stream:
+            for record in records:
+                stream.write(f'{json.dumps(record)}\n'.encode())
+            self.__sync(stream)
+        os.replace(temp_file, self.log_file)
+        self.__sync_directory()
+
+    def __index_job(self, job_id: str, execution_id: str):
+        job_positions = self.job_positions.setdefault(job_id, [])
+        index = bisect.bisect_right(job_positions, self.positions[execution_id])
+        job_positions.insert(index, self.positions[execution_id])
+        self.job_index.setdefault(job_id, []).insert(index, execution_id)
+
+    def __unindex_job(self, job_id: str, execution_id: str):
+        job_positions = self.job_positions.get(job_id, [])
+        index = bisect.bisect_left(job_positions, self.positions[execution_id])
+        if index < len(job_positions) and self.job_index[job_id][index] == execution_id:
+            del job_positions[index]
+            del self.job_index[job_id][index]
+
+    def __apply(self, record: dict):
+        execution_id = record['execution_id']
+        previous = self.records.get(execution_id)
+        if previous is None:
+            self.positions[execution_id] = len(self.positions)
+            self.__index_job(record['job_id'], execution_id)
         else:
-            existing_records.append(execution_detail)
-            self.__save_records(existing_records)
-
-    def __update_summary(self, execution_detail: ExecutionDetail):
-        records = self.__fetch_all_records()
-        matched_records = list(
-            filter(lambda record: record.execution_id == execution_detail.execution_id, records))
-        if matched_records is None or len(matched_records) == 0:
-            raise Exception(f'execution summary not found for id - {execution_detail.execution_id}')
-
-        self.__save_summary(execution_detail=execution_detail, replace_existing=True)
+            self.status_index.get(previous['status'], {}).pop(execution_id, None)
+            if previous['job_id'] != record['job_id']:
+                self.__unindex_job(previous['job_id'], execution_id)
+                self.__index_job(record['job_id'], execution_id)
+        self.records[execution_id] = record
+        self.status_index.setdefault(record['status'], {})[execution_id] = None
+        self.log_lines = self.log_lines + 1
+
+    def __refresh(self):
+        with self.lock:
+            try:
+                stream = open(self.log_file, 'rb')
+            except FileNotFoundError:
+                return
+            with stream:
+                file_stat = os.fstat(stream.fileno())
+                if file_stat.st_ino != self.log_inode or file_stat.st_size < self.log_offset:
+                    self.__reset_indexes()
+                    self.log_inode = file_stat.st_ino
+                if file_stat.st_size == self.log_offset:
+                    return
+                stream.seek(self.log_offset)
+                data = stream.read()
+
+            complete_size = data.rfind(b'\n') + 1
+            for line in data[:complete_size].splitlines():
+                if line.strip():
+                    self.__apply(json.loads(line))
+            self.log_offset = self.log_offset + complete_size
+
+    def __append(self, record: dict):
+        with open(self.log_file, 'ab') as stream:
+            if os.fstat(stream.fileno()).st_size > self.log_offset:
+                self.logger.warning(f'discarding incomplete execution summary record in - {self.log_file}')
+                stream.truncate(self.log_offset)
+            data = f'{json.dumps(record)}\n'.encode()
+            stream.write(data)
+            self.__sync(stream)
+        self.log_offset = self.log_offset + len(data)
+        self.__apply(record)
+        self.__compact()
+
+    def __compact(self):
+        stale_lines = self.log_lines - len(self.records)
+        if stale_lines <= max(self.compaction_min_lines, len(self.records)):
+            return
+        self.logger.debug(f'compacting execution summary log, records - {len(self.records)}, stale - {stale_lines}')
+        self.__write_log(list(self.records.values()))
+        self.__reset_indexes()
+        self.__refresh()
+
+    def __fetch_records(self, execution_ids) -> list:
+        with self.lock:
+            self.__refresh()
+            execution_ids = sorted(execution_ids(), key=lambda execution_id: self.positions[execution_id])
+            return list(map(lambda execution_id: ExecutionDetail.from_dict(self.records[execution_id]), execution_ids))
 
     def create_summary(self, job_id: str, app_id: str, status: str, message: str, run_by: str,
                        run_type: str, parameters: dict = None) -> str:
@@ -307,35 +500,334 @@ class ExecutionStore(ExecutionStoreBase):
                                            message=message,
                                            start_time=datetime.datetime.now().strftime(Constants.DATE_FORMAT),
                                            parameters=parameters, run_by=run_by)
-        self.__save_summary(execution_detail=execution_detail, replace_existing=False)
+        with self.__file_lock():
+            self.__refresh()
+            self.__append(execution_detail.get_as_dict())
         return execution_id
 
-    def update_summary(self, execution_id: str, **kwargs):
-        existing_summary = self.__fetch_summary(execution_id=execution_id)
-        if not existing_summary:
-            raise Exception(f'execution summary not found for id - {execution_id}')
-        existing_summary.update_attributes(**kwargs)
+    def __update_record(self, existing_record: dict, execution_id: str, attributes: dict):
+        existing_summary = ExecutionDetail.from_dict(existing_record)
+        existing_summary.update_attributes(**attributes)
         existing_summary.update_attributes(
             **{
                 'execution_id': execution_id,
                 'update_time': datetime.datetime.now().strftime(Constants.DATE_FORMAT),
             })
-        self.__update_summary(execution_detail=existing_summary)
+        self.__append(existing_summary.get_as_dict())
 
-    def get_job_history(self, job_id: str) -> list:
-        records = self.__fetch_all_records()
-        matched_records = list(filter(lambda record: record.job_id == job_id, records))
-        return matched_records
+    def update_summary(self, execution_id: str, **kwargs):
+        with self.__file_lock():
+            self.__refresh()
+            existing_record = self.records.get(execution_id)
+            if not existing_record:
+                raise Exception(f'execution summary not found for id - {execution_id}')
+            self.__update_record(existing_record, execution_id, kwargs)
+
+    def update_leased_summary(self, execution_id: str, worker_id: str, **kwargs) -> bool:
+        with self.__file_lock():
+            self.__refresh()
+            existing_record = self.records.get(execution_id)
+            if existing_record is None or existing_record['status'] not in ExecutionStoreBase.LEASED_STATUSES \
+                    or existing_record.get('worker_id') != worker_id:
+                return False
+            self.__update_record(existing_record, execution_id, kwargs)
+        return True
+
+    def get_job_history(self, job_id: str, limit: int = None, cursor: str = None, since: str = None) -> list:
+        def page() -> list:
+            start = 0
+            if cursor is not None:
+                if cursor not in self.positions:
+                    return []
+                start = bisect.bisect_right(self.job_positions.get(job_id, []), self.positions[cursor])
+            job_executions = self.job_index.get(job_id, [])
+            execution_ids = []
+            for index in range(start, len(job_executions)):
+                execution_id = job_executions[index]
+                if limit is not None and len(execution_ids) >= int(limit):
+                    break
+                if since is not None and (self.records[execution_id]['start_time'] or '') < since:
+                    continue
+                execution_ids.append(execution_id)
+            return execution_ids
+
+        return self.__fetch_records(page)
+
+    def get_latest_execution(self, job_id: str) -> ExecutionDetail:
+        records = self.__fetch_records(lambda: self.job_index.get(job_id, [])[-1:])
+        return records[0] if records else None
 
     def get_job_history_by_status(self, statuses: list) -> list:
-        records = self.__fetch_all_records()
-        return list(filter(lambda record: record.status in statuses, records))
+        return self.__fetch_records(lambda: [execution_id for status in set(statuses)
+                                             for execution_id in self.status_index.get(status, {}).keys()])
+
+    def claim_scheduled(self, worker_id: str, lease_seconds: float, limit: int = 1) -> list:
+        now, lease_expiry = ExecutionStoreBase.lease_times(lease_seconds)
+        claimed = []
+        with self.__file_lock():
+            self.__refresh()
+            candidates = list(self.status_index.get('scheduled', {}).keys())
+            for status in ExecutionStoreBase.LEASED_STATUSES:
+                candidates.extend(filter(lambda execution_id: (self.records[execution_id].get('lease_expiry') or now) < now,
+                                         self.status_index.get(status, {}).keys()))
+            for execution_id in sorted(candidates, key=lambda execution_id: self.positions[execution_id])[:limit]:
+                record = dict(self.records[execution_id])
+                if record['status'] != 'scheduled':
+                    self.logger.warning(f'reclaiming expired lease of worker - {record.get("worker_id")}, '
+                                        f'execution id - {execution_id}')
+                record.update({'status': 'claimed', 'worker_id': worker_id, 'lease_expiry': lease_expiry,
+                               'update_time': now})
+                self.__append(record)
+                claimed.append(ExecutionDetail.from_dict(record))
+        return claimed
+
+    def renew_lease(self, execution_id: str, worker_id: str, lease_seconds: float) -> bool:
+        now, lease_expiry = ExecutionStoreBase.lease_times(lease_seconds)
+        with self.__file_lock():
+            self.__refresh()
+            record = self.records.get(execution_id)
+            if record is None or record['status'] not in ExecutionStoreBase.LEASED_STATUSES \
+                    or record.get('worker_id') != worker_id:
+                return False
+            record = dict(record)
+            record.update({'lease_expiry': lease_expiry, 'update_time': now})
+            self.__append(record)
+        return True
+
+    def __fetch_watermarks(self) -> dict:
+        if not os.path.exists(self.watermark_file):
+            return {}
+        with open(self.watermark_file, 'r') as stream:
+            return json.load(stream)
+
+    def get_watermark(self, job_id: str, source_name: str):
+        return self.__fetch_watermarks().get(job_id, {}).get(source_name)
+
+    def save_watermark(self, job_id: str, source_name: str, value):
+        with self.__file_lock():
+            watermarks = self.__fetch_watermarks()
+            watermarks.setdefault(job_id, {})[source_name] = value
+            temp_file = f'{self.watermark_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_file, 'w') as stream:
+                stream.write(json.dumps(watermarks, indent=0))
+                self.__sync(stream)
+            os.replace(temp_file, self.watermark_file)
+            self.__sync_directory()
+
+
+class SqliteExecutionStore(ExecutionStoreBase):
+    __ATTRIBUTES = ['execution_id', 'job_id', 'app_id', 'status', 'run_by', 'message', 'start_time', 'update_time',
+                    'end_time', 'run_type', 'parameters', 'metrics', 'worker_id', 'lease_expiry']
+    __LEASE_COLUMNS = ['worker_id', 'lease_expiry']
+    __JSON_ATTRIBUTES = ['parameters', 'metrics']
+    __SCHEMA = [
+        """create table if not exists execution_result(
+        seq integer primary key autoincrement,
+        execution_id text not null unique,
+        job_id text,
+        app_id text,
+        status text,
+        run_by text,
+        message text,
+        start_time text,
+        update_time text,
+        end_time text,
+        run_type text,
+        parameters text,
+        metrics text,
+        worker_id text,
+        lease_expiry text)""",
+        'create index if not exists execution_result_job_idx on execution_result(job_id, seq)',
+        'create index if not exists execution_result_status_idx on execution_result(status, seq)',
+        'create index if not exists execution_result_start_time_idx on execution_result(start_time)',
+        """create table if not exists source_watermark(
+        job_id text not null,
+        source_name text not null,
+        watermark_value text,
+        update_time text,
+        primary key(job_id, source_name))"""
+    ]
+    __SELECT_QUERY = f"select seq, {', '.join(__ATTRIBUTES)} from execution_result"
+    __INSERT_QUERY = f"insert into execution_result({', '.join(__ATTRIBUTES)}) " \
+                     f"values({', '.join(map(lambda attribute: '?', __ATTRIBUTES))})"
+    __IMPORT_QUERY = f"insert or replace into execution_result({', '.join(__ATTRIBUTES)}) " \
+                     f"values({', '.join(map(lambda attribute: '?', __ATTRIBUTES))})"
+    __CLAIMABLE_CONDITION = f"(status = 'scheduled' or (status in " \
+                            f"({', '.join(map(lambda status: repr(status), ExecutionStoreBase.LEASED_STATUSES))}) " \
+                            f"and lease_expiry < ?))"
+    __SELECT_CLAIMABLE_QUERY = f'select execution_id from execution_result where {__CLAIMABLE_CONDITION} ' \
+                               f'order by seq limit ?'
+    __CLAIM_QUERY = f"update execution_result set status = 'claimed', worker_id = ?, lease_expiry = ?, " \
+                    f"update_time = ? where execution_id = ? and {__CLAIMABLE_CONDITION}"
+    __LEASED_CONDITION = f"worker_id = ? and status in " \
+                         f"({', '.join(map(lambda status: repr(status), ExecutionStoreBase.LEASED_STATUSES))})"
+    __RENEW_LEASE_QUERY = f"update execution_result set lease_expiry = ?, update_time = ? " \
+                          f"where execution_id = ? and {__LEASED_CONDITION}"
+    __SELECT_WATERMARK_QUERY = 'select watermark_value from source_watermark where job_id = ? and source_name = ?'
+    __SAVE_WATERMARK_QUERY = 'insert into source_watermark(job_id,source_name,watermark_value,update_time) ' \
+                             'values(?,?,?,?) on conflict(job_id, source_name) do update set ' \
+                             'watermark_value = excluded.watermark_value, update_time = excluded.update_time'
+
+    def __init__(self, parameters: dict):
+        self.logger = get_logger()
+        self.parameters = parameters
+        self.db_file = parameters['db_file']
+        self.busy_timeout = float(parameters.get('busy_timeout', 30))
+        self.local = threading.local()
+        db_dir = os.path.dirname(self.db_file)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir, exist_ok=True)
+        with self.__connection() as conn:
+            for statement in SqliteExecutionStore.__SCHEMA:
+                conn.execute(statement)
+            columns = list(map(lambda row: row[1], conn.execute('pragma table_info(execution_result)').fetchall()))
+            for column in SqliteExecutionStore.__LEASE_COLUMNS:
+                if column not in columns:
+                    conn.execute(f'alter table execution_result add column {column} text')
+
+    def __connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=self.busy_timeout, cached_statements=128)
+            conn.execute('pragma journal_mode=wal')
+            conn.execute('pragma synchronous=normal')
+            self.local.conn = conn
+        return conn
+
+    @staticmethod
+    def __to_row(record: dict) -> list:
+        return list(map(lambda attribute: json.dumps(record.get(attribute))
+                        if attribute in SqliteExecutionStore.__JSON_ATTRIBUTES else record.get(attribute),
+                        SqliteExecutionStore.__ATTRIBUTES))
+
+    @staticmethod
+    def __map_record(row) -> ExecutionDetail:
+        data_dict = {}
+        for attribute, value in zip(SqliteExecutionStore.__ATTRIBUTES, row[1:]):
+            if attribute in SqliteExecutionStore.__JSON_ATTRIBUTES and value is not None:
+                value = json.loads(value)
+            data_dict[attribute] = value
+        return ExecutionDetail.from_dict(data_dict)
+
+    def __query(self, where_clause: str, query_parameters: list, limit: int = None, cursor: str = None,
+                since: str = None, descending: bool = False) -> list:
+        if since is not None:
+            where_clause = f'{where_clause} and start_time >= ?'
+            query_parameters = query_parameters + [since]
+        if cursor is not None:
+            where_clause = f'{where_clause} and seq > (select seq from execution_result where execution_id = ?)'
+            query_parameters = query_parameters + [cursor]
+        select_query = f"{SqliteExecutionStore.__SELECT_QUERY} where {where_clause} " \
+                       f"order by seq{' desc' if descending else ''}"
+        if limit is not None:
+            select_query = f'{select_query} limit ?'
+            query_parameters = query_parameters + [int(limit)]
+        rows = self.__connection().execute(select_query, query_parameters).fetchall()
+        return list(map(lambda row: SqliteExecutionStore.__map_record(row), rows))
+
+    def create_summary(self, job_id: str, app_id: str, status: str, message: str, run_by: str,
+                       run_type: str, parameters: dict = None) -> str:
+        self.logger.debug('executing : SqliteExecutionStore.create_summary()')
+        execution_id = str(uuid.uuid1())
+        start_time = datetime.datetime.now().strftime(Constants.DATE_FORMAT)
+        execution_detail = ExecutionDetail(execution_id=execution_id, job_id=job_id, app_id=app_id, status=status,
+                                           message=message, start_time=start_time, update_time=start_time,
+                                           parameters=parameters, run_by=run_by, run_type=run_type)
+        with self.__connection() as conn:
+            conn.execute(SqliteExecutionStore.__INSERT_QUERY,
+                         SqliteExecutionStore.__to_row(execution_detail.get_as_dict()))
+        self.logger.debug('exiting : SqliteExecutionStore.create_summary()')
+        return execution_id
+
+    def __update(self, execution_id: str, attributes: dict, worker_id: str = None) -> int:
+        invalid_attributes = list(filter(lambda key: key not in SqliteExecutionStore.__ATTRIBUTES, attributes.keys()))
+        if len(invalid_attributes) > 0:
+            raise Exception(f"invalid attributes - {', '.join(invalid_attributes)}")
+
+        attributes['update_time'] = datetime.datetime.now().strftime(Constants.DATE_FORMAT)
+        update_part = ', '.join(list(map(lambda key: f'{key} = ?', attributes.keys())))
+        query_parameters = list(map(lambda key: json.dumps(attributes[key])
+                                    if key in SqliteExecutionStore.__JSON_ATTRIBUTES else attributes[key],
+                                    attributes.keys()))
+        update_query = f'update execution_result set {update_part} where execution_id = ?'
+        query_parameters.append(execution_id)
+        if worker_id is not None:
+            update_query = f'{update_query} and {SqliteExecutionStore.__LEASED_CONDITION}'
+            query_parameters.append(worker_id)
+        with self.__connection() as conn:
+            return conn.execute(update_query, query_parameters).rowcount
+
+    def update_summary(self, execution_id: str, **kwargs):
+        self.logger.debug('executing : SqliteExecutionStore.update_summary()')
+        if self.__update(execution_id, kwargs) == 0:
+            raise Exception(f'execution summary not found for id - {execution_id}')
+        self.logger.debug('exiting : SqliteExecutionStore.update_summary()')
+
+    def update_leased_summary(self, execution_id: str, worker_id: str, **kwargs) -> bool:
+        return self.__update(execution_id, kwargs, worker_id=worker_id) > 0
+
+    def get_job_history(self, job_id: str, limit: int = None, cursor: str = None, since: str = None) -> list:
+        self.logger.debug(f'executing : SqliteExecutionStore.get_job_history(job_id : {job_id})')
+        records = self.__query('job_id = ?', [job_id], limit=limit, cursor=cursor, since=since)
+        self.logger.debug('exiting : SqliteExecutionStore.get_job_history()')
+        return records
+
+    def get_latest_execution(self, job_id: str) -> ExecutionDetail:
+        records = self.__query('job_id = ?', [job_id], limit=1, descending=True)
+        return records[0] if records else None
+
+    def get_job_history_by_status(self, statuses: list) -> list:
+        self.logger.debug(f'executing : SqliteExecutionStore.get_job_history_by_status(statuses : {statuses})')
+        records = self.__query(f"status in ({','.join(map(lambda status: '?', statuses))})", list(statuses))
+        self.logger.debug('exiting : SqliteExecutionStore.get_job_history_by_status()')
+        return records
+
+    def claim_scheduled(self, worker_id: str, lease_seconds: float, limit: int = 1) -> list:
+        self.logger.debug(f'executing : SqliteExecutionStore.claim_scheduled(worker_id : {worker_id})')
+        now, lease_expiry = ExecutionStoreBase.lease_times(lease_seconds)
+        conn = self.__connection()
+        conn.execute('begin immediate')
+        try:
+            execution_ids = list(map(lambda row: row[0],
+                                     conn.execute(SqliteExecutionStore.__SELECT_CLAIMABLE_QUERY, [now, limit])))
+            for execution_id in execution_ids:
+                conn.execute(SqliteExecutionStore.__CLAIM_QUERY, [worker_id, lease_expiry, now, execution_id, now])
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        records = self.__query(f"execution_id in ({','.join(map(lambda execution_id: '?', execution_ids))})",
+                               execution_ids) if execution_ids else []
+        self.logger.debug('exiting : SqliteExecutionStore.claim_scheduled()')
+        return records
+
+    def renew_lease(self, execution_id: str, worker_id: str, lease_seconds: float) -> bool:
+        now, lease_expiry = ExecutionStoreBase.lease_times(lease_seconds)
+        with self.__connection() as conn:
+            cursor = conn.execute(SqliteExecutionStore.__RENEW_LEASE_QUERY, [lease_expiry, now, execution_id, worker_id])
+        return cursor.rowcount > 0
+
+    def import_records(self, records: list):
+        with self.__connection() as conn:
+            conn.executemany(SqliteExecutionStore.__IMPORT_QUERY,
+                             map(lambda record: SqliteExecutionStore.__to_row(record), records))
+
+    def get_watermark(self, job_id: str, source_name: str):
+        row = self.__connection().execute(SqliteExecutionStore.__SELECT_WATERMARK_QUERY,
+                                          [job_id, source_name]).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def save_watermark(self, job_id: str, source_name: str, value):
+        update_time = datetime.datetime.now().strftime(Constants.DATE_FORMAT)
+        with self.__connection() as conn:
+            conn.execute(SqliteExecutionStore.__SAVE_WATERMARK_QUERY,
+                         [job_id, source_name, json.dumps(value), update_time])
 
 
 class DbExecutionStoreBase(ExecutionStoreBase):
     """
     create table execution_result(
-    execution_id VARCHAR(64) not null,
+    execution_id VARCHAR(64) not null primary key,
     job_id VARCHAR(64),
     app_id VARCHAR(64),
     status VARCHAR(64),
@@ -346,17 +838,245 @@ class DbExecutionStoreBase(ExecutionStoreBase):
     end_time VARCHAR(64),
     run_type VARCHAR(64),
     parameters VARCHAR(2048),
-    metrics VARCHAR(2048)
+    metrics VARCHAR(2048),
+    worker_id VARCHAR(128),
+    lease_expiry VARCHAR(64)
+    )
+
+    create index execution_result_job_idx on execution_result(job_id, start_time)
+
+    create index execution_result_status_idx on execution_result(status)
+
+    create table source_watermark(
+    job_id VARCHAR(64) not null,
+    source_name VARCHAR(256) not null,
+    watermark_value VARCHAR(256),
+    update_time VARCHAR(64),
+    primary key(job_id, source_name)
     )
     """
 
+    __SELECT_SEQUENCE = ['execution_id', 'job_id', 'app_id', 'status', 'run_by', 'message', 'start_time',
+                         'update_time', 'end_time', 'run_type', 'parameters', 'metrics', 'worker_id', 'lease_expiry']
+    __SELECT_QUERY = f"select {', '.join(__SELECT_SEQUENCE)} from execution_result"
+    __INSERT_QUERY = 'insert into execution_result(execution_id,job_id,app_id,status,message,run_by,run_type,' \
+                     'start_time,update_time,parameters) values(?,?,?,?,?,?,?,?,?,?)'
+    __CLAIMABLE_CONDITION = f"(status = 'scheduled' or (status in " \
+                            f"({', '.join(map(lambda status: repr(status), ExecutionStoreBase.LEASED_STATUSES))}) " \
+                            f"and lease_expiry < ?))"
+    __SELECT_CLAIMABLE_QUERY = f'select execution_id from execution_result where {__CLAIMABLE_CONDITION} ' \
+                               f'order by start_time, execution_id'
+    __CLAIM_QUERY = f"update execution_result set status = 'claimed', worker_id = ?, lease_expiry = ?, " \
+                    f"update_time = ? where execution_id = ? and {__CLAIMABLE_CONDITION}"
+    __LEASED_CONDITION = f"worker_id = ? and status in " \
+                         f"({', '.join(map(lambda status: repr(status), ExecutionStoreBase.LEASED_STATUSES))})"
+    __RENEW_LEASE_QUERY = f"update execution_result set lease_expiry = ?, update_time = ? " \
+                          f"where execution_id = ? and {__LEASED_CONDITION}"
+    __SELECT_WATERMARK_QUERY = 'select watermark_value from source_watermark where job_id = ? and source_name = ?'
+    __UPDATE_WATERMARK_QUERY = 'update source_watermark set watermark_value = ?, update_time = ? ' \
+                               'where job_id = ? and source_name = ?'
+    __INSERT_WATERMARK_QUERY = 'insert into source_watermark(job_id,source_name,watermark_value,update_time) ' \
+                               'values(?,?,?,?)'
+    __DEFAULT_BATCH_SIZE = 100
+    __DEFAULT_FLUSH_INTERVAL = 1.0
+    __DEFAULT_MAX_PENDING = 10000
+    __DEFAULT_RETRY_COUNT = 3
+    __DEFAULT_RETRY_DELAY = 0.5
+
     def __init__(self, parameters: dict):
         self.logger = get_logger()
         self.parameters = parameters
-        self.conn = jaydebeapi.connect(jclassname=self.parameters['driver_class_name'],
-                                       url=self.parameters['jdbc_url'],
-                                       driver_args=self.parameters['driver_args'],
-                                       jars=self.parameters['jars'])
+        self.connection_config = {'driver_class_name': parameters['driver_class_name'],
+                                  'jdbc_url': parameters['jdbc_url'],
+                                  'driver_args': parameters['driver_args'],
+                                  'jars': parameters['jars']}
+        write_behind = parameters.get('write_behind', {})
+        self.write_behind = write_behind.get('enabled', False)
+        self.batch_size = int(write_behind.get('batch_size', DbExecutionStoreBase.__DEFAULT_BATCH_SIZE))
+        self.flush_interval = float(write_behind.get('flush_interval', DbExecutionStoreBase.__DEFAULT_FLUSH_INTERVAL))
+        self.max_pending = int(write_behind.get('max_pending', DbExecutionStoreBase.__DEFAULT_MAX_PENDING))
+        self.retry_count = int(parameters.get('retry_count', DbExecutionStoreBase.__DEFAULT_RETRY_COUNT))
+        self.retry_delay = float(parameters.get('retry_delay', DbExecutionStoreBase.__DEFAULT_RETRY_DELAY))
+        self.pending_writes = []
+        self.buffer_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.closed = threading.Event()
+
+        self.__execute(lambda conn: None, 'connect')
+        if self.write_behind:
+            threading.Thread(target=self.__flush_periodically, name='execution-store-flusher', daemon=True).start()
+            atexit.register(self.close)
+
+    def __connection(self):
+        connection_config = self.connection_config
+
+        def connect():
+            return jaydebeapi.connect(jclassname=connection_config['driver_class_name'],
+                                      url=connection_config['jdbc_url'],
+                                      driver_args=connection_config['driver_args'],
+                                      jars=connection_config['jars'])
+
+        return get_connection(kind='jdbc', identity=connection_config, factory=connect,
+                              health_check=self.__is_valid, close=lambda conn: conn.close(),
+                              options=self.parameters.get('connection_pool'))
+
+    def __is_valid(self, conn) -> bool:
+        validation_query = self.parameters.get('validation_query')
+        if validation_query is None:
+            return conn.jconn.isValid(int(self.parameters.get('validation_timeout', 5)))
+        with conn.cursor() as curs:
+            curs.execute(validation_query)
+            curs.fetchall()
+        return True
+
+    def __is_connection_error(self, conn) -> bool:
+        try:
+            return not self.__is_valid(conn)
+        except Exception:
+            return True
+
+    def __execute(self, operation, description: str):
+        attempt = 1
+        while True:
+            connection_error = True
+            try:
+                with self.__connection() as conn:
+                    try:
+                        return operation(conn)
+                    except Exception:
+                        connection_error = self.__is_connection_error(conn)
+                        raise
+            except Exception as ex:
+                if not connection_error or attempt >= self.retry_count:
+                    raise
+                self.logger.warning(f'{description} failed, reconnecting, attempt - {attempt}, cause - {ex}')
+                time.sleep(self.retry_delay * attempt)
+                attempt = attempt + 1
+
+    @staticmethod
+    def __execute_batches(conn, batches: list):
+        conn.jconn.setAutoCommit(False)
+        try:
+            with conn.cursor() as curs:
+                for query, parameter_list in batches:
+                    if len(parameter_list) == 1:
+                        curs.execute(query, parameter_list[0])
+                    else:
+                        curs.executemany(query, parameter_list)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.jconn.setAutoCommit(True)
+
+    @staticmethod
+    def __skip_committed_inserts(conn, batches: list) -> list:
+        remaining_batches = []
+        for query, parameter_list in batches:
+            if query == DbExecutionStoreBase.__INSERT_QUERY:
+                execution_ids = list(map(lambda query_parameters: query_parameters[0], parameter_list))
+                committed_ids = set()
+                with conn.cursor() as curs:
+                    for index in range(0, len(execution_ids), DbExecutionStoreBase.__DEFAULT_BATCH_SIZE):
+                        chunk_ids = execution_ids[index:index + DbExecutionStoreBase.__DEFAULT_BATCH_SIZE]
+                        curs.execute(f"select execution_id from execution_result where execution_id in "
+                                     f"({','.join(map(lambda execution_id: '?', chunk_ids))})", chunk_ids)
+                        committed_ids.update(map(lambda row: row[0], curs.fetchall()))
+                parameter_list = list(filter(lambda query_parameters: query_parameters[0] not in committed_ids,
+                                             parameter_list))
+            if parameter_list:
+                remaining_batches.append((query, parameter_list))
+        return remaining_batches
+
+    def __execute_writes(self, batches: list, description: str, retried: bool = False):
+        attempts = []
+
+        def write(conn):
+            # a failed commit may still have been applied, inserts already present are not sent again
+            pending_batches = DbExecutionStoreBase.__skip_committed_inserts(conn, batches) \
+                if retried or attempts else batches
+            attempts.append(description)
+            DbExecutionStoreBase.__execute_batches(conn, pending_batches)
+
+        self.__execute(write, description)
+
+    def __write(self, query: str, query_parameters: list):
+        if not self.write_behind:
+            self.__execute_writes([(query, [query_parameters])], 'execution store write')
+            return
+        with self.buffer_lock:
+            self.pending_writes.append((query, query_parameters, 0))
+            buffer_full = len(self.pending_writes) >= self.batch_size
+        if buffer_full:
+            self.__flush_pending()
+
+    def __requeue(self, pending_writes: list):
+        with self.buffer_lock:
+            self.pending_writes = pending_writes + self.pending_writes
+            overflow = len(self.pending_writes) - self.max_pending
+            if overflow > 0:
+                dropped_writes = self.pending_writes[:overflow]
+                self.pending_writes = self.pending_writes[overflow:]
+            else:
+                dropped_writes = []
+        for query, query_parameters, _ in dropped_writes:
+            self.logger.error(f'dropping execution store write, pending writes exceed max_pending - '
+                              f'{self.max_pending}, query - {query}, parameters - {query_parameters}')
+
+    def __write_individually(self, pending_writes: list) -> list:
+        failed_writes = []
+        for query, query_parameters, failures in pending_writes:
+            try:
+                self.__execute_writes([(query, [query_parameters])], 'execution store write', retried=True)
+            except Exception as ex:
+                failures = failures + 1
+                if failures >= self.retry_count:
+                    self.logger.error(f'dropping execution store write after {failures} failures, query - {query}, '
+                                      f'parameters - {query_parameters}, cause - {ex}')
+                else:
+                    failed_writes.append((query, query_parameters, failures))
+        return failed_writes
+
+    def flush(self):
+        with self.flush_lock:
+            with self.buffer_lock:
+                pending_writes = self.pending_writes
+                self.pending_writes = []
+            if not pending_writes:
+                return
+            self.logger.debug(f'flushing execution store writes - {len(pending_writes)}')
+            batches = [(query, list(map(lambda write: write[1], writes)))
+                       for query, writes in itertools.groupby(pending_writes, key=lambda write: write[0])]
+            try:
+                self.__execute_writes(batches, 'execution store flush',
+                                      retried=any(map(lambda write: write[2] > 0, pending_writes)))
+                return
+            except Exception as ex:
+                self.logger.warning(f'execution store flush failed, writing statements individually, cause - {ex}')
+
+            try:
+                failed_writes = self.__write_individually(pending_writes)
+            except BaseException:
+                self.__requeue(pending_writes)
+                raise
+            if failed_writes:
+                self.__requeue(failed_writes)
+                raise Exception(f'execution store writes failed and were requeued - {len(failed_writes)}')
+
+    def __flush_pending(self):
+        try:
+            self.flush()
+        except Exception as ex:
+            self.logger.error(f'error occurred while flushing execution store writes, cause - {ex}')
+
+    def __flush_periodically(self):
+        while not self.closed.wait(self.flush_interval):
+            self.__flush_pending()
+
+    def close(self):
+        self.closed.set()
+        self.__flush_pending()
 
     def create_summary(self, job_id: str, app_id: str, status: str, message: str, run_by: str,
                        run_type: str, parameters: dict = None) -> str:
@@ -366,32 +1086,48 @@ class DbExecutionStoreBase(ExecutionStoreBase):
         update_time = datetime.datetime.now().strftime(Constants.DATE_FORMAT)
         query_parameters = [execution_id, job_id, app_id, status, message, run_by, run_type, start_time, update_time,
                             json.dumps(parameters)]
-        insert_query = 'insert into execution_result(execution_id,job_id,app_id,status,message,run_by,run_type,start_time,update_time,parameters) values(?,?,?,?,?,?,?,?,?,?)'
-        with self.conn.cursor() as curs:
-            curs.execute(insert_query, query_parameters)
-            self.conn.commit()
+        self.__write(DbExecutionStoreBase.__INSERT_QUERY, query_parameters)
         self.logger.debug('exiting : DbExecutionStoreBase.create_summary()')
         return execution_id
 
-    def update_summary(self, execution_id: str, **kwargs):
-        self.logger.debug('executing : DbExecutionStoreBase.update_summary()')
-        update_part = ', '.join(list(map(lambda key: f'{key} = ?', kwargs.keys())))
-        update_part = f'{update_part}, update_time = ?'
-
-        update_query = f'update execution_result set {update_part} where execution_id = ?'
+    @staticmethod
+    def __update_parameters(execution_id: str, attributes: dict) -> list:
         query_parameters = []
-        for key in kwargs.keys():
+        for key in attributes.keys():
             if key == 'parameters' or key == 'metrics':
-                query_parameters.append(json.dumps(kwargs[key]))
+                query_parameters.append(json.dumps(attributes[key]))
             else:
-                query_parameters.append(kwargs[key])
+                query_parameters.append(attributes[key])
         query_parameters.append(datetime.datetime.now().strftime(Constants.DATE_FORMAT))
         query_parameters.append(execution_id)
-        with self.conn.cursor() as curs:
-            curs.execute(update_query, query_parameters)
-            self.conn.commit()
+        return query_parameters
+
+    def update_summary(self, execution_id: str, **kwargs):
+        self.logger.debug('executing : DbExecutionStoreBase.update_summary()')
+        update_part = ', '.join(list(map(lambda key: f'{key} = ?', kwargs.keys())))
+        update_query = f'update execution_result set {update_part}, update_time = ? where execution_id = ?'
+        self.__write(update_query, DbExecutionStoreBase.__update_parameters(execution_id, kwargs))
         self.logger.debug('exiting : DbExecutionStoreBase.update_summary()')
 
+    def update_leased_summary(self, execution_id: str, worker_id: str, **kwargs) -> bool:
+        self.logger.debug('executing : DbExecutionStoreBase.update_leased_summary()')
+        self.__flush_pending()
+        update_part = ', '.join(list(map(lambda key: f'{key} = ?', kwargs.keys())))
+        update_query = f'update execution_result set {update_part}, update_time = ? where execution_id = ? ' \
+                       f'and {DbExecutionStoreBase.__LEASED_CONDITION}'
+        query_parameters = DbExecutionStoreBase.__update_parameters(execution_id, kwargs) + [worker_id]
+
+        def update(conn) -> bool:
+            with conn.cursor() as curs:
+                curs.execute(update_query, query_parameters)
+                updated = curs.rowcount > 0
+            conn.commit()
+            return updated
+
+        updated = self.__execute(update, 'leased execution update')
+        self.logger.debug('exiting : DbExecutionStoreBase.update_leased_summary()')
+        return updated
+
     @staticmethod
     def __map_record(select_sequence, data):
         i = 0
@@ -408,34 +1144,136 @@ class DbExecutionStoreBase(ExecutionStoreBase):
 
         return ExecutionDetail.from_dict(data_dict)
 
-    def get_job_history(self, job_id: str) -> list:
-        self.logger.debug(f'executing : DbExecutionStoreBase.get_job_history(job_id : {job_id})')
-        select_sequence = ['execution_id', 'job_id', 'app_id', 'status', 'run_by', 'message', 'start_time',
-                           'update_time', 'end_time', 'run_type', 'parameters', 'metrics']
-        select_query = f"select {', '.join(select_sequence)} from execution_result where job_id = ?"
-        with self.conn.cursor() as curs:
-            curs.execute(select_query, [job_id])
-            records = list(
-                map(lambda record: DbExecutionStoreBase.__map_record(select_sequence, record), curs.fetchall()))
+    def __fetch_records(self, select_query: str, query_parameters: list, limit: int = None) -> list:
+        self.__flush_pending()
+
+        def fetch(conn) -> list:
+            with conn.cursor() as curs:
+                curs.execute(select_query, query_parameters)
+                return curs.fetchall() if limit is None else curs.fetchmany(int(limit))
 
-            return records
+        select_sequence = DbExecutionStoreBase.__SELECT_SEQUENCE
+        return list(map(lambda record: DbExecutionStoreBase.__map_record(select_sequence, record),
+                        self.__execute(fetch, 'execution store query')))
 
+    def get_job_history(self, job_id: str, limit: int = None, cursor: str = None, since: str = None) -> list:
+        self.logger.debug(f'executing : DbExecutionStoreBase.get_job_history(job_id : {job_id})')
+        where_clause = 'job_id = ?'
+        if since is not None:
+            where_clause = f'{where_clause} and start_time >= ?'
+        if cursor is not None:
+            cursor_start_time = '(select start_time from execution_result where execution_id = ?)'
+            where_clause = f'{where_clause} and (start_time > {cursor_start_time} or ' \
+                           f'(start_time = {cursor_start_time} and execution_id > ?))'
+        select_query = f'{DbExecutionStoreBase.__SELECT_QUERY} where {where_clause} order by start_time, execution_id'
+        query_parameters = [job_id]
+        if since is not None:
+            query_parameters.append(since)
+        if cursor is not None:
+            query_parameters.extend([cursor, cursor, cursor])
+        records = self.__fetch_records(select_query, query_parameters, limit=limit)
         self.logger.debug(f'exiting : DbExecutionStoreBase.get_job_history()')
+        return records
+
+    def get_latest_execution(self, job_id: str) -> ExecutionDetail:
+        self.logger.debug(f'executing : DbExecutionStoreBase.get_latest_execution(job_id : {job_id})')
+        select_query = f'{DbExecutionStoreBase.__SELECT_QUERY} where job_id = ? and start_time = ' \
+                       f'(select max(start_time) from execution_result where job_id = ?) order by execution_id desc'
+        records = self.__fetch_records(select_query, [job_id, job_id], limit=1)
+        self.logger.debug(f'exiting : DbExecutionStoreBase.get_latest_execution()')
+        return records[0] if records else None
 
     def get_job_history_by_status(self, statuses: list) -> list:
         self.logger.debug(f'executing : DbExecutionStoreBase.get_job_history_by_status(statuses : {statuses})')
-        select_sequence = ['execution_id', 'job_id', 'app_id', 'status', 'run_by', 'message', 'start_time',
-                           'update_time', 'end_time', 'run_type', 'parameters', 'metrics']
-
-        select_query = f"select {', '.join(select_sequence)} from execution_result where status in ({','.join(list(map(lambda r: '?', statuses)))})"
-        with self.conn.cursor() as curs:
-            self.logger.debug(f'executing query - {select_query}')
-            curs.execute(select_query, statuses)
-            records = list(
-                map(lambda record: DbExecutionStoreBase.__map_record(select_sequence, record), curs.fetchall()))
+        select_query = f"{DbExecutionStoreBase.__SELECT_QUERY} where status in " \
+                       f"({','.join(list(map(lambda r: '?', statuses)))})"
+        self.logger.debug(f'executing query - {select_query}')
+        records = self.__fetch_records(select_query, list(statuses))
+        self.logger.debug(f'exiting : DbExecutionStoreBase.get_job_history_by_status()')
+        return records
+
+    def claim_scheduled(self, worker_id: str, lease_seconds: float, limit: int = 1) -> list:
+        self.logger.debug(f'executing : DbExecutionStoreBase.claim_scheduled(worker_id : {worker_id})')
+        self.__flush_pending()
+        now, lease_expiry = ExecutionStoreBase.lease_times(lease_seconds)
+
+        def claim(conn) -> list:
+            claimed_ids = []
+            attempted_ids = set()
+            with conn.cursor() as curs:
+                while len(claimed_ids) < limit:
+                    curs.execute(DbExecutionStoreBase.__SELECT_CLAIMABLE_QUERY, [now])
+                    candidate_ids = list(filter(lambda execution_id: execution_id not in attempted_ids,
+                                                map(lambda row: row[0], curs.fetchmany(int(limit) * 4))))
+                    if not candidate_ids:
+                        break
+                    for execution_id in candidate_ids:
+                        if len(claimed_ids) >= limit:
+                            break
+                        attempted_ids.add(execution_id)
+                        curs.execute(DbExecutionStoreBase.__CLAIM_QUERY,
+                                     [worker_id, lease_expiry, now, execution_id, now])
+                        if curs.rowcount > 0:
+                            claimed_ids.append(execution_id)
+                        conn.commit()
+            return claimed_ids
+
+        execution_ids = self.__execute(claim, 'claim scheduled executions')
+        records = []
+        if execution_ids:
+            select_query = f"{DbExecutionStoreBase.__SELECT_QUERY} where execution_id in " \
+                           f"({','.join(map(lambda execution_id: '?', execution_ids))})"
+            records = self.__fetch_records(select_query, execution_ids)
+        self.logger.debug('exiting : DbExecutionStoreBase.claim_scheduled()')
+        return records
+
+    def renew_lease(self, execution_id: str, worker_id: str, lease_seconds: float) -> bool:
+        self.__flush_pending()
+        now, lease_expiry = ExecutionStoreBase.lease_times(lease_seconds)
+
+        def renew(conn) -> bool:
+            with conn.cursor() as curs:
+                curs.execute(DbExecutionStoreBase.__RENEW_LEASE_QUERY, [lease_expiry, now, execution_id, worker_id])
+                renewed = curs.rowcount > 0
+            conn.commit()
+            return renewed
+
+        return self.__execute(renew, 'lease renewal')
+
+    def get_watermark(self, job_id: str, source_name: str):
+        self.logger.debug(f'executing : DbExecutionStoreBase.get_watermark(job_id : {job_id}, source_name : {source_name})')
+
+        def fetch(conn):
+            with conn.cursor() as curs:
+                curs.execute(DbExecutionStoreBase.__SELECT_WATERMARK_QUERY, [job_id, source_name])
+                return curs.fetchone()
+
+        record = self.__execute(fetch, 'watermark query')
+        self.logger.debug('exiting : DbExecutionStoreBase.get_watermark()')
+        return json.loads(record[0]) if record and record[0] is not None else None
+
+    def save_watermark(self, job_id: str, source_name: str, value):
+        self.logger.debug(f'executing : DbExecutionStoreBase.save_watermark(job_id : {job_id}, source_name : {source_name})')
+        update_time = datetime.datetime.now().strftime(Constants.DATE_FORMAT)
 
-            self.logger.debug(f'exiting : DbExecutionStoreBase.get_job_history_by_status()')
-            return records
+        def save(conn):
+            with conn.cursor() as curs:
+                curs.execute(DbExecutionStoreBase.__UPDATE_WATERMARK_QUERY,
+                             [json.dumps(value), update_time, job_id, source_name])
+                if curs.rowcount == 0:
+                    try:
+                        curs.execute(DbExecutionStoreBase.__INSERT_WATERMARK_QUERY,
+                                     [job_id, source_name, json.dumps(value), update_time])
+                    except Exception:
+                        # another worker inserted the row first, overwrite it
+                        curs.execute(DbExecutionStoreBase.__UPDATE_WATERMARK_QUERY,
+                                     [json.dumps(value), update_time, job_id, source_name])
+                        if curs.rowcount == 0:
+                            raise
+            conn.commit()
+
+        self.__execute(save, 'watermark update')
+        self.logger.debug('exiting : DbExecutionStoreBase.save_watermark()')
 
 
 class ExecutionStoreProvider:
@@ -444,7 +1282,11 @@ class ExecutionStoreProvider:
     def create_execution_store(parameters: dict) -> ExecutionStoreBase:
         execution_summary_config = parameters['execution_summary']
         if execution_summary_config['type'] == 'file':
-            return ExecutionStore({'base_dir': execution_summary_config['execution_summary_dir']})
+            store_parameters = dict(execution_summary_config)
+            store_parameters['base_dir'] = execution_summary_config['execution_summary_dir']
+            return ExecutionStore(store_parameters)
+        elif execution_summary_config['type'] == 'sqlite':
+            return SqliteExecutionStore(execution_summary_config)
         elif execution_summary_config['type'] == 'db':
             return DbExecutionStoreBase(execution_summary_config)
         else:
@@ -1,6 +1,7 @@
 from abc import abstractmethod
 
-from src.models import DataBag, TransformationTemplate, DatabagLookup
+from src.columnar import null_column, constant_column, concat_columns
+from src.models import DataBag, ColumnarDataBag, StreamingDataBag, TransformationTemplate, DatabagLookup
 from src.utils import get_logger
 import json
 
@@ -42,15 +43,44 @@ class BaseRecordTransformation(TransformationTemplate):
     def apply(self, item: dict, **kwargs) -> dict:
         pass
 
+    def compile(self, **kwargs):
+        return lambda item: self.apply(item, **kwargs)
+
+    def transform_columns(self, databag: ColumnarDataBag, **kwargs) -> ColumnarDataBag:
+        return None
+
+    def columnar_output(self, columns: dict, null_masks: dict, row_count: int) -> ColumnarDataBag:
+        return ColumnarDataBag(name=f'{self.name()}_databag', provider=self.name(), columns=columns,
+                               null_masks=null_masks, metadata={'row_count': row_count})
+
+    def transform(self, databag: DataBag, **kwargs) -> DataBag:
+        if databag.is_columnar():
+            output = self.transform_columns(databag, **kwargs)
+            if output is not None:
+                return output
+
+        record_function = self.compile(**kwargs)
+        if databag.is_columnar():
+            return ColumnarDataBag.from_records(name=f'{self.name()}_databag', provider=self.name(),
+                                                records=map(record_function, databag.iter_rows()))
+
+        output = list(map(record_function, databag.data))
+        return DataBag(name=f'{self.name()}_databag', provider=self.name(), data=output,
+                       metadata={'row_count': len(output)})
+
     def execute(self, **kwargs) -> DataBag:
         self.logger.debug('executing : BaseFieldTransformation.execute()')
         databag = select_databag(kwargs, self.databag_lookup)
 
-        output = list(map(lambda item: self.apply(item, **kwargs), databag.data))
+        if databag.is_streaming():
+            output = StreamingDataBag(name=f'{self.name()}_databag', provider=self.name(),
+                                      batch_source=lambda: map(lambda batch: self.transform(batch, **kwargs),
+                                                               databag.batches()))
+        else:
+            output = self.transform(databag, **kwargs)
 
         self.logger.debug('exiting : BaseFieldTransformation.execute()')
-        return DataBag(name=f'{self.name()}_databag', provider=self.name(), data=output,
-                       metadata={'row_count': len(output)})
+        return output
 
 
 class FieldSelectorTransformation(BaseRecordTransformation):
@@ -69,6 +99,24 @@ class FieldSelectorTransformation(BaseRecordTransformation):
             op[field] = item.get(field, None)
         return op
 
+    def compile(self, **kwargs):
+        fields = tuple(kwargs['fields'])
+        return lambda item: {field: item.get(field) for field in fields}
+
+    def transform_columns(self, databag: ColumnarDataBag, **kwargs) -> ColumnarDataBag:
+        row_count = databag.row_count()
+        columns = {}
+        null_masks = {}
+        for field in kwargs['fields']:
+            if field in databag.columns:
+                columns[field] = databag.columns[field]
+                null_mask = databag.null_mask(field)
+            else:
+                columns[field], null_mask = null_column(row_count)
+            if null_mask:
+                null_masks[field] = null_mask
+        return self.columnar_output(columns, null_masks, row_count)
+
 
 class FieldRejectTransformation(BaseRecordTransformation):
 
@@ -87,6 +135,16 @@ class FieldRejectTransformation(BaseRecordTransformation):
                 op[key] = item[key]
         return op
 
+    def compile(self, **kwargs):
+        fields = frozenset(kwargs['fields'])
+        return lambda item: {key: value for key, value in item.items() if key not in fields}
+
+    def transform_columns(self, databag: ColumnarDataBag, **kwargs) -> ColumnarDataBag:
+        fields = frozenset(kwargs['fields'])
+        columns = {name: column for name, column in databag.columns.items() if name not in fields}
+        null_masks = {name: null_mask for name, null_mask in databag.null_masks.items() if name not in fields}
+        return self.columnar_output(columns, null_masks, databag.row_count())
+
 
 class AddConstantFieldTransformation(BaseRecordTransformation):
 
@@ -99,9 +157,32 @@ class AddConstantFieldTransformation(BaseRecordTransformation):
 
     def apply(self, item: dict, **kwargs) -> dict:
         fields_to_add = kwargs['fields']
+        op = dict(item)
         for field in fields_to_add:
-           item[field] = fields_to_add[field]
-        return item
+            op[field] = fields_to_add[field]
+        return op
+
+    def compile(self, **kwargs):
+        fields_to_add = dict(kwargs['fields'])
+
+        def add_fields(item: dict) -> dict:
+            op = dict(item)
+            op.update(fields_to_add)
+            return op
+
+        return add_fields
+
+    def transform_columns(self, databag: ColumnarDataBag, **kwargs) -> ColumnarDataBag:
+        row_count = databag.row_count()
+        columns = dict(databag.columns)
+        null_masks = dict(databag.null_masks)
+        for field, value in kwargs['fields'].items():
+            columns[field], null_mask = constant_column(value, row_count)
+            if null_mask:
+                null_masks[field] = null_mask
+            else:
+                null_masks.pop(field, None)
+        return self.columnar_output(columns, null_masks, row_count)
 
 
 class RenameFieldTransformation(BaseRecordTransformation):
@@ -123,6 +204,24 @@ class RenameFieldTransformation(BaseRecordTransformation):
                 op[field] = item[field]
         return op
 
+    def compile(self, **kwargs):
+        fields_to_rename = dict(kwargs['fields'])
+        return lambda item: {fields_to_rename.get(key, key): value for key, value in item.items()}
+
+    def transform_columns(self, databag: ColumnarDataBag, **kwargs) -> ColumnarDataBag:
+        fields_to_rename = kwargs['fields']
+        columns = {}
+        null_masks = {}
+        for name, column in databag.columns.items():
+            output_name = fields_to_rename.get(name, name)
+            columns[output_name] = column
+            null_mask = databag.null_mask(name)
+            if null_mask:
+                null_masks[output_name] = null_mask
+            else:
+                null_masks.pop(output_name, None)
+        return self.columnar_output(columns, null_masks, databag.row_count())
+
 
 class ConcatFieldTransformation(BaseRecordTransformation):
 
@@ -138,11 +237,51 @@ class ConcatFieldTransformation(BaseRecordTransformation):
         output_field_name = kwargs['output_field']
         seperator = kwargs.get('seperator', '~')
         source_values = list(map(lambda field: item.get(field), source_fields))
+        op = dict(item)
         if None in source_values:
-            item[output_field_name] = None
+            op[output_field_name] = None
         else:
-            item[output_field_name] = seperator.join(source_values)
-        return item
+            op[output_field_name] = seperator.join(source_values)
+        return op
+
+    def compile(self, **kwargs):
+        source_fields = tuple(kwargs['fields'])
+        output_field_name = kwargs['output_field']
+        seperator = kwargs.get('seperator', '~')
+
+        def concat_fields(item: dict) -> dict:
+            source_values = [item.get(field) for field in source_fields]
+            op = dict(item)
+            op[output_field_name] = None if None in source_values else seperator.join(source_values)
+            return op
+
+        return concat_fields
+
+    def transform_columns(self, databag: ColumnarDataBag, **kwargs) -> ColumnarDataBag:
+        row_count = databag.row_count()
+        source_columns = []
+        source_null_masks = []
+        for field in kwargs['fields']:
+            if field in databag.columns:
+                column = databag.columns[field]
+                null_mask = databag.null_mask(field)
+            else:
+                column, null_mask = null_column(row_count)
+            if not isinstance(column, list):
+                return None
+            source_columns.append(column)
+            source_null_masks.append(null_mask)
+
+        columns = dict(databag.columns)
+        null_masks = dict(databag.null_masks)
+        output_field_name = kwargs['output_field']
+        columns[output_field_name], null_mask = concat_columns(source_columns, source_null_masks, row_count,
+                                                               kwargs.get('seperator', '~'))
+        if null_mask:
+            null_masks[output_field_name] = null_mask
+        else:
+            null_masks.pop(output_field_name, None)
+        return self.columnar_output(columns, null_masks, row_count)
 
 
 class RecordToJsonTransformation(BaseRecordTransformation):
@@ -157,6 +296,46 @@ class RecordToJsonTransformation(BaseRecordTransformation):
     def apply(self, item: dict, **kwargs) -> dict:
         return {'root': json.dumps(item)}
 
+    def compile(self, **kwargs):
+        return lambda item: {'root': json.dumps(item)}
+
+
+class FusedRecordTransformation(BaseRecordTransformation):
+
+    def __init__(self, databag_lookup: DatabagLookup, steps: list):
+        self.logger = get_logger()
+        self.databag_lookup = databag_lookup
+        self.steps = steps
+
+    def name(self) -> str:
+        return self.steps[-1][0].name()
+
+    def apply(self, item: dict, **kwargs) -> dict:
+        for transformation, config in self.steps:
+            item = transformation.apply(item, **config)
+        return item
+
+    def compile(self, **kwargs):
+        record_functions = tuple(transformation.compile(**config) for transformation, config in self.steps)
+
+        def apply_all(item: dict) -> dict:
+            for record_function in record_functions:
+                item = record_function(item)
+            return item
+
+        return apply_all
+
+    def transform_columns(self, databag: ColumnarDataBag, **kwargs) -> ColumnarDataBag:
+        for index, (transformation, config) in enumerate(self.steps):
+            output = transformation.transform_columns(databag, **config)
+            if output is None:
+                remaining = FusedRecordTransformation(self.databag_lookup, self.steps[index:])
+                record_function = remaining.compile()
+                return ColumnarDataBag.from_records(name=f'{self.name()}_databag', provider=self.name(),
+                                                    records=map(record_function, databag.iter_rows()))
+            databag = output
+        return databag
+
 
 class BaseAttributeTransformation(TransformationTemplate):
 
@@ -39,6 +39,59 @@ class EnvironmentVariableCredentialProvider(CredentialProvider):
         return env_variables
 
 
+class MemoryTracker:
+
+    def __init__(self, trace_allocations: bool = False):
+        self.trace_allocations = trace_allocations
+        self.started_tracing = False
+        self.stage_peaks = {}
+        self.start_rss_kb = None
+
+    @staticmethod
+    def current_rss_kb():
+        try:
+            with open('/proc/self/statm', 'r') as stream:
+                return int(stream.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def start(self):
+        self.start_rss_kb = MemoryTracker.current_rss_kb()
+        if self.trace_allocations:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracing = True
+            tracemalloc.reset_peak()
+
+    def mark_stage(self, stage_name: str):
+        if self.trace_allocations:
+            import tracemalloc
+            self.stage_peaks[stage_name] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+
+    def stop(self) -> dict:
+        metrics = {}
+        end_rss_kb = MemoryTracker.current_rss_kb()
+        if self.start_rss_kb is not None and end_rss_kb is not None:
+            metrics['start_rss_kb'] = self.start_rss_kb
+            metrics['end_rss_kb'] = end_rss_kb
+            metrics['rss_delta_kb'] = end_rss_kb - self.start_rss_kb
+        try:
+            import resource
+            metrics['process_peak_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:
+            pass
+
+        if self.trace_allocations:
+            import tracemalloc
+            metrics['stage_peak_bytes'] = self.stage_peaks
+            metrics['peak_bytes'] = max(self.stage_peaks.values(), default=0)
+            if self.started_tracing:
+                tracemalloc.stop()
+        return metrics
+
+
 def get_credentials(config: dict) -> dict:
     provider_type = config['type']
     if provider_type == 'simple':
@@ -74,6 +127,16 @@ def replace_placeholders(raw_data: str, parameters: dict) -> str:
     return raw_data
 
 
+def replace_config_placeholders(config, parameters: dict):
+    if isinstance(config, str):
+        return replace_placeholders(raw_data=config, parameters=parameters)
+    elif isinstance(config, dict):
+        return {key: replace_config_placeholders(value, parameters) for key, value in config.items()}
+    elif isinstance(config, list):
+        return [replace_config_placeholders(value, parameters) for value in config]
+    return config
+
+
 def read_config_file(config_file_path: str):
     import yaml
 
@@ -51,7 +51,10 @@ def create_app(arguments: list):
 
     @app.route('/jobs/history/<job_name>', methods=['GET'])
     def jobs_history(job_name: str):
-        return service.jobs_history(job_name=job_name, is_current=False)
+        return service.jobs_history(job_name=job_name, is_current=False,
+                                    limit=request.args.get('limit', type=int),
+                                    cursor=request.args.get('cursor'),
+                                    since=request.args.get('since'))
 
     @app.route('/jobs/status/<job_name>', methods=['GET'])
     def job_status(job_name: str):
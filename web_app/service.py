@@ -25,10 +25,11 @@ class WebAppConfig:
 
 class APIResponse:
 
-    def __init__(self, status_code, data=[], message: str = None):
+    def __init__(self, status_code, data=[], message: str = None, next_cursor: str = None):
         self.status_code = status_code
         self.data = data
         self.message = message
+        self.next_cursor = next_cursor
 
     def to_response(self) -> dict:
         response = {
@@ -38,6 +39,8 @@ class APIResponse:
             response['data'] = self.data
         if self.message:
             response['message'] = self.message
+        if self.next_cursor:
+            response['next_cursor'] = self.next_cursor
         return response
 
 
@@ -117,23 +120,29 @@ class WebAppService:
         self.logger.debug("exiting : WebAppService.run_job()")
         return [f"started - {job_name}"]
 
-    def jobs_history(self, job_name: str, is_current=False):
+    def jobs_history(self, job_name: str, is_current=False, limit: int = None, cursor: str = None,
+                     since: str = None):
         self.logger.debug(f"executing : WebAppService.jobs_history(job_name : {job_name}, is_current : {is_current})")
         job_data = self.__fetch_job_names()
-        job_id = job_data[job_name]
+        job_id = job_data.get(job_name)
         if not job_id:
             return APIResponse(status_code=400, message=f"Job not found: {job_name}").to_response()
-        all_history = list(map(lambda record: WebAppService.__map_job_history(record),
-                               self.execution_store.get_job_history(job_id = job_id)))
-
-        if len(all_history) == 0:
-            return APIResponse(status_code=204, message=f"Job history not found for job: {job_name}").to_response()
 
         if is_current:
+            latest_execution = self.execution_store.get_latest_execution(job_id=job_id)
+            if latest_execution is None:
+                return APIResponse(status_code=204, message=f"Job history not found for job: {job_name}").to_response()
             return APIResponse(status_code=200,
-                               data=all_history[len(all_history) - 1]).to_response()
-        else:
-            return APIResponse(status_code=200, data=all_history).to_response()
+                               data=WebAppService.__map_job_history(latest_execution)).to_response()
+
+        history = list(map(lambda record: WebAppService.__map_job_history(record),
+                           self.execution_store.get_job_history(job_id=job_id, limit=limit, cursor=cursor,
+                                                                since=since)))
+        if len(history) == 0:
+            return APIResponse(status_code=204, message=f"Job history not found for job: {job_name}").to_response()
+
+        next_cursor = history[-1]['execution_id'] if limit is not None and len(history) == limit else None
+        return APIResponse(status_code=200, data=history, next_cursor=next_cursor).to_response()
 
     @staticmethod
     def __map_job_history(job_history):
@@ -147,7 +156,8 @@ class WebAppService:
         else:
             message = job_history.message
 
-        return {"job_id": job_history.job_id,
+        return {"execution_id": job_history.execution_id,
+                "job_id": job_history.job_id,
                 "app_id": job_history.app_id,
                 "run_by": run_by,
                 "status": job_history.status,